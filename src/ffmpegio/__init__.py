@@ -10,6 +10,7 @@ Stream Read/Write
 -----------------
 
 ffmpegio.open()
+ffmpegio.aopen()
 
 Block Read/Write/Filter Functions
 ---------------------------------
@@ -26,45 +27,52 @@ Block Read/Write/Filter Functions
 `ffmpegio.media.read()`
 """
 
-from contextlib import contextmanager
-import logging
+from contextlib import contextmanager, asynccontextmanager
+import importlib, logging
 
 logger = logging.getLogger("ffmpegio")
 logger.addHandler(logging.NullHandler())
 
-from . import path, plugins
-
-# register builtin plugins and external plugins found in site-packages
-plugins.initialize()
+from . import path
+from .errors import FFmpegError
+from .transcode import transcode
 
-# initialize the paths
-try:
-    path.find()
-except Exception as e:
-    logger.warning(str(e))
+# submodules and other attributes are imported on their first access (see
+# __getattr__), and FFmpeg executables are located when they are first needed
+# fmt:off
+_lazy_modules = {"devices", "ffmpegprocess", "caps", "probe", "audio", "image",
+    "video", "media", "streams", "filtergraph", "configure", "plugins", "utils",
+    "analyze", "threading"}
+# fmt:on
+_lazy_attrs = {
+    "FilterGraph": ("filtergraph", "Graph"),
+    "FFConcat": ("utils.concat", "FFConcat"),
+    "FLAG": ("utils.parser", "FLAG"),
+}
 
 
 def __getattr__(name):
     if name == "ffmpeg_ver":
         return path.FFMPEG_VER
-    raise AttributeError(f"module '{__name__}' has no attribute '{name}'")
-
+    if name in _lazy_modules:
+        value = importlib.import_module(f".{name}", __name__)
+    elif name in _lazy_attrs:
+        modname, attr = _lazy_attrs[name]
+        value = getattr(importlib.import_module(f".{modname}", __name__), attr)
+    else:
+        raise AttributeError(f"module '{__name__}' has no attribute '{name}'")
+    globals()[name] = value
+    return value
 
-from . import ffmpegprocess
 
-from .errors import FFmpegError
-from .utils.concat import FFConcat
-from .filtergraph import Graph as FilterGraph
-from . import devices, ffmpegprocess, caps, probe, audio, image, video, media
-from .transcode import transcode
-from . import streams as _streams
-from .utils.parser import FLAG
+def __dir__():
+    return sorted({*globals(), *_lazy_modules, *_lazy_attrs})
 
 
 # fmt:off
 __all__ = ["ffmpeg_info", "get_path", "set_path", "is_ready", "ffmpeg", "ffprobe",
     "transcode", "caps", "probe", "audio", "image", "video", "media", "devices",
-    "open", "ffmpegprocess", "FFmpegError", "FilterGraph", "FFConcat"]
+    "open", "aopen", "ffmpegprocess", "FFmpegError", "FilterGraph", "FFConcat"]
 # fmt:on
 
 __version__ = "0.9.0"
@@ -216,6 +224,88 @@ def open(
 
     """
 
+    StreamClass, args, kwds = _resolve_stream(
+        url_fg, mode, rate_in, shape_in, dtype_in, rate, shape, kwds, False
+    )
+
+    # instantiate the streaming object
+    # TODO wrap in try-catch if AV stream fails to try a multi-stream version
+    stream = StreamClass(*args, **kwds)
+    try:
+        yield stream
+    finally:
+        # terminate FFmpeg
+        stream.close()
+
+
+@asynccontextmanager
+async def aopen(
+    url_fg,
+    mode="",
+    rate_in=None,
+    shape_in=None,
+    dtype_in=None,
+    rate=None,
+    shape=None,
+    **kwds,
+):
+    """Open a multimedia file/stream for asynchronous read/write
+
+    :param url_fg: URL of the media source/destination for file read/write or filtergraph definition
+                   for filter operation.
+    :type url_fg: str or seq(str)
+    :param mode: specifies the mode in which the FFmpeg is used, defaults to None
+    :type mode: str, optional
+    :param \\**kwds: other arguments of :py:func:`open`
+    :type \\**kwds: dict, optional
+    :yields: ffmpegio async stream object
+
+    The asyncio counterpart of :py:func:`open`, which yields a stream object
+    of :py:mod:`ffmpegio.streams.AsyncStreams`. Its FFmpeg pipes are served by
+    the running event loop instead of helper threads, and its I/O methods
+    (`read()`, `write()`, `filter()`, `flush()`) are coroutines.
+
+    :Examples:
+
+    Process all the frames of an MP4 file::
+
+        async with ffmpegio.aopen('video_source.mp4') as f:
+            async for frame in f:
+                # process the captured frame data
+                ...
+
+    Multi-stream read modes ('vv', 'aa', or 'va') are not supported.
+
+    """
+
+    StreamClass, args, kwds = _resolve_stream(
+        url_fg,
+        mode,
+        rate_in,
+        shape_in,
+        dtype_in,
+        rate,
+        shape,
+        kwds,
+        True,
+    )
+
+    stream = await StreamClass(*args, **kwds)
+    try:
+        yield stream
+    finally:
+        # terminate FFmpeg
+        await stream.close()
+
+
+def _resolve_stream(
+    url_fg, mode, rate_in, shape_in, dtype_in, rate, shape, kwds, use_async
+):
+    # parse open()/aopen() arguments and return the stream class and its arguments
+
+    from . import probe, streams
+    from .filtergraph import Graph as FilterGraph
+
     is_fg = isinstance(url_fg, FilterGraph)
     if isinstance(url_fg, str):
         is_fg = kwds.get("f_in", None) == "lavfi"
@@ -295,21 +385,12 @@ def open(
         ValueError("Cannot write to a filtergraph.")
 
     try:
-        StreamClass = {
-            1: {
-                0: _streams.SimpleAudioReader,
-                1: _streams.SimpleAudioWriter,
-                2: _streams.SimpleAudioFilter,
-            },
-            2: {
-                0: _streams.SimpleVideoReader,
-                1: _streams.SimpleVideoWriter,
-                2: _streams.SimpleVideoFilter,
-            },
-            3: {
-                0: _streams.AviMediaReader,
-            },
-        }[audio + 2 * video][write + 2 * filter]
+        StreamClass = getattr(
+            streams,
+            (_async_stream_classes if use_async else _stream_classes)[
+                audio + 2 * video
+            ][write + 2 * filter],
+        )
     except:
         raise Exception(f"Invalid/unsupported FFmpeg streaming mode: {mode}.")
 
@@ -327,11 +408,35 @@ def open(
         if v is not None:
             kwds[k] = v
 
-    # instantiate the streaming object
-    # TODO wrap in try-catch if AV stream fails to try a multi-stream version
-    stream = StreamClass(*args, **kwds)
-    try:
-        yield stream
-    finally:
-        # terminate FFmpeg
-        stream.close()
+    return StreamClass, args, kwds
+
+
+# stream classes of open() & aopen(): [audio + 2 * video][write + 2 * filter]
+_stream_classes = {
+    1: {
+        0: "SimpleAudioReader",
+        1: "SimpleAudioWriter",
+        2: "SimpleAudioFilter",
+    },
+    2: {
+        0: "SimpleVideoReader",
+        1: "SimpleVideoWriter",
+        2: "SimpleVideoFilter",
+    },
+    3: {
+        0: "AviMediaReader",
+    },
+}
+
+_async_stream_classes = {
+    1: {
+        0: "AsyncAudioReader",
+        1: "AsyncAudioWriter",
+        2: "AsyncAudioFilter",
+    },
+    2: {
+        0: "AsyncVideoReader",
+        1: "AsyncVideoWriter",
+        2: "AsyncVideoFilter",
+    },
+}
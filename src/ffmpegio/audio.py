@@ -1,11 +1,109 @@
 """Audio Read/Write Module
 """
 
-import warnings
+import warnings, logging
+from bisect import bisect_right
+from fractions import Fraction
+from math import ceil
+from os import path as _path, cpu_count as _os_cpu_count
+
+logger = logging.getLogger("ffmpegio")
+
 from . import ffmpegprocess, utils, configure, FFmpegError, probe, plugins, analyze
 from .utils import log as log_utils
 
-__all__ = ["create", "read", "write", "filter", "detect"]
+__all__ = ["create", "read", "read_segments", "write", "filter", "detect"]
+
+# codecs, which decode sample-exactly from any packet (i.e., no priming or overlap)
+_SEGMENTABLE_CODECS = ("flac", "alac", "wavpack", "tta")
+
+
+def _plan_segments(ffmpeg_args, parallel, rate):
+    """split audio read into packet-aligned segments
+
+    :param ffmpeg_args: FFmpeg arguments of the whole read
+    :type ffmpeg_args: dict
+    :param parallel: number of concurrent FFmpeg processes
+    :type parallel: int
+    :param rate: output sampling rate
+    :type rate: int
+    :return: list of input options, output options, and number of samples of the
+             segments or None if the read cannot be split sample-exactly
+    :rtype: list(tuple(dict, dict, int)) or None
+
+    Each segment but the last is bounded by its duration, so its decoded
+    samples can be checked against the count. The number of samples of the
+    last segment is an estimate from the stream duration as it decodes all
+    the remaining samples.
+    """
+
+    if not parallel or parallel < 2:
+        return None
+
+    url, inopts = ffmpeg_args["inputs"][0]
+    outopts = ffmpeg_args["outputs"][0][1] or {}
+    inopts = inopts or {}
+
+    # only the whole stream w/out resampling can be split
+    if (
+        len(ffmpeg_args["inputs"]) != 1
+        or not isinstance(url, str)
+        or not _path.isfile(url)
+        or any(k in inopts for k in ("ss", "sseof", "t", "to", "itsoffset"))
+        or any(k in outopts for k in ("ss", "t", "to", "frames:a", "aframes"))
+        or configure.has_filtergraph(ffmpeg_args, "audio")
+    ):
+        return None
+
+    try:
+        info = probe.audio_streams_basic(url, 0)[0]
+        codec = info["codec_name"]
+        if info["sample_rate"] != rate or not (
+            codec.startswith("pcm_") or codec in _SEGMENTABLE_CODECS
+        ):
+            return None
+        nsamples = info["nb_samples"]
+        index = probe.index(url, "a:0")
+    except Exception as e:
+        logger.debug(f"[audio] failed to index {url}: {e}")
+        return None
+
+    pts = index["pts"]
+    npackets = len(pts)
+    if not npackets:
+        return None
+    tb = index["time_base"]
+    t0 = index["start_time"]
+
+    def offset(k):
+        # sample offset of the k-th packet
+        return (pts[k] - pts[0]) * tb * rate
+
+    # segments start at the packets closest to the equal split points
+    nseg = parallel * 4
+    starts = sorted(
+        {
+            bisect_right(pts, pts[0] + Fraction(i * nsamples, nseg) / (tb * rate)) - 1
+            for i in range(nseg)
+        }
+    )
+    offsets = [offset(k) for k in starts]
+    if any(o.denominator != 1 for o in map(Fraction, offsets)):
+        return None  # packet boundaries not on samples
+    offsets = [int(o) for o in offsets]
+
+    def seg_inopts(k):
+        # seek to the time (in microseconds) at or after the packet
+        return {"ss": ceil((float(pts[k] * tb) - t0) * 1e6) / 1e6} if k else {}
+
+    def seg_outopts(n0, n1):
+        # duration till the next segment
+        return {} if n1 is None else {"t": (n1 - n0) / rate}
+
+    return [
+        (seg_inopts(k), seg_outopts(n0, n1), (nsamples if n1 is None else n1) - n0)
+        for k, n0, n1 in zip(starts, offsets, [*offsets[1:], None])
+    ]
 
 
 def _run_read(
@@ -15,6 +113,8 @@ def _run_read(
     ar_in=None,
     show_log=None,
     sp_kwargs=None,
+    parallel=None,
+    segmented=False,
     **kwargs,
 ):
     """run FFmpeg and retrieve audio stream data
@@ -34,6 +134,12 @@ def _run_read(
                       `subprocess.Popen()` call used to run the FFmpeg, defaults
                       to None
     :type sp_kwargs: dict, optional
+    :param parallel: number of concurrent FFmpeg processes to decode packet-aligned
+                     segments, defaults to None (single process)
+    :type parallel: int, optional
+    :param segmented: True to return an iterator of the data of the segments,
+                      defaults to False
+    :type segmented: bool, optional
     :param **kwargs ffmpegprocess.run keyword arguments
     :type **kwargs: tuple
     :return: [description]
@@ -55,6 +161,36 @@ def _run_read(
     if sp_kwargs is not None:
         kwargs = {**sp_kwargs, **kwargs}
 
+    segments = (
+        None
+        if dtype is None or ac is None or rate is None
+        else _plan_segments(args[0], parallel, rate)
+    )
+    if segments is not None:
+        to_audio = plugins.get_hook().bytes_to_audio
+        samplesize = utils.get_samplesize((ac,), dtype)
+        popen_kwargs = {
+            k: v
+            for k, v in kwargs.items()
+            if k not in ("progress", "stdin", "input") and v is not None
+        }
+        if segmented:
+            return rate, (
+                to_audio(b=b, dtype=dtype, shape=(ac,), squeeze=False)
+                for b in ffmpegprocess.iter_segments(
+                    args[0], segments, samplesize, parallel, **popen_kwargs
+                )
+            )
+
+        b, counts = ffmpegprocess.run_segments(
+            args[0], segments, samplesize, parallel, **popen_kwargs
+        )
+        if counts == [n for _, _, n in segments]:
+            return rate, to_audio(b=b, dtype=dtype, shape=(ac,), squeeze=False)
+        logger.warning(
+            "[audio] segmented read did not produce expected samples, reading in a single process"
+        )
+
     if dtype is None or ac is None or rate is None:
         configure.clear_loglevel(args[0])
 
@@ -77,9 +213,10 @@ def _run_read(
         if out.returncode:
             raise FFmpegError(out.stderr, show_log)
 
-    return rate, plugins.get_hook().bytes_to_audio(
+    data = plugins.get_hook().bytes_to_audio(
         b=out.stdout, dtype=dtype, shape=(ac,), squeeze=False
     )
+    return rate, iter((data,)) if segmented else data
 
 
 def create(expr, *args, progress=None, show_log=None, sp_kwargs=None, **options):
@@ -157,7 +294,39 @@ def create(expr, *args, progress=None, show_log=None, sp_kwargs=None, **options)
     )
 
 
-def read(url, progress=None, show_log=None, sp_kwargs=None, **options):
+def _config_read(url, sp_kwargs, options):
+    # configure audio read operation
+
+    sample_fmt = options.get("sample_fmt", None)
+    ac_in = ar_in = None
+    if sample_fmt is None:
+        try:
+            # use the same format as the input
+            info = probe.audio_streams_basic(url, 0)[0]
+            sample_fmt = info["sample_fmt"]
+            ac_in = info.get("channels", None)
+            ar_in = info.get("sample_rate", None)
+        except:
+            sample_fmt = "s16"
+
+    input_options = utils.pop_extra_options(options, "_in")
+    url, stdin, input = configure.check_url(
+        url, False, format=input_options.get("f", None)
+    )
+
+    ffmpeg_args = configure.empty()
+    configure.add_url(ffmpeg_args, "input", url, input_options)[1][1]
+    configure.add_url(ffmpeg_args, "output", "-", options)[1][1]
+
+    # override user specified stdin and input if given
+    sp_kwargs = {**sp_kwargs} if sp_kwargs else {}
+    sp_kwargs["stdin"] = stdin
+    sp_kwargs["input"] = input
+
+    return ffmpeg_args, sample_fmt, ac_in, ar_in, sp_kwargs
+
+
+def read(url, progress=None, show_log=None, sp_kwargs=None, parallel=None, **options):
     """Read audio samples.
 
     :param url: URL of the audio file to read.
@@ -172,6 +341,9 @@ def read(url, progress=None, show_log=None, sp_kwargs=None, **options):
                       `subprocess.Popen()` call used to run the FFmpeg, defaults
                       to None
     :type sp_kwargs: dict, optional
+    :param parallel: number of concurrent FFmpeg processes to decode the audio in
+                     packet-aligned segments, defaults to None (single process)
+    :type parallel: int, optional
     :param \\**options: FFmpeg options, append '_in' for input option names (see :doc:`options`)
     :type \\**options: dict, optional
     :return: sample rate in samples/second and audio data object specified by `bytes_to_audio` plugin hook
@@ -183,43 +355,70 @@ def read(url, progress=None, show_log=None, sp_kwargs=None, **options):
         to perform block-wise processing. Instead use the streaming solution,
         see :py:func:`open`.
 
+    .. note:: The `parallel` option splits the audio only if the entire audio stream
+        of a local file is read without seeking, duration, resampling, or filter
+        options and its codec decodes sample-exactly from any packet (PCM, FLAC,
+        ALAC, WavPack, or TTA). Otherwise, the audio is read by a single FFmpeg
+        process.
 
     """
 
-    sample_fmt = options.get("sample_fmt", None)
-    ac_in = ar_in = None
-    if sample_fmt is None:
-        try:
-            # use the same format as the input
-            info = probe.audio_streams_basic(url, 0)[0]
-            sample_fmt = info["sample_fmt"]
-            ac_in = info.get("ac", None)
-            ar_in = info.get("ar", None)
-        except:
-            sample_fmt = "s16"
+    ffmpeg_args, sample_fmt, ac_in, ar_in, sp_kwargs = _config_read(
+        url, sp_kwargs, options
+    )
 
-    input_options = utils.pop_extra_options(options, "_in")
-    url, stdin, input = configure.check_url(
-        url, False, format=input_options.get("f", None)
+    return _run_read(
+        ffmpeg_args,
+        sample_fmt_in=sample_fmt,
+        ac_in=ac_in,
+        ar_in=ar_in,
+        progress=progress,
+        show_log=show_log,
+        sp_kwargs=sp_kwargs,
+        parallel=parallel,
     )
 
-    ffmpeg_args = configure.empty()
-    configure.add_url(ffmpeg_args, "input", url, input_options)[1][1]
-    configure.add_url(ffmpeg_args, "output", "-", options)[1][1]
 
-    # override user specified stdin and input if given
-    sp_kwargs = {**sp_kwargs} if sp_kwargs else {}
-    sp_kwargs["stdin"] = stdin
-    sp_kwargs["input"] = input
+def read_segments(url, parallel=None, show_log=None, sp_kwargs=None, **options):
+    """Read audio samples in packet-aligned segments decoded concurrently
+
+    :param url: URL of the audio file to read.
+    :type url: str
+    :param parallel: number of concurrent FFmpeg processes, defaults to None
+                     (= number of CPUs)
+    :type parallel: int, optional
+    :param show_log: True to show FFmpeg log messages on the console,
+                     defaults to None (no show/capture)
+                     Ignored if stream format must be retrieved automatically.
+    :type show_log: bool, optional
+    :param sp_kwargs: dictionary with keywords passed to `subprocess.run()` or
+                      `subprocess.Popen()` call used to run the FFmpeg, defaults
+                      to None
+    :type sp_kwargs: dict, optional
+    :param \\**options: FFmpeg options, append '_in' for input option names (see :doc:`options`)
+    :type \\**options: dict, optional
+    :return: sample rate in samples/second and iterator of audio data objects of the
+             segments in order, created by `bytes_to_audio` plugin hook
+    :rtype: tuple(int, Iterator[object])
+
+    While a segment is yielded, up to `parallel` following segments are decoded
+    ahead. If the read cannot be split (see :py:func:`read`), a single segment
+    with the entire audio is yielded.
+    """
+
+    ffmpeg_args, sample_fmt, ac_in, ar_in, sp_kwargs = _config_read(
+        url, sp_kwargs, options
+    )
 
     return _run_read(
         ffmpeg_args,
         sample_fmt_in=sample_fmt,
         ac_in=ac_in,
         ar_in=ar_in,
-        progress=progress,
         show_log=show_log,
         sp_kwargs=sp_kwargs,
+        parallel=max(parallel or _os_cpu_count(), 2),
+        segmented=True,
     )
 
 
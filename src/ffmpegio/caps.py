@@ -5,10 +5,13 @@ import logging
 logger = logging.getLogger("ffmpegio")
 
 import re, fractions, subprocess as sp
+import atexit, hashlib, os, pickle, threading
 from collections import namedtuple
 from fractions import Fraction
 from functools import partial
+from shutil import which
 
+from . import path as _ffpath
 from .path import ffmpeg as _ffmpeg
 from .errors import FFmpegError
 
@@ -16,8 +19,8 @@ from .errors import FFmpegError
 __all__ = ["options", "filters", "codecs", "coders", "formats", "devices",
     "muxers", "demuxers", "bsfilters", "protocols", "pix_fmts", "sample_fmts",
     "layouts", "colors", "demuxer_info", "muxer_info", "encoder_info",
-    "decoder_info", "filter_info", "bsfilter_info", "frame_rate_presets",
-    "video_size_presets"]
+    "decoder_info", "filter_info", "filter_options", "bsfilter_info",
+    "frame_rate_presets", "video_size_presets", "save_snapshot"]
 # fmt:on
 
 _ffCodecRegexp = re.compile(
@@ -35,6 +38,141 @@ _filterRegexp = re.compile(
 
 _cache = dict()
 
+#: bool: False to disable the on-disk snapshot of the capability tables
+SNAPSHOT = True
+
+# The capability tables in _cache are persisted under cache_dir("caps"), one
+# pickle file per table in a directory keyed by the FFmpeg executable (real
+# path, mtime, and size). A table is read from the snapshot on its first
+# access, and the tables populated by running FFmpeg are written at exit.
+_snapshot_bin = None  # FFMPEG_BIN which _snapshot_dir is for
+_snapshot_dir = None  # snapshot directory or None if not available
+_loaded = set()  # tables already looked up in the snapshot
+_dirty = set()  # tables populated since the snapshot was loaded
+_lock = threading.RLock()
+
+
+def _get_snapshot_dir():
+    # resolve the snapshot directory of the current FFmpeg executable
+    global _snapshot_bin, _snapshot_dir
+
+    # keyed without FFMPEG_VER, which requires running FFmpeg
+    bin = _ffpath.FFMPEG_BIN
+    if bin == _snapshot_bin:
+        return _snapshot_dir
+
+    with _lock:
+        # FFmpeg executable changed, start over
+        _cache.clear()
+        _loaded.clear()
+        _dirty.clear()
+        _snapshot_bin, _snapshot_dir = bin, None
+
+        if not (SNAPSHOT and bin):
+            return None
+        try:
+            exe = os.path.realpath(which(bin) or bin)
+            st = os.stat(exe)
+            key = f"{exe}|{st.st_mtime_ns}|{st.st_size}"
+            _snapshot_dir = _ffpath.cache_dir(
+                "caps", hashlib.sha1(key.encode("utf-8")).hexdigest()[:16]
+            )
+        except OSError as e:
+            logger.debug(f"[caps] snapshot not available: {e}")
+
+    return _snapshot_dir
+
+
+def _load(table):
+    # look up the table in the snapshot (only once per table)
+    dir = _get_snapshot_dir()
+    if table in _loaded:
+        return
+
+    with _lock:
+        if table in _loaded:
+            return
+        _loaded.add(table)
+        if dir is None:
+            return
+        try:
+            with open(os.path.join(dir, f"{table}.pkl"), "rb") as f:
+                _cache[table] = pickle.load(f)
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.warning(f"[caps] failed to load the snapshot of {table}: {e}")
+
+
+def _mark_dirty(table):
+    # table populated by running FFmpeg, to be saved in the snapshot
+    with _lock:
+        _dirty.add(table)
+
+
+def save_snapshot(populate=False):
+    """save the capability tables of the current FFmpeg executable on disk
+
+    :param populate: True to query all the capability lists (but not the
+                     detailed info of individual components) before saving,
+                     defaults to False
+    :type populate: bool, optional
+
+    The snapshot is stored in :code:`ffmpegio.path.cache_dir("caps")` and
+    keyed by the real path, modification time, and size of the FFmpeg
+    executable, so it is rebuilt automatically if FFmpeg is updated. The
+    tables populated during the session are automatically saved when the
+    Python process exits; call this function to save them immediately (e.g.,
+    to prepare the snapshot before spawning short-lived worker processes).
+    Set :code:`ffmpegio.caps.SNAPSHOT = False` to disable the snapshot.
+    """
+
+    if populate:
+        options()
+        filters()
+        filter_options()
+        codecs()
+        encoders()
+        decoders()
+        formats()
+        muxers()
+        demuxers()
+        bsfilters()
+        protocols()
+        pix_fmts()
+        sample_fmts()
+        layouts()
+        colors()
+
+    with _lock:
+        dir = _get_snapshot_dir()
+        if dir is None:
+            return
+        for table in list(_dirty):
+            if table not in _cache:
+                continue
+            path = os.path.join(dir, f"{table}.pkl")
+            tmp = f"{path}.{os.getpid()}.tmp"
+            try:
+                with open(tmp, "wb") as f:
+                    pickle.dump(_cache[table], f, pickle.HIGHEST_PROTOCOL)
+                os.replace(tmp, path)  # atomic for concurrent processes
+            except Exception as e:
+                logger.warning(f"[caps] failed to save the snapshot of {table}: {e}")
+                try:
+                    os.remove(tmp)
+                except OSError:
+                    pass
+            _dirty.discard(table)
+
+
+def _save_at_exit():
+    if _dirty:
+        save_snapshot()
+
+
+atexit.register(_save_at_exit)
+
 
 def ffmpeg(gopts):
     out = _ffmpeg(["-hide_banner", *gopts], stdout=sp.PIPE, encoding="utf-8")
@@ -46,15 +184,19 @@ def ffmpeg(gopts):
 
 
 def _(cap):
-    return (None, _cache[cap]) if (cap in _cache) else (ffmpeg([f"-{cap}"]), None)
+    _load(cap)
+    if cap in _cache:
+        return (None, _cache[cap])
+    _mark_dirty(cap)
+    return (ffmpeg([f"-{cap}"]), None)
 
 
 def __(type, name):
-    return (
-        (None, _cache[type][name])
-        if (type in _cache and name in _cache[type])
-        else (ffmpeg(["-help", f"{type}={name}"]), None)
-    )
+    _load(type)
+    if type in _cache and name in _cache[type]:
+        return (None, _cache[type][name])
+    _mark_dirty(type)
+    return (ffmpeg(["-help", f"{type}={name}"]), None)
 
 
 def options(type=None, name_only=False, return_desc=False):
@@ -69,9 +211,11 @@ def options(type=None, name_only=False, return_desc=False):
     :return: dict of types of options
     :rtype: dict(dict or tuple) if type not specified
     """
+    _load("options")
     try:
         opts = _cache["options"]
     except:
+        _mark_dirty("options")
         lines = ffmpeg(["-help", "long"]).split("\n")
         ginds = [
             (i + 1, l[:-1].lower())
@@ -144,11 +288,18 @@ def options(type=None, name_only=False, return_desc=False):
 FilterSummary = namedtuple(
     "FilterSummary",
     ["description", "input", "num_inputs", "output", "num_outputs",
-        "timeline_support", "slice_threading", "command_support"],
+        "timeline_support", "slice_threading", "command_support",
+        "input_types", "output_types"],
 )
 # fmt:on
 
 
+def _get_pad_types(s):
+    # media types of the pads listed by "ffmpeg -filters": e.g., "VA" or "N"
+    types = {"A": "audio", "V": "video"}
+    return None if s == "N" else tuple(types[t] for t in s if t in types)
+
+
 def filters(type=None):
     """get FFmpeg filters
 
@@ -171,6 +322,8 @@ def filters(type=None):
     timeline_support  bool      True if supports timeline editing
     slice_threading   bool      True if supports threading
     command_support   bool      True if supports command input from stdin
+    input_types       tuple     Media types of the input pads or None if 'dynamic'
+    output_types      tuple     Media types of the output pads or None if 'dynamic'
     ================  ========  ===============================================
     """
 
@@ -199,6 +352,8 @@ def filters(type=None):
                 timeline_support=match[1] == "T",
                 slice_threading=match[2] == "S",
                 command_support=match[3] == "C",
+                input_types=_get_pad_types(match[5]),
+                output_types=_get_pad_types(match[6]),
             )
 
         _cache["filters"] = data
@@ -838,9 +993,10 @@ def _getCodecInfo(name, encoder):
         "options": m[11],
     }
 
-    if not "muxer" in _cache:
-        _cache["muxer"] = {}
-    _cache["muxer"][name] = data
+    type = "encoder" if encoder else "decoder"
+    if not type in _cache:
+        _cache[type] = {}
+    _cache[type][name] = data
     return data
 
 
@@ -1118,6 +1274,77 @@ def filter_info(name):
     return data
 
 
+def _filter_class_names(class_name, names):
+    # names of the filters sharing the AVClass of an option set, e.g.,
+    # "scale(2ref)" -> scale & scale2ref, "(a)setpts" -> setpts & asetpts, and
+    # "bass/lowshelf" -> bass & lowshelf
+    found = []
+    for part in class_name.split("/"):
+        m = re.fullmatch(r"(\w*)\((\w+)\)(\w*)", part)
+        candidates = (m[1] + m[3], m[1] + m[2] + m[3]) if m else (part,)
+        found.extend(n for n in candidates if n in names and n not in found)
+    return found
+
+
+def filter_options(name=None):
+    """get the options of all filters or a filter without running FFmpeg per filter
+
+    :param name: filter name, defaults to None to return the options of all filters
+    :type name: str, optional
+    :return: list of filter options if `name` is given, else a dict of the
+             lists keyed by the filter names (or by the names of the option
+             sets which cannot be attributed to any filter)
+    :rtype: list(FilterOption) | dict(str, list(FilterOption))
+
+    The options of all the filters are parsed from a single run of
+    :code:`ffmpeg -h full`. An option set is listed under the name of its
+    AVClass, which may be shared by several filters (e.g., ``scale(2ref)`` for
+    the ``scale`` and ``scale2ref`` filters and ``(a)setpts`` for ``setpts`` and
+    ``asetpts``) and is mapped to the filter names found in :py:func:`filters`.
+    If the option set of the filter cannot be identified, the options are
+    obtained from :py:func:`filter_info`.
+
+    See :py:func:`filter_info` for the entries of FilterOption.
+    """
+
+    _load("filter_options")
+    data = _cache.get("filter_options", None)
+    if data is None:
+        _mark_dirty("filter_options")
+        stdout = ffmpeg(["-h", "full"])
+
+        # filter option sets are listed between the option sets of the AVFilter
+        # and the AVBSFContext classes
+        m = re.search(
+            r"^AVFilter AVOptions:\n[\s\S]*?\n(?=\S)([\s\S]*?)(?:^AVBSFContext AVOptions:|\Z)",
+            stdout,
+            re.MULTILINE,
+        )
+        names = filters()
+        data = {}
+        shared = {}  # option sets of the AVClasses not named after the filter
+        if m:
+            for block in re.split(r"\n(?! |\n|$)", m[1]):
+                if " AVOptions:\n" in block:
+                    n, opts = _get_filter_options(block)
+                    fnames = _filter_class_names(n, names)
+                    if fnames == [n] or not fnames:
+                        data[n] = opts
+                    else:
+                        shared.update((f, opts) for f in fnames)
+        # a filter's own option set takes precedence over a shared one
+        data = {**shared, **data}
+        _cache["filter_options"] = data
+
+    if name is None:
+        return data
+
+    try:
+        return data[name]
+    except KeyError:
+        return filter_info(name).options or []
+
+
 def bsfilter_info(name):
     """get detailed info of a bitstream filter
 
@@ -1156,9 +1383,9 @@ def bsfilter_info(name):
         "supported_codecs": m[2].split(" ") if m[2] else [],
         "options": m[3],
     }
-    if not "filter" in _cache:
-        _cache["filter"] = {}
-    _cache["filter"][name] = data
+    if not "bsf" in _cache:
+        _cache["bsf"] = {}
+    _cache["bsf"][name] = data
     return data
 
 
@@ -1,11 +1,16 @@
 import re, logging
+from math import ceil
 
 logger = logging.getLogger("ffmpegio")
 
-from . import utils, plugins
+from . import utils, plugins, probe
 from .filtergraph import Graph, Filter, Chain
 from .errors import FFmpegioError
 
+#: bool: True to optimize the output filtergraph (`vf`/`af`) of the read operations
+#: with :py:meth:`ffmpegio.filtergraph.Graph.optimize` (opt-in)
+OPTIMIZE_FILTERGRAPH = False
+
 
 def array_to_video_input(rate, data, stream_id=None, **opts):
     """create an stdin input with video stream
@@ -251,6 +256,7 @@ def finalize_video_read_opts(
 
     # set up basic video filter if specified
     build_basic_vf(args, remove_alpha, ofile)
+    optimize_filtergraph(args, "video", inopts.get("s", s_in), ofile)
 
     outopts["f"] = "rawvideo"
 
@@ -268,6 +274,97 @@ def finalize_video_read_opts(
     return dtype, None if s is None else (*s[::-1], ncomp), r
 
 
+def finalize_video_seek_opts(args, seek_index=None, ifile=0, ofile=0):
+    """use the packet index to seek the input directly to the keyframe
+
+    :param args: FFmpeg argument dict (modified in place)
+    :type args: dict
+    :param seek_index: packet index of the input video stream or True to use the
+                       cached index (built if needed), defaults to None (not to
+                       use the index)
+    :type seek_index: dict or bool, optional
+    :param ifile: input file id, defaults to 0
+    :type ifile: int, optional
+    :param ofile: output file id, defaults to 0
+    :type ofile: int, optional
+    :return: True if the arguments are modified
+    :rtype: bool
+
+    The combined seek time of the input (`ss_in`) and output (`ss`) options is
+    split so that FFmpeg seeks the input to the keyframe preceding the target
+    (as found in the index) and the output skips the remaining frames. The
+    durations (`t_in` and `to`) are extended by the added input time while the
+    output duration (`t`) is kept as is. Only numeric time options are
+    supported; the arguments are left untouched otherwise.
+    """
+
+    if not seek_index:
+        return False
+
+    inurl, inopts = args["inputs"][ifile]
+    outopts = args["outputs"][ofile][1]
+    inopts = inopts or {}
+    outopts = outopts or {}
+
+    if not any(k in inopts for k in ("ss", "t")) and not any(
+        k in outopts for k in ("ss", "t", "to")
+    ):
+        return False  # nothing to do
+
+    if "sseof" in inopts or "itsoffset" in inopts or not isinstance(inurl, str):
+        return False
+
+    def get_time(opts, name):
+        v = opts.get(name, None)
+        if v is None or isinstance(v, bool):
+            return v
+        try:
+            return float(v)
+        except (TypeError, ValueError):
+            raise ValueError("non-numeric time")
+
+    try:
+        ss_in = get_time(inopts, "ss") or 0.0
+        ss = get_time(outopts, "ss") or 0.0
+        t_in = get_time(inopts, "t")
+        to = get_time(outopts, "to")
+    except ValueError:
+        return False
+
+    if not isinstance(seek_index, dict):
+        try:
+            seek_index = probe.index(inurl)
+        except Exception as e:
+            logger.debug(f"[finalize_video_seek_opts] no packet index: {e}")
+            return False
+
+    target = ss_in + ss
+    kf = probe.seek_point(seek_index, target)[0]
+
+    # seek time in microseconds (FFmpeg's time resolution) at or after the keyframe
+    ss_in_new = min(ceil(kf * 1e6) / 1e6, target)
+    delta = ss_in - ss_in_new  # increase in the input duration
+
+    # store the option dicts (possibly new ones) back to the arguments
+    args["inputs"][ifile] = (inurl, inopts)
+    args["outputs"][ofile] = (args["outputs"][ofile][0], outopts)
+
+    if ss_in_new > 0:
+        inopts["ss"] = ss_in_new
+    else:
+        inopts.pop("ss", None)
+    if target > ss_in_new:
+        outopts["ss"] = target - ss_in_new
+    else:
+        outopts.pop("ss", None)
+    if t_in is not None:
+        inopts["t"] = t_in + delta
+    if to is not None:
+        outopts["to"] = to + delta
+
+    return True
+
+
 def check_alpha_change(args, dir=None, ifile=0, ofile=0):
     # check removal of alpha channel
     inopts = args["inputs"][ifile][1]
@@ -410,6 +507,70 @@ def build_basic_vf(args, remove_alpha=None, ofile=0):
             outopts["vf"] = bvf
 
 
+def optimize_filtergraph(args, type, size=None, ofile=0):
+    """optimize the output filtergraph (vf or af option)
+
+    :param args: FFmpeg argument dict (modified in place)
+    :type args: dict
+    :param type: filter type
+    :type type: 'video' or 'audio'
+    :param size: input video frame size, defaults to None
+    :type size: str or (int, int), optional
+    :param ofile: output file id, defaults to 0
+    :type ofile: int, optional
+    :return: estimated number of pixels per frame saved by the optimization
+    :rtype: int
+
+    Does nothing if :py:data:`OPTIMIZE_FILTERGRAPH` is False. The filtergraph
+    is left untouched if none of the rewrites applies. The frame size is
+    ignored if the input video stream carries rotation metadata as FFmpeg
+    may rotate the frames before they enter the filtergraph.
+    """
+
+    outopts = args["outputs"][ofile][1]
+    key = {"video": "vf", "audio": "af"}[type]
+    expr = outopts and outopts.get(key, None)
+    if not (OPTIMIZE_FILTERGRAPH and expr):
+        return 0
+
+    if isinstance(size, str):
+        m = re.match(r"(\d+)x(\d+)$", size)
+        size = m and (int(m[1]), int(m[2]))
+    if size and type == "video" and _is_rotated(args):
+        size = None
+
+    try:
+        fg = expr if isinstance(expr, Graph) else Graph(expr)
+        new_fg, saved = fg.optimize(size and tuple(size))
+        if str(new_fg) == str(fg):
+            return 0
+    except Exception as e:
+        logger.debug(f"[configure] skipped {key} optimization: {e}")
+        return 0
+
+    logger.debug(
+        f"[configure] optimized {key}: {fg} -> {new_fg} (saving ~{saved} pixels/frame)"
+    )
+    outopts[key] = new_fg
+    return saved
+
+
+def _is_rotated(args, ifile=0):
+    # True unless the input video stream is known to carry no rotation metadata
+    url, inopts = args["inputs"][ifile]
+    if inopts and "s" in inopts:
+        return False  # raw video input
+    try:
+        st = probe.full_details(url, show_format=False, select_streams="v:0")
+        st = st["streams"][0]
+        return bool(
+            float(st.get("tags", {}).get("rotate", 0))
+            or any(d.get("rotation", 0) for d in st.get("side_data_list", ()))
+        )
+    except Exception:
+        return True
+
+
 def finalize_audio_read_opts(
     args, sample_fmt_in=None, ac_in=None, ar_in=None, ofile=0, ifile=0
 ):
@@ -421,6 +582,8 @@ def finalize_audio_read_opts(
         outopts = {}
         args["outputs"][ofile] = (args["outputs"][ofile][0], outopts)
 
+    optimize_filtergraph(args, "audio", ofile=ofile)
+
     # pixel format must be specified
     sample_fmt = outopts.get("sample_fmt", None)
     if sample_fmt is None:
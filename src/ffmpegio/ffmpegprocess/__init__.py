@@ -11,6 +11,10 @@ Main API
 run(...): Runs a FFmpeg command, waits for it to complete, then returns a 
           CompletedProcess instance.
 Popen(...): A subclass of subprocess.Popen to manage FFmpeg subprocess.  
+run_segments(...): Runs FFmpeg concurrently over multiple segments of the 
+                   input and collects their outputs in one buffer.
+iter_segments(...): Generator version of run_segments(), yielding the output 
+                    of each segment in order.
 
 Constants
 ---------
@@ -20,8 +24,9 @@ PIPE:    Special value that indicates a pipe should be created
 """
 
 from collections import abc
-from os import path
-from threading import Thread
+from concurrent.futures import ThreadPoolExecutor
+from os import path, cpu_count
+from threading import Lock, current_thread
 import subprocess as sp
 from copy import deepcopy
 from tempfile import TemporaryDirectory
@@ -29,12 +34,15 @@ import logging
 
 logger = logging.getLogger("ffmpegio")
 
-from .utils.parser import parse, compose, FLAG
-from .threading import ProgressMonitorThread
-from .configure import move_global_options
-from .path import ffmpeg, DEVNULL, PIPE, devnull
+from ..utils.parser import parse, compose, FLAG
+from ..threading import ProgressMonitorThread, ProcessReaperThread
+from ..configure import move_global_options
+from ..path import ffmpeg, DEVNULL, PIPE, devnull
 
-__all__ = ["versions", "run", "Popen", "FLAG", "PIPE", "DEVNULL", "devnull"]
+# fmt:off
+__all__ = ["versions", "run", "Popen", "run_segments", "iter_segments", "FLAG",
+           "PIPE", "DEVNULL", "devnull"]
+# fmt:on
 
 
 def exec(
@@ -185,27 +193,18 @@ def exec(
     )
 
 
-def monitor_process(proc, on_exit=None):
-    """thread function to monitor subprocess termination
+_reaper = None
+_reaper_lock = Lock()
 
-    :param proc: subprocess to be monitored
-    :type proc: subprocess.Popen
-    :param on_exit: callback function(s) to be called after process is terminated and
-                    all auto-closing streams are closed
-    :type on_exit: Callable or seq(Callables), optional
 
-        on_exit(returncode)
-
-    """
-
-    logger.debug("[monitor] waiting for FFmpeg to terminate...")
-    proc.wait()
-    logger.debug("[monitor] FFmpeg terminated")
-    if on_exit is not None:
-        returncode = proc.returncode
-        for fcn in on_exit:
-            fcn(returncode)
-        logger.debug("[monitor] executed all on_exit callbacks")
+def _get_reaper():
+    # the process-wide reaper thread shared by all the Popen objects
+    global _reaper
+    with _reaper_lock:
+        if _reaper is None or (_reaper.ident is not None and not _reaper.is_alive()):
+            # first use or the thread is gone (e.g., in a forked child process)
+            _reaper = ProcessReaperThread()
+        return _reaper
 
 
 class Popen(sp.Popen):
@@ -235,6 +234,10 @@ class Popen(sp.Popen):
     :type stderr: writable file object, optional
     :param on_exit: function(s) to execute when FFmpeg process terminates, defaults to None
     :type on_exit: Callable or seq(Callable), optional
+    :param pass_fds: file descriptors to keep open in FFmpeg process (POSIX only),
+                     e.g., the write ends of pipes given as ``pipe:<fd>`` urls,
+                     defaults to None
+    :type pass_fds: seq(int), optional
     :param \\**other_popen_args: other keyword arguments to :py:class:`subprocess.Popen`
     :type \\**other_popen_args: dict, optional
 
@@ -258,6 +261,7 @@ class Popen(sp.Popen):
         stdout=None,
         stderr=None,
         on_exit=None,
+        pass_fds=None,
         **other_popen_args,
     ):
         if any(
@@ -284,7 +288,7 @@ class Popen(sp.Popen):
 
         # run progress monitor
         self._progmon = None if progress is None else ProgressMonitorThread(progress)
-        self._monitor = None
+        self._exited = None  # set after all on_exit callbacks are executed
 
         # start FFmpeg process
         exec(
@@ -297,6 +301,7 @@ class Popen(sp.Popen):
             stdout,
             stderr,
             super().__init__,
+            **({"pass_fds": pass_fds} if pass_fds else {}),
         )
 
         # set progress monitor's cancelfun to allow its callback to terminate the FFmpeg process
@@ -304,7 +309,7 @@ class Popen(sp.Popen):
             self._progmon.cancelfun = self.terminate
             self._progmon.start()
 
-        # start the process monitor to perform the cleanup when FFmpeg terminates
+        # have the shared reaper perform the cleanup when FFmpeg terminates
         if self._progmon or capture_log or on_exit:
             if on_exit is None:
                 on_exit = []
@@ -320,11 +325,17 @@ class Popen(sp.Popen):
             if self._progmon:
                 on_exit.append(lambda _: self._progmon.join())
 
-            self._monitor = Thread(
-                target=monitor_process,
-                args=(self, on_exit),
-            )
-            self._monitor.start()
+            self._exited = _get_reaper().register(self, on_exit)
+
+    def _wait_exited(self):
+        # wait for the reaper to finish running on_exit callbacks unless called
+        # by one of the callbacks or by the progress callback
+        if (
+            self._exited is not None
+            and current_thread() is not self._progmon
+            and not (_reaper is not None and _reaper.in_callback())
+        ):
+            self._exited.wait()
 
     def wait(self, timeout=None):
         """Wait for FFmpeg process to terminate; returns self.returncode
@@ -337,30 +348,21 @@ class Popen(sp.Popen):
         If the process does not terminate after timeout seconds, raise a TimeoutExpired exception.
         It is safe to catch this exception and retry the wait.
         """
-        super().wait(timeout)
+        returncode = super().wait(timeout)
 
-        # Popen waits on monitor thread as well. Ignore "cannot join current thread" error when
-        # monitor waits Popen
-        try:
-            self._monitor.join()
-        except:
-            pass
+        # Popen waits on the on_exit callbacks as well
+        self._wait_exited()
+        return returncode
 
     def terminate(self):
         """Terminate the FFmpeg process"""
         super().terminate()
-        try:
-            self._monitor.join()
-        except:
-            pass
+        self._wait_exited()
 
     def kill(self):
         """Kill the FFmpeg process"""
         super().kill()
-        try:
-            self._monitor.join()
-        except:
-            pass
+        self._wait_exited()
 
     def send_signal(self, sig: int):
         """Sends the signal signal to the FFmpeg process
@@ -371,7 +373,7 @@ class Popen(sp.Popen):
         try:
             super().send_signal(sig)
             if self.returncode is None:
-                self._monitor.join()
+                self._wait_exited()
         except:
             pass
 
@@ -588,3 +590,196 @@ def run_two_pass(
         ret.stderr = ret.stderr.decode("utf-8")
 
     return ret
+
+
+def _segment_args(ffmpeg_args, inopts, outopts):
+    # create FFmpeg arguments of a segment (only modify options of the first input & output)
+    args = {**ffmpeg_args}
+    args["global_options"] = {**(args.get("global_options", None) or {})}
+    args["inputs"] = list(args["inputs"])
+    args["outputs"] = list(args["outputs"])
+    url, opts = args["inputs"][0]
+    args["inputs"][0] = (url, {**(opts or {}), **inopts})
+    url, opts = args["outputs"][0]
+    args["outputs"][0] = (url, {**(opts or {}), **outopts})
+    return args
+
+
+def _run_segment(ffmpeg_args, buffer, popen_kwargs, extra=0):
+    # run FFmpeg until buffer is filled or it terminates, then read up to extra
+    # bytes more (all the rest if negative) to detect an overshoot. Returns the
+    # number of bytes output and the bytes read past the buffer
+
+    proc = Popen(ffmpeg_args, capture_log=False, **popen_kwargs)
+    nbytes = len(buffer)
+    nread = 0
+    tail = b""
+    try:
+        with memoryview(buffer) as mv:
+            while nread < nbytes:
+                n = proc.stdout.readinto(mv[nread:])
+                if not n:
+                    break
+                nread += n
+        if nread == nbytes and extra:
+            tail = proc.stdout.read(extra if extra > 0 else -1)
+            nread += len(tail)
+    finally:
+        proc.stdout.close()
+        if proc.poll() is None:
+            # segment filled, no need to wait for FFmpeg to complete
+            proc.terminate()
+        proc.wait()
+
+    logger.debug(f"[run_segments] segment read {nread} of {nbytes} bytes")
+    return nread, tail
+
+
+def _iter_sequential(ffmpeg_args, offset, nbytes, popen_kwargs):
+    # decode the input from its start in a single FFmpeg process, skip the
+    # first offset bytes of the output, and yield the rest in blocks of nbytes
+    # (the last block gets all the remaining output)
+
+    proc = Popen(ffmpeg_args, capture_log=False, **popen_kwargs)
+    try:
+        while offset > 0:
+            n = len(proc.stdout.read(min(offset, 2**20)))
+            if not n:
+                return
+            offset -= n
+
+        for n in nbytes[:-1]:
+            b = proc.stdout.read(n)
+            if not b:
+                return
+            yield bytearray(b)
+        b = proc.stdout.read()
+        if b:
+            yield bytearray(b)
+    finally:
+        proc.stdout.close()
+        if proc.poll() is None:
+            proc.terminate()
+        proc.wait()
+
+
+def run_segments(
+    ffmpeg_args, segments, itemsize, max_workers=None, buffer=None, **popen_kwargs
+):
+    """run FFmpeg concurrently on segments of the input and collect their outputs
+
+    :param ffmpeg_args: FFmpeg argument options with one input and one piped output
+    :type ffmpeg_args: dict
+    :param segments: list of segment specifications: input options, output options,
+                     and number of output items (video frames or audio samples) of
+                     each segment
+    :type segments: seq(tuple(dict, dict, int))
+    :param itemsize: number of bytes per output item
+    :type itemsize: int
+    :param max_workers: maximum number of concurrent FFmpeg processes, defaults to
+                        None (= number of CPUs)
+    :type max_workers: int, optional
+    :param buffer: preallocated writable buffer to store the output, defaults to
+                   None (allocate a new bytearray)
+    :type buffer: writable bytes-like object, optional
+    :param \\**popen_kwargs: other keyword arguments of :py:class:`Popen`
+    :type \\**popen_kwargs: dict, optional
+    :return: output buffer and number of items output by each segment
+    :rtype: tuple(bytes-like object, list(int))
+
+    The output of the i-th segment is written directly into its slice of the output
+    buffer. Each segment must yield exactly its number of items for the outputs to
+    be contiguous; compare the returned counts against the requested ones. A
+    segment producing more items than requested is reported with one extra item.
+    """
+
+    nbytes = [n * itemsize for _, _, n in segments]
+    if buffer is None:
+        buffer = bytearray(sum(nbytes))
+
+    with memoryview(buffer) as mv, ThreadPoolExecutor(
+        max_workers or cpu_count()
+    ) as executor:
+        futures = []
+        i0 = 0
+        for (inopts, outopts, _), n in zip(segments, nbytes):
+            futures.append(
+                executor.submit(
+                    _run_segment,
+                    _segment_args(ffmpeg_args, inopts, outopts),
+                    mv[i0 : i0 + n],
+                    popen_kwargs,
+                    itemsize,
+                )
+            )
+            i0 += n
+        counts = [f.result()[0] // itemsize for f in futures]
+
+    return buffer, counts
+
+
+def iter_segments(ffmpeg_args, segments, itemsize, max_workers=None, **popen_kwargs):
+    """run FFmpeg concurrently on segments of the input and yield their outputs in order
+
+    :param ffmpeg_args: FFmpeg argument options with one input and one piped output
+    :type ffmpeg_args: dict
+    :param segments: list of segment specifications: input options, output options,
+                     and number of output items (video frames or audio samples) of
+                     each segment
+    :type segments: seq(tuple(dict, dict, int))
+    :param itemsize: number of bytes per output item
+    :type itemsize: int
+    :param max_workers: maximum number of concurrent FFmpeg processes, defaults to
+                        None (= number of CPUs)
+    :type max_workers: int, optional
+    :param \\**popen_kwargs: other keyword arguments of :py:class:`Popen`
+    :type \\**popen_kwargs: dict, optional
+    :yield: output of each segment
+    :rtype: bytearray
+
+    Up to `max_workers` segments are decoded ahead of the one being yielded.
+    The last segment outputs all the remaining items, so its number of items
+    may only be an estimate. If any other segment does not produce exactly its
+    number of items, the rest of the output is decoded sequentially from the
+    start of the input in a single FFmpeg process.
+    """
+
+    max_workers = max_workers or cpu_count()
+    segments = list(segments)
+    nseg = len(segments)
+
+    def submit(executor, k):
+        inopts, outopts, n = segments[k]
+        buffer = bytearray(n * itemsize)
+        args = _segment_args(ffmpeg_args, inopts, outopts)
+        # read an extra item to detect an overshoot or the rest of the last segment
+        extra = itemsize if k < nseg - 1 else -1
+        return buffer, executor.submit(_run_segment, args, buffer, popen_kwargs, extra)
+
+    with ThreadPoolExecutor(max_workers) as executor:
+        pending = [submit(executor, k) for k in range(min(max_workers, nseg))]
+        offset = 0
+        for k in range(nseg):
+            buffer, future = pending.pop(0)
+            if k + max_workers < nseg:
+                pending.append(submit(executor, k + max_workers))
+            nread, tail = future.result()
+            if k == nseg - 1:
+                # last segment: all the remaining output
+                buffer.extend(tail)
+                del buffer[nread - nread % itemsize :]
+            elif nread != len(buffer):
+                logger.warning(
+                    f"[iter_segments] segment {k} did not produce the expected output, decoding the rest sequentially"
+                )
+                for _, f in pending:
+                    f.cancel()
+                yield from _iter_sequential(
+                    ffmpeg_args,
+                    offset,
+                    [n * itemsize for _, _, n in segments[k:]],
+                    popen_kwargs,
+                )
+                return
+            offset += len(buffer)
+            yield buffer
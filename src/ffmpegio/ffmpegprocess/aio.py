@@ -0,0 +1,552 @@
+r"""FFmpeg subprocesses for asyncio applications
+
+This module mirrors :py:mod:`ffmpegio.ffmpegprocess` on top of
+:py:func:`asyncio.create_subprocess_exec`. It accepts the same FFmpeg argument
+dicts, and the progress updates and the log messages are delivered via async
+iterators (or callbacks) running on the event loop, i.e., this module spawns
+no helper thread per FFmpeg process.
+
+The child processes are, however, watched by asyncio. On POSIX systems with
+Python 3.8-3.11, the default :py:class:`asyncio.ThreadedChildWatcher` starts
+a thread per child process to wait for its termination. On Linux (kernel 5.3+)
+with Python 3.9-3.11, the application may install
+:py:class:`asyncio.PidfdChildWatcher` before starting any FFmpeg process to
+avoid these threads::
+
+    watcher = asyncio.PidfdChildWatcher()
+    asyncio.set_child_watcher(watcher)
+
+Python 3.12 and later use pidfd by default where available. This module does
+not change the child watcher as it is a process-wide asyncio setting.
+
+Main API
+========
+run(...): Coroutine to run a FFmpeg command, wait for it to complete, then
+          return a CompletedProcess instance.
+Popen(...): Awaitable class to manage FFmpeg asyncio subprocess.
+
+"""
+
+import asyncio
+import os
+import re
+import subprocess as sp
+from tempfile import TemporaryDirectory
+import logging
+
+logger = logging.getLogger("ffmpegio")
+
+from ..utils.parser import parse
+from ..configure import move_global_options
+from ..path import FFmpegNotFound, DEVNULL, PIPE, devnull
+from . import exec
+
+__all__ = ["run", "Popen", "PIPE", "DEVNULL", "devnull"]
+
+_progress_pattern = re.compile(r"(.+)?=(.+)")
+
+
+def _progress_value(val):
+    val = val.lstrip()
+    try:
+        return int(val)
+    except:
+        try:
+            return float(val)
+        except:
+            return val
+
+
+class _ProgressSource:
+    """FFmpeg -progress output reader
+
+    :param poll_interval: polling interval in seconds if progress is written to
+                          a temporary file, defaults to 10e-3
+
+    On POSIX systems, FFmpeg writes the progress to a pipe (`pipe:N` url) which
+    is read asynchronously. On the other systems, FFmpeg writes to a file in a
+    temporary directory, which is polled on the event loop.
+    """
+
+    def __init__(self, poll_interval=10e-3):
+        self.poll_interval = poll_interval
+        self._tempdir = None
+        self._rfd = self._wfd = None
+        self._reader = None
+        self._transport = None
+
+        if os.name == "posix":
+            self._rfd, self._wfd = os.pipe()
+            self.url = f"pipe:{self._wfd}"
+            self.pass_fds = (self._wfd,)
+        else:
+            self._tempdir = TemporaryDirectory()
+            self.url = os.path.join(self._tempdir.name, "progress.txt")
+            self.pass_fds = ()
+
+    async def open(self):
+        """start reading (call after FFmpeg is spawned)"""
+
+        if self._wfd is not None:
+            # FFmpeg owns the write end now
+            os.close(self._wfd)
+            self._wfd = None
+            loop = asyncio.get_running_loop()
+            self._reader = asyncio.StreamReader()
+            self._transport, _ = await loop.connect_read_pipe(
+                lambda: asyncio.StreamReaderProtocol(self._reader),
+                os.fdopen(self._rfd, "rb", 0),
+            )
+            self._rfd = None
+
+    async def _lines_from_file(self, running):
+        url = self.url
+        while running() and not os.path.isfile(url):
+            await asyncio.sleep(self.poll_interval)
+
+        if not os.path.isfile(url):
+            return
+
+        with open(url, "rt") as f:
+            pending = ""
+            while True:
+                is_running = running()
+                pending += f.read()
+                *lines, pending = pending.split("\n")
+                for line in lines:
+                    yield line
+                if not is_running:
+                    break
+                await asyncio.sleep(self.poll_interval)
+
+    async def _lines_from_pipe(self):
+        async for line in self._reader:
+            yield line.decode("utf-8")
+
+    async def __call__(self, running):
+        """async generator of (data, done) progress updates
+
+        :param running: function returning False once FFmpeg has terminated
+        :type running: Callable
+        """
+
+        lines = (
+            self._lines_from_file(running)
+            if self._reader is None
+            else self._lines_from_pipe()
+        )
+        d = {}
+        async for line in lines:
+            m = _progress_pattern.match(line.rstrip())
+            if not m:
+                continue
+            if m[1] != "progress":
+                d[m[1]] = _progress_value(m[2])
+            else:
+                yield d, m[2] == "end"
+                d = {}
+
+    def close(self):
+        if self._transport is not None:
+            self._transport.close()
+            self._transport = None
+        for fd in (self._rfd, self._wfd):
+            if fd is not None:
+                try:
+                    os.close(fd)
+                except OSError:
+                    pass
+        self._rfd = self._wfd = None
+        if self._tempdir is not None:
+            try:
+                self._tempdir.cleanup()
+            except:
+                pass
+            self._tempdir = None
+
+
+class Popen:
+    """Execute FFmpeg in a new asyncio subprocess.
+
+    :param ffmpeg_args: FFmpeg arguments
+    :type ffmpeg_args: dict
+    :param hide_banner: False to output ffmpeg banner in stderr, defaults to True
+    :type hide_banner: bool, optional
+    :param progress: True to enable :py:meth:`iter_progress` or a progress
+                     callback function, defaults to None. The callback (a
+                     regular function or a coroutine function) takes two
+                     arguments and may return True to terminate execution::
+
+                        progress(data:dict, done:bool) -> bool|None
+
+    :type progress: bool or Callable, optional
+    :param overwrite: True to overwrite if output url exists, defaults to None
+                      (auto-select)
+    :type overwrite: bool, optional
+    :param capture_log: True to capture log messages on stderr, False to send
+                    logs to console, defaults to None (no show/capture)
+    :type capture_log: bool, optional
+    :param stdin: source file object, defaults to None
+    :type stdin: readable file object, optional
+    :param stdout: sink file object, defaults to None
+    :type stdout: writable file object, optional
+    :param stderr: file to log ffmpeg messages, defaults to None
+    :type stderr: writable file object, optional
+    :param on_exit: function(s) to execute when FFmpeg process terminates, defaults to None
+    :type on_exit: Callable or seq(Callable), optional
+    :param \\**other_popen_args: other keyword arguments to
+                                :py:func:`asyncio.create_subprocess_exec`
+    :type \\**other_popen_args: dict, optional
+
+    The FFmpeg process is started by awaiting the object or by entering its
+    async context::
+
+        proc = await Popen(args)
+        await proc.wait()
+
+        async with Popen(args, progress=True) as proc:
+            async for data, done in proc.iter_progress():
+                ...
+
+    The piped :code:`stdin`, :code:`stdout`, and :code:`stderr` are
+    :py:class:`asyncio.StreamWriter` and :py:class:`asyncio.StreamReader`
+    objects.
+
+    """
+
+    def __init__(
+        self,
+        ffmpeg_args,
+        *,
+        hide_banner=True,
+        progress=None,
+        overwrite=None,
+        capture_log=None,
+        stdin=None,
+        stdout=None,
+        stderr=None,
+        on_exit=None,
+        **other_popen_args,
+    ):
+        if any(
+            (
+                k
+                for k in other_popen_args.keys()
+                if k
+                in (
+                    # fmt: off
+                    "executable", "close_fds", "shell", "universal_newlines", "pass_fds",
+                    "encoding", "errors", "text",
+                    # fmt: on
+                )
+            )
+        ):
+            raise ValueError(
+                "Input arguments contain protected subprocess keyword argument(s)."
+            )
+
+        #: dict: The FFmpeg args argument as it was passed to `Popen`
+        self.ffmpeg_args = move_global_options(
+            {**ffmpeg_args} if isinstance(ffmpeg_args, dict) else parse(ffmpeg_args)
+        )
+
+        if on_exit is not None:
+            try:
+                on_exit = [*on_exit]
+            except:
+                on_exit = [on_exit]
+
+        self._kwargs = dict(
+            hide_banner=hide_banner,
+            overwrite=overwrite,
+            capture_log=capture_log,
+            stdin=stdin,
+            stdout=stdout,
+            stderr=stderr,
+            **other_popen_args,
+        )
+        self._on_exit = on_exit
+        self._progress = progress
+        self._progsrc = None  # _ProgressSource
+        self._progtask = None  # progress callback task
+        self._proc = None  # asyncio.subprocess.Process
+        self._waiter = None  # task awaiting the process termination
+
+        #: list: The FFmpeg command as it was launched (set once started)
+        self.args = None
+
+    def __await__(self):
+        return self._start().__await__()
+
+    async def __aenter__(self):
+        if self._proc is None:
+            await self._start()
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        if self.stdin is not None:
+            try:
+                self.stdin.close()
+            except:
+                pass
+        if exc_type is not None and self.returncode is None:
+            self.kill()
+        await self.wait()
+        if self._progsrc is not None:
+            self._progsrc.close()
+
+    async def _start(self):
+        if self._proc is not None:
+            return self
+
+        kwargs = {**self._kwargs}
+        progsrc = self._progsrc = _ProgressSource() if self._progress else None
+
+        def create_subprocess_exec(args, **kwargs):
+            # path.ffmpeg() passes the full command as a sequence
+            self.args = args
+            return asyncio.create_subprocess_exec(*args, **kwargs)
+
+        try:
+            self._proc = await exec(
+                self.ffmpeg_args,
+                kwargs.pop("hide_banner"),
+                progsrc,
+                kwargs.pop("overwrite"),
+                kwargs.pop("capture_log"),
+                kwargs.pop("stdin"),
+                kwargs.pop("stdout"),
+                kwargs.pop("stderr"),
+                create_subprocess_exec,
+                **({"pass_fds": progsrc.pass_fds} if progsrc and progsrc.pass_fds else {}),
+                **kwargs,
+            )
+        except FileNotFoundError:
+            if progsrc:
+                progsrc.close()
+            raise FFmpegNotFound()
+        except:
+            if progsrc:
+                progsrc.close()
+            raise
+
+        if progsrc:
+            await progsrc.open()
+            if callable(self._progress):
+                self._progtask = asyncio.ensure_future(
+                    self._run_progress_callback(self._progress)
+                )
+
+        self._waiter = asyncio.ensure_future(self._wait())
+
+        return self
+
+    async def _run_progress_callback(self, callback):
+        async for data, done in self.iter_progress():
+            try:
+                ret = callback(data, done)
+                if asyncio.iscoroutine(ret):
+                    ret = await ret
+                if ret and self.returncode is None:
+                    logger.debug("[aio] operation canceled by user agent")
+                    self.terminate()
+            except Exception as e:
+                logger.critical(f"[aio] user progress callback error:\n\n{e}")
+
+    async def _wait(self):
+        returncode = await self._proc.wait()
+        logger.debug("[aio] FFmpeg terminated")
+        if self._progtask is not None:
+            await self._progtask
+        if self._progsrc is not None and self._progress is not True:
+            self._progsrc.close()
+        if self._on_exit:
+            for fcn in self._on_exit:
+                fcn(returncode)
+        return returncode
+
+    @property
+    def pid(self):
+        """int: process ID of the FFmpeg process"""
+        return self._proc and self._proc.pid
+
+    @property
+    def returncode(self):
+        """int|None: FFmpeg exit status (None if still running)"""
+        return self._proc and self._proc.returncode
+
+    @property
+    def stdin(self):
+        """asyncio.StreamWriter|None: FFmpeg stdin pipe"""
+        return self._proc and self._proc.stdin
+
+    @property
+    def stdout(self):
+        """asyncio.StreamReader|None: FFmpeg stdout pipe"""
+        return self._proc and self._proc.stdout
+
+    @property
+    def stderr(self):
+        """asyncio.StreamReader|None: FFmpeg stderr pipe"""
+        return self._proc and self._proc.stderr
+
+    async def wait(self):
+        """Wait for FFmpeg process to terminate; returns self.returncode
+
+        For FFmpeg to terminate autonomously, its stdin PIPE must be closed.
+        """
+        await self._start()
+        return await asyncio.shield(self._waiter)
+
+    async def communicate(self, input=None):
+        """Send data to stdin, read stdout and stderr until EOF, and wait for
+        FFmpeg to terminate
+
+        :param input: data to be sent to FFmpeg, defaults to None
+        :type input: bytes-like object, optional
+        :return: stdout and stderr data
+        :rtype: tuple(bytes|None, bytes|None)
+        """
+        await self._start()
+        stdout, stderr = await self._proc.communicate(
+            input if input is None else memoryview(input)
+        )
+        await self.wait()
+        return stdout, stderr
+
+    async def iter_progress(self):
+        """Iterate over FFmpeg progress updates
+
+        :yield: progress data and done flag
+        :rtype: AsyncIterator[tuple(dict, bool)]
+
+        Requires `progress=True` (or a callback, which consumes the updates).
+        FFmpeg stalls if the progress updates are left unread for a long time.
+        """
+
+        progsrc = self._progsrc
+        if progsrc is None:
+            raise ValueError("progress is not enabled for this FFmpeg process")
+
+        try:
+            async for data, done in progsrc(lambda: self.returncode is None):
+                yield data, done
+        finally:
+            if self._progtask is None:
+                progsrc.close()
+
+    async def iter_log(self):
+        """Iterate over FFmpeg log messages
+
+        :yield: log line
+        :rtype: AsyncIterator[str]
+
+        Requires `capture_log=True`.
+        """
+        stderr = self.stderr
+        if stderr is None:
+            raise ValueError("FFmpeg log is not captured (set capture_log=True)")
+
+        async for line in stderr:
+            yield line.decode("utf-8").rstrip("\r\n")
+
+    def terminate(self):
+        """Terminate the FFmpeg process"""
+        try:
+            self._proc.terminate()
+        except ProcessLookupError:
+            pass
+
+    def kill(self):
+        """Kill the FFmpeg process"""
+        try:
+            self._proc.kill()
+        except ProcessLookupError:
+            pass
+
+    def send_signal(self, sig: int):
+        """Sends the signal signal to the FFmpeg process
+
+        :param sig: signal id
+        :type sig: int
+        """
+        try:
+            self._proc.send_signal(sig)
+        except ProcessLookupError:
+            pass
+
+
+async def run(
+    ffmpeg_args,
+    *,
+    hide_banner=True,
+    progress=None,
+    overwrite=None,
+    capture_log=None,
+    stdin=None,
+    stdout=None,
+    stderr=None,
+    input=None,
+    **other_popen_kwargs,
+):
+    """run FFmpeg asyncio subprocess with standard pipes with a single transaction
+
+    :param ffmpeg_args: FFmpeg argument options
+    :type ffmpeg_args: dict
+    :param hide_banner: False to output ffmpeg banner in stderr, defaults to True
+    :type hide_banner: bool, optional
+    :param progress: progress callback function (regular or coroutine
+                     function), defaults to None. This function takes two
+                     arguments and may return True to terminate execution:
+
+                        progress(data:dict, done:bool) -> bool|None
+
+    :type progress: callable object, optional
+    :param overwrite: True to overwrite if output url exists, defaults to None
+                      (auto-select)
+    :type overwrite: bool, optional
+    :param capture_log: True to capture log messages on stderr, False to send
+                        logs to console, defaults to None (no show/capture)
+    :type capture_log: bool, optional
+    :param stdin: source file object, defaults to None
+    :type stdin: readable file-like object, optional
+    :param stdout: sink file object, defaults to None
+    :type stdout: writable file-like object, optional
+    :param stderr: file to log ffmpeg messages, defaults to None
+    :type stderr: writable file-like object, optional
+    :param input: input data buffer must be given if FFmpeg is configured to receive
+                    data stream from Python. It must be bytes convertible to bytes.
+    :type input: bytes-convertible object, optional
+    :param \\**other_popen_kwargs: other keyword arguments of :py:class:`Popen`, defaults to {}
+    :type \\**other_popen_kwargs: dict, optional
+    :rparam: completed process
+    :rtype: subprocess.CompleteProcess
+    """
+
+    proc = await Popen(
+        ffmpeg_args,
+        hide_banner=hide_banner,
+        progress=progress,
+        overwrite=overwrite,
+        capture_log=capture_log,
+        stdin=PIPE if input is not None else stdin,
+        stdout=stdout,
+        stderr=stderr,
+        **other_popen_kwargs,
+    )
+
+    try:
+        out, err = await proc.communicate(input)
+    except BaseException:
+        # includes task cancellation
+        if proc.returncode is None:
+            proc.kill()
+            await proc.wait()
+        raise
+
+    return sp.CompletedProcess(
+        proc.args,
+        proc.returncode,
+        out,
+        err.decode("utf-8") if isinstance(err, bytes) else err,
+    )
@@ -97,9 +97,9 @@ Both input and output filter pads can be specified in a number of ways:
 """
 from collections import UserList, abc
 from contextlib import contextmanager
-from functools import partial, reduce
+from functools import partial
 from copy import deepcopy
-import itertools
+import itertools, operator
 from math import floor, log10
 import os
 import re
@@ -107,7 +107,7 @@ from subprocess import PIPE
 from tempfile import NamedTemporaryFile
 
 from . import path
-from .caps import filters as list_filters, filter_info, layouts
+from .caps import filters as list_filters, filter_info, filter_options, layouts
 from .utils import filter as filter_utils, is_stream_spec
 from .utils.fglinks import GraphLinks
 from .errors import FFmpegioError
@@ -140,6 +140,22 @@ def _check_joinable(src, dst):
     return n == 1 and m == 1
 
 
+def _same_items(a, b):
+    # True if sequences hold the identical objects (filters are immutable)
+    return len(a) == len(b) and all(map(operator.is_, a, b))
+
+
+def _same_graph_key(a, b):
+    # compare Graph.__str__ cache keys: (chains, filters, links, sws_flags, autosplit)
+    return (
+        _same_items(a[0], b[0])
+        and all(map(_same_items, a[1], b[1]))
+        and a[2] == b[2]
+        and a[3] is b[3]
+        and a[4] == b[4]
+    )
+
+
 def _is_label(expr):
     return isinstance(expr, str) and re.match(r"\[[^\[\]]+\]$", expr)
 
@@ -204,7 +220,7 @@ def as_filtergraph_object(filter_specs):
 
     try:
         assert isinstance(filter_specs, str)
-        specs, links, sws_flags = filter_utils.parse_graph(filter_specs)
+        specs, links, sws_flags = filter_utils.parse_graph(filter_specs, frozen=True)
         n = len(specs)
         if links or sws_flags or n > 1:
             return Graph(specs, links, sws_flags)
@@ -220,16 +236,18 @@ def as_filtergraph_object(filter_specs):
                 return as_filtergraph(filter_specs)
 
 
-def _shift_labels(obj, label_type, args):
+def _shift_labels(obj, label_type, args, inplace=False):
+    add_labels = obj._add_labels if inplace else obj.add_labels
+
     if _is_label(args):
-        return obj.add_labels(label_type, args)
+        return add_labels(label_type, args)
 
     if all(_is_label(arg) for arg in args):
-        return obj.add_labels(label_type, args)
+        return add_labels(label_type, args)
 
     is_dst = label_type == "dst"
     assert len(args) == 2 and _is_label(args[0 if is_dst else 1])
-    return obj.add_labels(
+    return add_labels(
         label_type, {obj._resolve_index(is_dst, args[is_dst]): args[not is_dst]}
     )
 
@@ -280,16 +298,16 @@ class Filter(tuple):
         else:
             # parse if str given
             if isinstance(filter_spec, str):
-                filter_spec = filter_utils.parse_filter(filter_spec)
+                filter_spec = filter_utils.parse_filter(filter_spec, frozen=True)
 
             if not (isinstance(filter_spec, abc.Sequence) and len(filter_spec)):
                 raise ValueError("filter_spec must be a non-empty sequence.")
             name, *opts = filter_spec
             if isinstance(name, str):
-                proto.append((name, id) if isinstance(id, str) else name)
+                proto.append((name, filter_id) if isinstance(filter_id, str) else name)
             elif not (
                 isinstance(name, abc.Sequence)
-                and len(name) != 2
+                and len(name) == 2
                 and all((isinstance(i, str) for i in name))
             ):
                 raise ValueError(
@@ -301,8 +319,8 @@ class Filter(tuple):
 
             proto.extend(opts)
 
-        # create named options dict
-        proto_dict = proto.pop() if isinstance(proto[-1], dict) else {}
+        # create named options dict (copy as it may be shared)
+        proto_dict = dict(proto.pop()) if isinstance(proto[-1], abc.Mapping) else {}
 
         # change ordered options if non-None value is given
         nord = len(proto) - 1  # # of ordered options
@@ -355,7 +373,7 @@ class Filter(tuple):
 
         if isinstance(value, dict):
             value = {**value}
-        if isinstance(value, tuple):
+        if isinstance(value, tuple) and len(value):
             if isinstance(value[-1], dict):
                 value = tuple((*value[:-1], {**value[-1]}))
             elif isinstance(value[0], dict):
@@ -391,7 +409,7 @@ class Filter(tuple):
     @property
     def ordered_options(self):
         opts = self[1:]
-        return opts[:-1] if isinstance(opts[-1], dict) else opts
+        return opts[:-1] if len(opts) and isinstance(opts[-1], dict) else opts
 
     @property
     def named_options(self):
@@ -420,7 +438,12 @@ class Filter(tuple):
                 f"{port} is an invalid filter port type. Must be either 'input' or 'output'."
             )
 
-        port_info = getattr(self.info, port)
+        # pad media types are listed by `ffmpeg -filters` (no per-filter query)
+        try:
+            summary = list_filters()[self.name]
+        except:
+            raise Filter.InvalidName(self.name)
+        port_info = summary.input_types if port == "inputs" else summary.output_types
 
         if port_info is None:
             # filters with homogeneous multiple in/out
@@ -473,8 +496,7 @@ class Filter(tuple):
             raise Filter.Unsupported(self.name, "dynamic media type resolution")
 
         try:
-            pad_info = port_info[pad_id]
-            return pad_info["type"]
+            return port_info[pad_id]
         except:
             raise ValueError(
                 f"{pad_id} is an invalid pad_id as an {port[:-1]} pad of {self.name} filter."
@@ -489,11 +511,15 @@ class Filter(tuple):
         except:
             pass
 
-        # get the option info
+        # get the option info (options of all filters are loaded at once)
+        try:
+            options = filter_options(self.name)
+        except:
+            raise Filter.InvalidName(self.name)
         i, opt_info = next(
             (
                 (i, o)
-                for i, o in enumerate(self.info.options)
+                for i, o in enumerate(options)
                 if o.name == option_name or option_name in o.aliases
             ),
             (None, None),
@@ -914,7 +940,9 @@ class Chain(UserList):
     def __init__(self, filter_specs=None):
         # convert str to a list of filter_specs
         if isinstance(filter_specs, str):
-            filter_specs, links, sws_flags = filter_utils.parse_graph(filter_specs)
+            filter_specs, links, sws_flags = filter_utils.parse_graph(
+                filter_specs, frozen=True
+            )
             if links:
                 raise ValueError(
                     "filter_specs with link labels cannot be represented by the Chain class. Use Graph."
@@ -957,7 +985,14 @@ class Chain(UserList):
             raise FiltergraphPadNotFoundError("input" if is_input else "output", index)
 
     def __str__(self):
-        return filter_utils.compose_graph([self.data])
+        # reuse the last composed string unless the filters have been modified
+        cache = getattr(self, "_str_cache", None)
+        if cache is None or not _same_items(cache[0], self.data):
+            cache = self._str_cache = (
+                tuple(self.data),
+                filter_utils.compose_graph([self.data]),
+            )
+        return cache[1]
 
     def __repr__(self):
         type_ = type(self)
@@ -1176,18 +1211,23 @@ class Chain(UserList):
         if not len(self.data):
             return Chain(self)
         fg = Graph([self])
-        return reduce(fg.stack, [self] * (__n - 1), fg)
+        fg._imul(__n)
+        return fg
 
     def __rmul__(self, __n):
         return self.__mul__(__n)
 
     def __iadd__(self, other):
-        fg = self + other
-        if type(fg) != Chain:
+        # append the filters in place
+        try:
+            other = as_filterchain(other)
+        except Exception:
+            return NotImplemented
+        if len(self) and len(other) and not _check_joinable(self, other):
             raise Chain.Error(
                 "cannot assign operation outcome which is not a filterchain"
             )
-        self.data = fg.data
+        self.data.extend(other)
         return self
 
     def __irshift__(self, other):
@@ -1393,7 +1433,9 @@ class Graph(UserList):
 
         # convert str to a list of filter_specs
         if isinstance(filter_specs, str):
-            filter_specs, links, sws_flags = filter_utils.parse_graph(filter_specs)
+            filter_specs, links, sws_flags = filter_utils.parse_graph(
+                filter_specs, frozen=True
+            )
         elif isinstance(filter_specs, Graph):
             links = filter_specs._links
             sws_flags = filter_specs.sws_flags and filter_specs.sws_flags[1:]
@@ -1469,11 +1511,25 @@ class Graph(UserList):
             raise FiltergraphPadNotFoundError("input" if is_input else "output", index)
 
     def __str__(self) -> str:
+        # reuse the last composed string unless the graph has been modified
+        key = (
+            tuple(self.data),
+            tuple(tuple(chain.data) for chain in self.data),
+            dict(self._links.data),
+            self.sws_flags,
+            self.autosplit_output,
+        )
+        cache = getattr(self, "_str_cache", None)
+        if cache is not None and _same_graph_key(cache[0], key):
+            return cache[1]
+
         # insert split filters if autosplit_output is True
         fg = self.split_sources() if self.autosplit_output else self
-        return filter_utils.compose_graph(
+        expr = filter_utils.compose_graph(
             fg, fg._links, fg.sws_flags and fg.sws_flags[1:]
         )
+        self._str_cache = (key, expr)
+        return expr
 
     def __repr__(self):
         type_ = type(self)
@@ -1578,19 +1634,15 @@ class Graph(UserList):
 
     def __mul__(self, __n):
         # create a filtergraph with __n filterchains in parallel
-        return (
-            reduce(self.stack, [self] * (__n - 1), self)
-            if isinstance(__n, int)
-            else NotImplemented
-        )
+        if not isinstance(__n, int):
+            return NotImplemented
+        fg = Graph(self)
+        fg._imul(__n)
+        return fg
 
     def __rmul__(self, __n):
         # create a filtergraph with __n filterchains in parallel
-        return (
-            reduce(self.stack, [self] * (__n - 1), self)
-            if isinstance(__n, int)
-            else NotImplemented
-        )
+        return self.__mul__(__n)
 
     def __add__(self, other):
         # join
@@ -1627,10 +1679,15 @@ class Graph(UserList):
 
     def __rshift__(self, other):
         """self >> other | self >> (index, other)  | self >> (index, other_index, other)"""
+        return Graph(self).__irshift__(other)
+
+    def __irshift__(self, other):
+        # in-place self >> other
 
         # try to label first
         try:
-            return _shift_labels(self, "src", other)
+            _shift_labels(self, "src", other, inplace=True)
+            return self
         except FFmpegioError:
             raise
         except:
@@ -1656,7 +1713,8 @@ class Graph(UserList):
                 raise Chain.Error(
                     "attempting to set a filter pad label specified to an empty chain."
                 )
-            return as_filtergraph(other, True)
+            self._assign(as_filtergraph(other, True))
+            return self
 
         index = self._resolve_index(False, index)
 
@@ -1666,7 +1724,8 @@ class Graph(UserList):
         except:
             return NotImplemented
 
-        return self.attach(other, left_on=index, right_on=other_index)
+        self._attach(other, left_on=index, right_on=other_index)
+        return self
 
     def __rrshift__(self, other):
         """other >> self, (other, index) >> self, (other, other_index, index) >> self : attach input label or filter"""
@@ -1712,29 +1771,53 @@ class Graph(UserList):
         # equivalent to add operation or stack and link
         return other.attach(self, other_index, right_on=index)
 
+    # in-place operators modify the chains and links of this graph directly
+    # instead of copying them to a new Graph object
+
     def __iadd__(self, other):
-        fg = self + other
-        self.data = fg.data
-        self._links = fg._links
+        try:
+            other = as_filtergraph_object(other)
+        except Exception:
+            return NotImplemented
+        self._join(other, "auto")
         return self
 
     def __imul__(self, __n):
-        fg = self * __n
-        self.data = fg.data
-        self._links = fg._links
+        if not isinstance(__n, int):
+            return NotImplemented
+        self._imul(__n)
         return self
 
     def __ior__(self, other):
-        fg = self | other
-        self.data = fg.data
-        self._links = fg._links
+        try:
+            other = as_filtergraph_object(other)
+        except:
+            return NotImplemented
+        self._stack(other)
         return self
 
-    def __irshift__(self, other):
-        fg = self >> other
+    @contextmanager
+    def _restore_on_error(self):
+        # undo the changes made by an in-place operation if it fails midway
+        data, links, sws_flags = self.data[:], deepcopy(self._links), self.sws_flags
+        try:
+            yield
+        except:
+            self.data, self._links, self.sws_flags = data, links, sws_flags
+            raise
+
+    def _assign(self, fg):
+        # take over the content of another (disposable) Graph object
         self.data = fg.data
         self._links = fg._links
-        return self
+        self.sws_flags = fg.sws_flags
+        self.autosplit_output = fg.autosplit_output
+
+    def _imul(self, __n):
+        # in-place self * __n
+        other = Graph(self)
+        for _ in range(__n - 1):
+            self._stack(other)
 
     def _screen_input_pads(self, iter_pads, exclude_named, include_connected):
 
@@ -2230,6 +2313,156 @@ class Graph(UserList):
 
         return fg
 
+    def optimize(self, size=None):
+        """optimize the filtergraph to reduce the work of FFmpeg
+
+        :param size: frame size (width, height) of the input video stream(s),
+                     defaults to None (unknown)
+        :type size: tuple(int, int), optional
+        :return: optimized filtergraph and estimated reduction in the number of
+                 pixels processed by its filters per frame (0 if the frame size
+                 is unknown)
+        :rtype: tuple(Graph, int)
+
+        The following semantics-preserving rewrites are applied:
+
+        - remove the branches of `split`/`asplit` filters which end in a
+          `nullsink`/`anullsink` filter
+        - remove `null`/`anull` filters and repeated `format`/`aformat` filters
+        - drop a `scale` filter which keeps the frame size (a no-op, requires
+          `size`) or which repeats the fixed frame size set by the preceding
+          `scale` filter
+        - move a `crop` filter ahead of the preceding `scale` filter if the crop
+          region maps exactly onto the input pixels (requires `size`)
+
+        Only the filters with literal option values are optimized, and the
+        filters with an id (e.g., `scale@main`) are never modified. The frame
+        size is tracked through the filters which does not alter it (e.g.,
+        `hflip`, `format`) as well as `scale`, `crop`, and `transpose`.
+
+        """
+
+        fg = Graph(self)
+        saved = fg._prune_sink_branches(size)
+        for c in range(len(fg)):
+            saved += fg._optimize_chain(c, size if fg._is_input_chain(c) else None)
+        return fg, saved
+
+    def _is_input_chain(self, cid):
+        # True if the first filter of the chain is fed by an input stream
+        label = self._links.find_dst_label((cid, 0, 0))
+        return label is None or self._links.is_input(label)
+
+    def _remove_filter(self, cid, pos):
+        # remove a single-input single-output filter (in place)
+        del self.data[cid][pos]
+        # keep the chain input (pos=0) or move the chain output to the previous filter
+        self._links.adjust_filter_ids(cid, pos or 1, -1)
+
+    def _optimize_chain(self, cid, size):
+        # in-chain rewrites of optimize(), returns the estimated savings
+
+        chain = self.data[cid]
+        before = _chain_pixels(chain, size)
+
+        i = 0
+        while i < len(chain):
+            f = chain[i]
+            prev = chain[i - 1] if i and chain[i - 1].id is None else None
+            if f.id is None:
+                if f.name in ("null", "anull") and len(chain) > 1:
+                    self._remove_filter(cid, i)
+                    i = max(i - 1, 0)
+                    continue
+                if prev is not None:
+                    if f.name in ("format", "aformat") and f == prev:
+                        self._remove_filter(cid, i)
+                        continue
+                    if f.name == "scale" and prev.name == "scale":
+                        k = _redundant_scale(
+                            prev, f, _chain_size(chain[: i - 1], size)
+                        )
+                        if k is not None:
+                            self._remove_filter(cid, i - 1 + k)
+                            i -= 1 - k
+                            continue
+                    if f.name == "crop" and prev.name == "scale":
+                        filters = _push_crop(prev, f, _chain_size(chain[: i - 1], size))
+                        if filters is not None:
+                            chain[i - 1], chain[i] = filters
+                            continue
+            i += 1
+
+        return _pixels_saved(before, _chain_pixels(chain, size))
+
+    def _prune_sink_branches(self, size):
+        # remove split branches ending in a sink, returns the estimated savings
+
+        saved = 0
+        links = self._links
+        for cid, chain in enumerate(self.data):
+            for fid, f in enumerate(chain):
+                if f.name not in ("split", "asplit") or f.id is not None:
+                    continue
+                n = _int_option(f, (("outputs",),), 0, 2)
+                if n is None:
+                    continue
+
+                # identify the dead branches: (pad, chain id or None if chained)
+                dead = []
+                for pid in range(n):
+                    if pid == 0 and fid + 1 < len(chain):
+                        branch = chain[fid + 1 :]
+                        if _is_sink_branch(branch):
+                            dead.append((pid, None, branch))
+                        continue
+                    labels = links.find_src_labels((cid, fid, pid))
+                    if len(labels) != 1:
+                        continue
+                    dsts = links[labels[0]][0]
+                    if (
+                        dsts is not None
+                        and isinstance(dsts[0], int)
+                        and dsts[1:] == (0, 0)
+                        and dsts[0] != cid
+                        and _is_sink_branch(self.data[dsts[0]])
+                    ):
+                        dead.append((pid, dsts[0], self.data[dsts[0]]))
+
+                if len(dead) == n:
+                    dead = dead[1:]  # keep 1 branch
+                if not len(dead):
+                    continue
+
+                fsize = _chain_size(chain[:fid], size) if self._is_input_chain(cid) else None
+                saved += sum(
+                    _pixels_saved(_chain_pixels(branch, fsize), 0) for *_, branch in dead
+                )
+
+                # unlink and renumber the remaining output pads
+                for pid, did, _ in reversed(dead):
+                    if did is None:
+                        del chain[fid + 1 :]
+                    else:
+                        links.del_chain(did)
+                    links.adjust_pad_ids(cid, fid, pid + 1, -1)
+                m = n - len(dead)
+                chain[fid] = (
+                    Filter(f.name, m)
+                    if m > 1
+                    else Filter({"split": "null", "asplit": "anull"}[f.name])
+                )
+
+                # remove the branch chains
+                for did in sorted((did for _, did, _ in dead if did is not None))[::-1]:
+                    del self.data[did]
+                    links.adjust_chains(did + 1, -1)
+
+                # restart as the chain ids may have been shifted
+                return saved + self._prune_sink_branches(size)
+
+        return saved
+
     def stack(
         self,
         other,
@@ -2256,35 +2489,39 @@ class Graph(UserList):
         TO-CHECK/TO-DO: what happens if common link labels are already linked
         """
 
-        other = as_filtergraph_object(other)
+        fg = Graph(self)
+        fg._stack(other, auto_link, replace_sws_flags)
+        return fg
 
-        n = len(self)
-        m = len(other)
+    def _stack(self, other, auto_link=False, replace_sws_flags=None):
+        # in-place stack()
 
-        if not m:  # other is empty
-            return Graph(self)
-        if not n:  # self is empty
-            return Graph(other)
+        other = as_filtergraph_object(other)
 
-        if isinstance(other, Graph):
+        if not len(other):  # other is empty
+            return
+        if not len(self):  # self is empty
+            self._assign(Graph(other))
+            return
 
-            fg = Graph(self)
-            if other.sws_flags is not None:
-                if fg.sws_flags is None or replace_sws_flags is True:
-                    fg.sws_flags = deepcopy(other.sws_flags)
-                elif replace_sws_flags is None:
-                    raise Graph.Error(
-                        f"sws_flags are defined on both FilterGraphs. Specify replace_sws_flags option to True or False to avoid this error."
-                    )
-            fg._links.update(other._links, len(self), auto_link=auto_link)
-            fg.data.extend(other)
+        if isinstance(other, Graph):
+            if other is self:
+                other = Graph(other)
+
+            with self._restore_on_error():
+                if other.sws_flags is not None:
+                    if self.sws_flags is None or replace_sws_flags is True:
+                        self.sws_flags = deepcopy(other.sws_flags)
+                    elif replace_sws_flags is None:
+                        raise Graph.Error(
+                            f"sws_flags are defined on both FilterGraphs. Specify replace_sws_flags option to True or False to avoid this error."
+                        )
+                self._links.update(other._links, len(self), auto_link=auto_link)
+                self.data.extend([Chain(chain) for chain in other])
 
         else:
             # if other is not filtergraph, copy and append the new chain
-            fg = Graph(self)
-            fg.append(other)
-
-        return fg
+            self.append(other)
 
     def connect(
         self,
@@ -2315,6 +2552,15 @@ class Graph(UserList):
 
         """
 
+        fg = Graph(self)
+        fg._connect(right, from_left, to_right, chain_siso, replace_sws_flags)
+        return fg
+
+    def _connect(
+        self, right, from_left, to_right, chain_siso=True, replace_sws_flags=None
+    ):
+        # in-place connect()
+
         # make sure right is a Graph object
         right = as_filtergraph(right, copy=True)
 
@@ -2365,27 +2611,24 @@ class Graph(UserList):
                 # reuse the src or dst label if given
                 link_pairs.append((new_dst, src, src_label or dst_label))
 
-        # stack 2 filtergraphs
-        fg = self.stack(right, False, replace_sws_flags)
+        fg = self
+        with self._restore_on_error():
+            # stack 2 filtergraphs
+            self._stack(right, False, replace_sws_flags)
 
-        if nout > 0:
             # link marked chains
             for link_args in link_pairs:
                 fg._links.link(*link_args)
 
-            # combine chainable chains
-            for (dst, src, src_label) in reversed(
-                sorted(chain_pairs, key=lambda v: v[1])
-            ):
-                fc_src = fg[src[0]]
-                n_src = len(fc_src)
-                fc_src.extend(fg.pop(dst[0]))
-                if src_label is not None:
-                    fg._links.remove_label(src_label)
-                fg._links.merge_chains(dst[0], src[0], n_src)
-            fg._links.remove_chains(rm_chains)
-
-        return fg
+        # combine chainable chains
+        for (dst, src, src_label) in reversed(sorted(chain_pairs, key=lambda v: v[1])):
+            fc_src = fg[src[0]]
+            n_src = len(fc_src)
+            fc_src.extend(fg.pop(dst[0]))
+            if src_label is not None:
+                fg._links.remove_label(src_label)
+            fg._links.merge_chains(dst[0], src[0], n_src)
+        fg._links.remove_chains(rm_chains)
 
     def _iter_io_pads(self, is_input, how, ignore_labels=False):
         """Iterates input/output pads of the filtergraph
@@ -2469,19 +2712,35 @@ class Graph(UserList):
         :rtype: Graph or None
         """
 
+        fg = Graph(self)
+        fg._join(right, how, match_scalar, ignore_labels, chain_siso, replace_sws_flags)
+        return fg
+
+    def _join(
+        self,
+        right,
+        how="per_chain",
+        match_scalar=False,
+        ignore_labels=False,
+        chain_siso=True,
+        replace_sws_flags=None,
+    ):
+        # in-place join()
+
         # make sure right is a Graph, Chain, or Filter object
         right = as_filtergraph(right)
 
         if not len(right):
-            return Graph(self)
+            return
 
         if not len(self):
-            return Graph(right)
+            self._assign(Graph(right))
+            return
 
-        # auto-mode, 1-deep recursion
+        # auto-mode, 1-deep recursion (a failed attempt leaves self unmodified)
         if how == "auto":
             try:
-                return self.join(
+                return self._join(
                     right,
                     "per_chain",
                     match_scalar,
@@ -2490,7 +2749,7 @@ class Graph(UserList):
                     replace_sws_flags,
                 )
             except:
-                return self.join(
+                return self._join(
                     right,
                     "all",
                     match_scalar,
@@ -2510,6 +2769,7 @@ class Graph(UserList):
         nsrc = len(src_info)
         ndst = len(dst_info)
 
+        left = self
         if nsrc != ndst:
 
             if match_scalar and ndst == 1:
@@ -2518,18 +2778,20 @@ class Graph(UserList):
                 dst_info = right._iter_io_pads(True, how)
             elif match_scalar and nsrc == 1:
                 # multiply self to match right
-                self = self * ndst
-                src_info = self._iter_io_pads(False, how)
+                left = self * ndst
+                src_info = left._iter_io_pads(False, how)
             else:
                 raise FiltergraphMismatchError(nsrc, ndst)
 
-        return self.connect(
+        left._connect(
             right,
             [index for index, *_ in src_info],
             [index for index, *_ in dst_info],
             chain_siso,
             replace_sws_flags,
         )
+        if left is not self:
+            self._assign(left)
 
     def attach(self, right, left_on=None, right_on=None):
         """attach an output pad to right's input pad
@@ -2545,10 +2807,16 @@ class Graph(UserList):
 
         """
 
+        fg = Graph(self)
+        fg._attach(right, left_on, right_on)
+        return fg
+
+    def _attach(self, right, left_on=None, right_on=None):
+        # in-place attach()
         right = as_filtergraph_object(right)
         right_on = right._resolve_index(True, right_on)
         left_on = self._resolve_index(False, left_on)
-        return self.connect(right, [left_on], [right_on], chain_siso=True)
+        self._connect(right, [left_on], [right_on], chain_siso=True)
 
     def rattach(self, left, right_on=None, left_on=None):
         """prepend an input filterchain to an existing filter chain of the filtergraph
@@ -2579,6 +2847,12 @@ class Graph(UserList):
         """
 
         fg = Graph(self)
+        fg._add_labels(pad_type, labels)
+        return fg
+
+    def _add_labels(self, pad_type, labels):
+        # in-place add_labels()
+        fg = self
         is_input = pad_type == "dst"
         if isinstance(labels, str):
             pad = fg._resolve_index(is_input, None)
@@ -2598,7 +2872,6 @@ class Graph(UserList):
             )
             for label, pad in zip(labels, pads):
                 fg.add_label(label, **{pad_type: pad[0]})
-        return fg
 
     @contextmanager
     def as_script_file(self):
@@ -2669,6 +2942,187 @@ class Graph(UserList):
                 os.remove(temp_file.name)
 
 
+#################################################################################
+# filtergraph optimizer helpers
+
+# filters which do not change the video frame size
+_SIZE_PRESERVING_FILTERS = {
+    *("null", "anull", "copy", "acopy", "format", "aformat", "setpts", "asetpts"),
+    *("fps", "setsar", "setdar", "settb", "asettb", "hflip", "vflip", "trim"),
+    *("atrim", "split", "asplit"),
+}
+
+# single-input single-output filters which may be pruned with a sink
+_PRUNABLE_FILTERS = {*_SIZE_PRESERVING_FILTERS, "scale", "crop", "transpose"}
+
+# filters which pass the frames by reference (i.e., no pixel processing)
+_ZERO_COPY_FILTERS = {
+    *("null", "anull", "crop", "format", "aformat", "setpts", "asetpts", "fps"),
+    *("setsar", "setdar", "settb", "asettb", "trim", "atrim", "split", "asplit"),
+    *("nullsink", "anullsink"),
+}
+
+# option names (and aliases) in their order
+_SCALE_OPTIONS = (("w", "width"), ("h", "height"), ("flags",))
+_CROP_OPTIONS = (("out_w", "w"), ("out_h", "h"), ("x",), ("y",))
+
+
+def _option_values(filter, names):
+    # option values in the order of names or None if other option is set
+    ordered = filter.ordered_options
+    if len(ordered) > len(names):
+        return None
+    values = [*ordered, *([None] * (len(names) - len(ordered)))]
+    for key, value in filter.named_options.items():
+        i = next((i for i, aliases in enumerate(names) if key in aliases), None)
+        if i is None or values[i] is not None:
+            return None
+        values[i] = value
+    return values
+
+
+def _as_int(value):
+    # int value of a literal integer option value or None
+    if isinstance(value, int):
+        return value
+    return int(value) if isinstance(value, str) and re.match(r"-?\d+$", value) else None
+
+
+def _int_option(filter, names, i, default=None):
+    # int value of the i-th option or None if not a literal integer
+    values = _option_values(filter, names)
+    if values is None:
+        return None
+    return default if values[i] is None else _as_int(values[i])
+
+
+def _output_size(filter, size):
+    # frame size after the filter or None if unknown
+    if size is None:
+        return None
+
+    name = filter.name
+    if name in _SIZE_PRESERVING_FILTERS:
+        return size
+
+    iw, ih = size
+    if name == "scale":
+        values = _option_values(filter, _SCALE_OPTIONS)
+        if values is None:
+            return None
+        w = iw if values[0] is None else _as_int(values[0])
+        h = ih if values[1] is None else _as_int(values[1])
+        if w is None or h is None:
+            return None
+        w = w or iw
+        h = h or ih
+        if w < 0 and h < 0:
+            return size
+        if w < 0:  # keep the aspect ratio, divisible by -w
+            w = max(round(h * iw / ih / -w), 1) * -w
+        elif h < 0:
+            h = max(round(w * ih / iw / -h), 1) * -h
+        return (w, h)
+
+    if name == "crop":
+        values = _option_values(filter, _CROP_OPTIONS)
+        if values is None:
+            return None
+        w = iw if values[0] is None else _as_int(values[0])
+        h = ih if values[1] is None else _as_int(values[1])
+        return None if w is None or h is None else (w, h)
+
+    if name == "transpose" and "passthrough" not in filter.named_options:
+        return (ih, iw)
+
+    return None
+
+
+def _chain_size(filters, size):
+    # frame size after a sequence of filters or None if unknown
+    for f in filters:
+        size = _output_size(f, size)
+    return size
+
+
+def _chain_pixels(filters, size):
+    # number of pixels read and written by the filters per frame or None if unknown
+    n = 0
+    for f in filters:
+        if f.name in ("nullsink", "anullsink"):
+            break
+        out_size = _output_size(f, size)
+        if out_size is None:
+            return None
+        if f.name not in _ZERO_COPY_FILTERS:
+            n += size[0] * size[1] + out_size[0] * out_size[1]
+        size = out_size
+    return n
+
+
+def _pixels_saved(before, after):
+    # difference of _chain_pixels() outputs, 0 if unknown
+    return 0 if before is None or after is None else before - after
+
+
+def _is_sink_branch(filters):
+    # True if single-input filters end in a sink
+    return (
+        len(filters) > 0
+        and filters[-1].name in ("nullsink", "anullsink")
+        and all(f.id is None for f in filters)
+        and all(f.name in _PRUNABLE_FILTERS for f in filters[:-1])
+    )
+
+
+def _redundant_scale(first, second, size):
+    # index of the redundant one of 2 consecutive scale filters or None:
+    # 0 if the first keeps the frame size of its input (size) or 1 if the
+    # second scales to the same fixed frame size as the first. A scale filter
+    # which outputs its input frame size passes the frames through.
+    v1 = _option_values(first, _SCALE_OPTIONS)
+    v2 = _option_values(second, _SCALE_OPTIONS)
+    if v1 is None or v2 is None:
+        return None
+    if size is not None and _output_size(first, size) == tuple(size):
+        return 0
+    w1, h1, w2, h2 = (_as_int(v) for v in (*v1[:2], *v2[:2]))
+    if None in (w1, h1) or w1 <= 0 or h1 <= 0:
+        return None
+    return 1 if (w1, h1) == (w2, h2) else None
+
+
+def _push_crop(scale, crop, size):
+    # crop & scale filters to swap scale=W:H,crop=w:h:x:y or None if not exact
+    if size is None:
+        return None
+    vs = _option_values(scale, _SCALE_OPTIONS)
+    vc = _option_values(crop, _CROP_OPTIONS)
+    if vs is None or vc is None:
+        return None
+
+    W, H = _as_int(vs[0]), _as_int(vs[1])
+    if W is None or H is None or W <= 0 or H <= 0:
+        return None
+    w = W if vc[0] is None else _as_int(vc[0])
+    h = H if vc[1] is None else _as_int(vc[1])
+    if w is None or h is None or not (0 < w <= W and 0 < h <= H):
+        return None
+    x = ((W - w) / 2) if vc[2] is None else _as_int(vc[2])
+    y = ((H - h) / 2) if vc[3] is None else _as_int(vc[3])
+    if x is None or y is None or x < 0 or y < 0 or x + w > W or y + h > H:
+        return None
+
+    # crop region in the input frame must land on even (chroma-aligned) pixels
+    iw, ih = size
+    region = (w * iw / W, h * ih / H, x * iw / W, y * ih / H)
+    if any(v % 1 for v in region) or x % 2 or y % 2 or region[2] % 2 or region[3] % 2:
+        return None
+
+    kwargs = {} if vs[2] is None else {"flags": vs[2]}
+    return [Filter("crop", *(int(v) for v in region)), Filter("scale", w, h, **kwargs)]
+
+
 # dict: stores filter construction functions
 _filters = {}
 
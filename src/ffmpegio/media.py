@@ -1,12 +1,11 @@
-from io import BytesIO
-
 from . import ffmpegprocess, utils, configure, FFmpegError
+from .threading import LoggerThread
 from .utils import avi
 
 __all__ = ["read"]
 
 
-def read(*urls, progress=None, show_log=None, **options):
+def read(*urls, progress=None, show_log=None, pipes=False, **options):
     """Read video and audio frames
 
     :param *urls: URLs of the media files to read.
@@ -17,6 +16,10 @@ def read(*urls, progress=None, show_log=None, **options):
                      defaults to None (no show/capture)
                      Ignored if stream format must be retrieved automatically.
     :type show_log: bool, optional
+    :param pipes: True to transfer each stream through its own pipe instead of
+                  muxing them into AVI (POSIX only, see
+                  :py:class:`streams.PipedMediaReader`), defaults to False
+    :type pipes: bool, optional
     :param use_ya: True if piped video streams uses `ya8` pix_fmt instead of `gray16le`, default to None
     :type use_ya: bool, optional
     :param \\**options: FFmpeg options, append '_in[input_url_id]' for input option names for specific
@@ -45,6 +48,18 @@ def read(*urls, progress=None, show_log=None, **options):
     if not ninputs:
         raise ValueError("At least one URL must be given.")
 
+    if pipes:
+        from .streams.PipedStreams import PipedMediaReader
+
+        with PipedMediaReader(
+            *urls, progress=progress, show_log=show_log, **options
+        ) as reader:
+            data = reader.readall()
+            if reader.lasterror:
+                raise FFmpegError(reader.readlog().splitlines(), show_log)
+            rates = reader.rates()
+        return rates, data
+
     # separate the options
     spec_inopts = utils.pop_extra_options_multi(options, r"_in(\d+)$")
     inopts = utils.pop_extra_options(options, "_in")
@@ -63,31 +78,38 @@ def read(*urls, progress=None, show_log=None, **options):
     # configure output options
     use_ya = configure.finalize_media_read_opts(args)
 
-    # run FFmpeg
-    out = ffmpegprocess.run(
-        args,
-        progress=progress,
-        capture_log=None if show_log else True,
-    )
-    if out.returncode:
-        raise FFmpegError(out.stderr, show_log)
-
-    # fire up the AVI reader and process the stdout bytes
-    # TODO: Convert to use pipe/thread
-    reader = avi.AviReader()
-    reader.start(BytesIO(out.stdout), use_ya)
+    # run FFmpeg and parse the AVI stream from the pipe as it is produced
+    capture_log = None if show_log else True
+    with ffmpegprocess.Popen(
+        args, progress=progress, capture_log=capture_log
+    ) as proc:
+        logger = LoggerThread(proc.stderr) if capture_log else None
+        if logger:
+            logger.start()
+        try:
+            reader = avi.AviReader()
+            try:
+                reader.start(proc.stdout, use_ya)
+            except:
+                reader = None  # FFmpeg failed before outputting the header
+            else:
+                data = reader.readall()
+            proc.stdout.close()
+            proc.wait()
+        finally:
+            if logger:
+                proc.stderr.close()
+                logger.join()
+
+    if proc.returncode or reader is None:
+        raise FFmpegError(logger and logger.logs, show_log)
+
     # get frame rates and sample rates of all media streams
     rates = {
         v["spec"]: v["frame_rate"] if v["type"] == "v" else v["sample_rate"]
         for v in reader.streams.values()
     }
-    data = {k: [] for k in reader.streams}
-    for st, frame in reader:
-        data[st].append(frame)
 
-    data = {
-        reader.streams[k]["spec"]: reader.from_bytes(k, b"".join(v))
-        for k, v in data.items()
-    }
+    data = {reader.streams[k]["spec"]: reader.from_bytes(k, v) for k, v in data.items()}
 
     return rates, data
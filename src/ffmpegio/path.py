@@ -1,19 +1,18 @@
-from os import path as _path, name as _os_name, devnull
+from os import path as _path, name as _os_name, devnull, environ as _environ, makedirs
+from sys import platform as _platform
 from shutil import which
 from subprocess import run, DEVNULL, PIPE, STDOUT
-import re, shlex
-from packaging.version import Version
+import re, shlex, threading
 import logging
 
 logger = logging.getLogger("ffmpegio")
 
 from .errors import FFmpegioError
-from . import plugins
 
 # fmt:off
 __all__ = [
     "found", "where", "find", "ffmpeg", "ffprobe", "versions", "DEVNULL", 
-    "PIPE", "STDOUT", "devnull", "FFmpegNotFound"
+    "PIPE", "STDOUT", "devnull", "FFmpegNotFound", "cache_dir"
 ]
 # fmt:on
 
@@ -26,10 +25,59 @@ class FFmpegNotFound(FFmpegioError):
         )
 
 
-# add FFmpeg directory to the system path as given in system environment variable FFMPEG_DIR
-FFMPEG_BIN = None
-FFPROBE_BIN = None
-FFMPEG_VER = None
+# FFMPEG_BIN, FFPROBE_BIN, and FFMPEG_VER are not defined until FFmpeg is
+# located by find(). Their first access (see __getattr__) auto-detects FFmpeg,
+# and FFMPEG_VER is parsed separately as it requires running ffmpeg.
+_find_lock = threading.RLock()
+
+
+def __getattr__(name):
+    if name in ("FFMPEG_BIN", "FFPROBE_BIN"):
+        _auto_find()
+    elif name == "FFMPEG_VER":
+        _auto_find()
+        _find_version()
+    else:
+        raise AttributeError(f"module '{__name__}' has no attribute '{name}'")
+    return globals()[name]
+
+
+def _get(name):
+    # get FFMPEG_BIN, FFPROBE_BIN, or FFMPEG_VER (auto-detected if needed)
+    g = globals()
+    return g[name] if name in g else __getattr__(name)
+
+
+def _auto_find():
+    # auto-detect the executables if not set yet
+    with _find_lock:
+        if "FFMPEG_BIN" in globals():
+            return
+        try:
+            _find_executables()
+        except Exception as e:
+            logger.warning(str(e))
+            globals().update(FFMPEG_BIN=None, FFPROBE_BIN=None, FFMPEG_VER=None)
+
+
+def _find_version():
+    # parse the version of FFMPEG_BIN if not done yet
+    global FFMPEG_VER
+    from packaging.version import Version
+
+    with _find_lock:
+        if "FFMPEG_VER" in globals():
+            return
+        if FFMPEG_BIN:
+            ver = versions()["version"]
+            m = re.match(r"\d+(?:\.\d+(?:\d+)?)?", ver)
+            FFMPEG_VER = Version(m[0]) if m else "nightly"
+        else:
+            FFMPEG_VER = Version("0.dev")
+
+
+# root directory of the on-disk caches (None to use FFMPEGIO_CACHE_DIR env var or the OS default)
+CACHE_DIR = None
 
 # shlex.join added in Python38
 shlex_join = (
@@ -47,7 +95,7 @@ def found():
 
     """
 
-    return bool(FFMPEG_BIN and FFPROBE_BIN)
+    return bool(_get("FFMPEG_BIN") and _get("FFPROBE_BIN"))
 
 
 def where(probe=False):
@@ -59,7 +107,7 @@ def where(probe=False):
     :rtype: str or None
     """
 
-    path = FFPROBE_BIN if probe else FFMPEG_BIN
+    path = _get("FFPROBE_BIN" if probe else "FFMPEG_BIN")
 
     if not path:
         raise FFmpegNotFound()
@@ -95,9 +143,20 @@ def find(ffmpeg_path=None, ffprobe_path=None):
     (3) In Windows, additional locations are searched (e.g., C:\\Program Files\\ffmpeg).
         See the documentation for the full list.
 
+    If this function is not called, the executables are auto-detected when
+    they are first needed.
+
     """
 
-    global FFMPEG_BIN, FFPROBE_BIN, FFMPEG_VER
+    with _find_lock:
+        _find_executables(ffmpeg_path, ffprobe_path)
+        _find_version()
+        return FFMPEG_BIN, FFPROBE_BIN, FFMPEG_VER
+
+
+def _find_executables(ffmpeg_path=None, ffprobe_path=None):
+    # locate the executables (see find()) and reset FFMPEG_VER
+    global FFMPEG_BIN, FFPROBE_BIN
 
     has_ffmpeg = ffmpeg_path is not None
     has_ffprobe = ffprobe_path is not None
@@ -133,19 +192,55 @@ def find(ffmpeg_path=None, ffprobe_path=None):
         FFMPEG_BIN = "ffmpeg"
         FFPROBE_BIN = "ffprobe"
     else:
+        from . import plugins
+
         res = plugins.get_hook().finder()
         if res is None:
             raise RuntimeError("Failed to auto-detect ffmpeg and ffprobe executable.")
         FFMPEG_BIN, FFPROBE_BIN = res
 
-    if FFMPEG_BIN:
-        ver = versions()["version"]
-        m = re.match(r"\d+(?:\.\d+(?:\d+)?)?", ver)
-        FFMPEG_VER = Version(m[0]) if m else "nightly"
-    else:
-        FFMPEG_VER = Version("0.dev")
+    globals().pop("FFMPEG_VER", None)
+
+
+def cache_dir(*subdirs, create=True):
+    """Get the directory to store ffmpegio's on-disk caches
+
+    :param \\*subdirs: names of the subdirectories under the cache root
+    :type \\*subdirs: str, optional
+    :param create: False to not create the directory if missing, defaults to True
+    :type create: bool, optional
+    :return: path to the (created if needed) cache directory
+    :rtype: str
+
+    The cache root directory is selected in the following order:
 
-    return FFMPEG_BIN, FFPROBE_BIN, FFMPEG_VER
+    (1) `ffmpegio.path.CACHE_DIR` if set
+    (2) `FFMPEGIO_CACHE_DIR` environmental variable if set
+    (3) OS-specific user cache directory: `%LOCALAPPDATA%\\ffmpegio\\Cache`
+        (Windows), `~/Library/Caches/ffmpegio` (macOS), or
+        `$XDG_CACHE_HOME/ffmpegio` (others, defaults to `~/.cache/ffmpegio`)
+
+    """
+
+    root = CACHE_DIR or _environ.get("FFMPEGIO_CACHE_DIR", None)
+    if not root:
+        if _os_name == "nt":
+            root = _path.join(
+                _environ.get("LOCALAPPDATA", _path.expanduser("~")), "ffmpegio", "Cache"
+            )
+        elif _platform == "darwin":
+            root = _path.expanduser(_path.join("~", "Library", "Caches", "ffmpegio"))
+        else:
+            root = _path.join(
+                _environ.get("XDG_CACHE_HOME", None)
+                or _path.expanduser(_path.join("~", ".cache")),
+                "ffmpegio",
+            )
+
+    dir = _path.join(root, *subdirs)
+    if create:
+        makedirs(dir, exist_ok=True)
+    return dir
 
 
 def ffmpeg(args, sp_run=None, *sp_args, **other_sp_args):
@@ -168,8 +263,9 @@ def ffmpeg(args, sp_run=None, *sp_args, **other_sp_args):
 
     logger.debug(shlex_join(args))
     try:
-        assert FFMPEG_BIN is not None
-        return (sp_run or run)((FFMPEG_BIN, *args), *sp_args, **other_sp_args)
+        bin = _get("FFMPEG_BIN")
+        assert bin is not None
+        return (sp_run or run)((bin, *args), *sp_args, **other_sp_args)
     except (FileNotFoundError, AssertionError):
         raise FFmpegNotFound()
 
@@ -191,8 +287,9 @@ def ffprobe(args, sp_run=None, *sp_args, **other_sp_args):
         args = shlex.split(args)
     logger.debug(shlex_join(args))
     try:
-        assert FFMPEG_BIN is not None
-        return (sp_run or run)((FFPROBE_BIN, *args), *sp_args, **other_sp_args)
+        bin = _get("FFPROBE_BIN")
+        assert bin is not None
+        return (sp_run or run)((bin, *args), *sp_args, **other_sp_args)
     except (FileNotFoundError, AssertionError):
         raise FFmpegNotFound()
 
@@ -240,11 +337,14 @@ def check_version(ver, cond=None):
     :return: True if condition is met
     :rtype: bool
     """
+    from packaging.version import Version
+
+    ffmpeg_ver = _get("FFMPEG_VER")
     return {
-        "==": FFMPEG_VER.__eq__,
-        "!=": FFMPEG_VER.__ne__,
-        "<": FFMPEG_VER.__lt__,
-        "<=": FFMPEG_VER.__le__,
-        ">": FFMPEG_VER.__gt__,
-        ">=": FFMPEG_VER.__ge__,
+        "==": ffmpeg_ver.__eq__,
+        "!=": ffmpeg_ver.__ne__,
+        "<": ffmpeg_ver.__lt__,
+        "<=": ffmpeg_ver.__le__,
+        ">": ffmpeg_ver.__gt__,
+        ">=": ffmpeg_ver.__ge__,
     }[cond or ">="](Version(ver))
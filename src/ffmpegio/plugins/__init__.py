@@ -1,4 +1,4 @@
-import pluggy, os
+import pluggy, os, threading
 
 from . import hookspecs
 
@@ -7,8 +7,26 @@ __all__ = ["initialize", "get_hook"]
 pm = pluggy.PluginManager("ffmpegio")
 pm.add_hookspecs(hookspecs)
 
+_initialized = False
+_lock = threading.Lock()
+
 
 def initialize():
+    """register the builtin plugins and the plugins found in site-packages
+
+    This function is called automatically by :py:func:`get_hook`, and
+    subsequent calls have no effect.
+    """
+    global _initialized
+
+    with _lock:
+        if _initialized:
+            return
+        _register_plugins()
+        _initialized = True
+
+
+def _register_plugins():
     from . import rawdata_bytes
 
     # load bundled base plugins
@@ -25,4 +43,6 @@ def initialize():
 
 
 def get_hook():
+    if not _initialized:
+        initialize()
     return pm.hook
@@ -1,18 +1,161 @@
-import json, fractions, os, pickle, re
+import json, fractions, os, re, hashlib
+from array import array
+from bisect import bisect_left, bisect_right
 from collections import OrderedDict
-from .path import ffprobe, PIPE
+from collections.abc import Mapping
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from itertools import islice
+from threading import Lock
+from shutil import which
+from . import path as _ffpath
+from .path import ffprobe, PIPE, cache_dir
 from .utils import parse_stream_spec
+from .utils.probecache import ProbeMemoryCache, thaw
+import logging
+
+logger = logging.getLogger("ffmpegio")
 
 # fmt:off
 __all__ = ['full_details', 'format_basic', 'streams_basic',
-'video_streams_basic', 'audio_streams_basic', 'query']
+'video_streams_basic', 'audio_streams_basic', 'query', 'batch', 'index',
+'seek_point', 'enable_disk_cache', 'disable_disk_cache', 'cache_stats']
 # fmt:on
 
-# stores all the local queries during the session
+# stores all the local queries during the session as frozen (read-only) objects
 # - key: path
-# - value: (mtime, blob)
-_db = OrderedDict()
-_db_maxsize = 16
+# - signature: (size, mtime_ns)
+_db = ProbeMemoryCache()
+
+# persistent probe cache shared across processes (see enable_disk_cache())
+_disk_cache = None
+_disk_cache_env_checked = False
+_disk_cache_lock = Lock()
+
+# signature of the ffprobe executable: (FFPROBE_BIN, signature str)
+_ffprobe_sig = (None, None)
+
+# stores the packet indices loaded during the session
+# - key: (realpath, stream specifier)
+# - value: ((size, mtime_ns), index dict)
+_index_db = OrderedDict()
+_index_db_maxsize = 16
+
+
+def enable_disk_cache(path=None, max_entries=65536):
+    """Enable the persistent probe cache shared across processes
+
+    :param path: path of the SQLite database file, defaults to None
+                 (``probe.sqlite`` in :py:func:`ffmpegio.path.cache_dir()`)
+    :type path: str, optional
+    :param max_entries: maximum number of files to keep the info of, defaults
+                        to 65536. Least recently used entries are evicted first.
+    :type max_entries: int, optional
+    :return: cache object
+    :rtype: ffmpegio.utils.probecache.ProbeDiskCache
+
+    Once enabled, :py:func:`full_details` (and the functions relying on it)
+    and :py:func:`query` first look for the results in the database before
+    running ffprobe. Each entry is keyed by the real path, size, and
+    modification time of the file as well as the ffprobe executable and
+    FFmpeg version.
+
+    The cache is also enabled automatically on the first probe if the
+    ``FFMPEGIO_PROBE_CACHE`` environmental variable is set: to ``1`` to use
+    the default location or else to the path of the database file.
+    """
+
+    from .utils.probecache import ProbeDiskCache
+
+    global _disk_cache, _disk_cache_env_checked
+
+    if path is None:
+        path = os.path.join(cache_dir(), "probe.sqlite")
+
+    disable_disk_cache()
+    _disk_cache = ProbeDiskCache(path, max_entries)
+    _disk_cache_env_checked = True
+    return _disk_cache
+
+
+def disable_disk_cache():
+    """Disable the persistent probe cache"""
+
+    global _disk_cache, _disk_cache_env_checked
+
+    if _disk_cache is not None:
+        _disk_cache.close()
+    _disk_cache = None
+    _disk_cache_env_checked = True
+
+
+def cache_stats():
+    """Get the probe cache statistics
+
+    :return: statistics of the in-memory cache ("memory") and the persistent
+             cache ("disk", None if not enabled). Each has "hits" and "misses"
+             counts of this process as well as the number of "entries". The
+             in-memory cache also reports its approximate size in "nbytes".
+    :rtype: dict
+    """
+    return {"memory": _db.stats(), "disk": _disk_cache and _disk_cache.stats()}
+
+
+def _get_disk_cache():
+    # returns the persistent cache (enable it per env var on the first call)
+    if not _disk_cache_env_checked:
+        with _disk_cache_lock:
+            if not _disk_cache_env_checked:
+                env = os.environ.get("FFMPEGIO_PROBE_CACHE", None)
+                try:
+                    if env and env != "0":
+                        enable_disk_cache(None if env == "1" else env)
+                    else:
+                        disable_disk_cache()
+                except Exception as e:
+                    disable_disk_cache()
+                    logger.warning(f"failed to enable the persistent probe cache: {e}")
+    return _disk_cache
+
+
+def _ffprobe_signature():
+    # identifies the ffprobe executable & its version
+    global _ffprobe_sig
+    bin = _ffpath.FFPROBE_BIN
+    if _ffprobe_sig[0] != bin:
+        realpath = os.path.realpath(which(bin) or bin)
+        mtime_ns = os.stat(realpath).st_mtime_ns
+        _ffprobe_sig = (bin, f"{realpath}:{mtime_ns}:{_ffpath.FFMPEG_VER}")
+    return _ffprobe_sig[1]
+
+
+def _disk_key(url, st):
+    return (os.path.realpath(url), st.st_size, st.st_mtime_ns, _ffprobe_signature())
+
+
+def _cache_get(url, st):
+    # returns the cached full details (frozen) of a media file or None if not found
+
+    results = _db.get(url, (st.st_size, st.st_mtime_ns))
+    if results is not None:
+        return results
+
+    disk_cache = _get_disk_cache()
+    if disk_cache is not None:
+        results = disk_cache.get(_disk_key(url, st))
+        if results is not None:
+            return _db.put(url, (st.st_size, st.st_mtime_ns), results)
+
+    return None
+
+
+def _cache_put(url, st, results):
+    # store the full details of a media file, returns the frozen results
+
+    disk_cache = _get_disk_cache()
+    if disk_cache is not None:
+        disk_cache.put(_disk_key(url, st), results)
+
+    return _db.put(url, (st.st_size, st.st_mtime_ns), results)
 
 
 def _items_to_numeric(d):
@@ -272,54 +415,29 @@ def full_details(
 
         assert isinstance(url, str)
 
-        sspec = None
-        if select_streams is not None:
-            try:
-                sspec = (None, int(select_streams))
-            except:
-                m = re.match("([avstd])(?::([0-9]+))?$", select_streams)
-                sspec = (
-                    {
-                        "a": "audio",
-                        "v": "video",
-                        "s": "subtitle",
-                        "t": "attachment",
-                        "d": "data",
-                    }[m[1]],
-                    m[2] and int(m[2]),
-                )
-                # raises exception if match not found
-
-        mtime = os.stat(url).st_mtime
-        db_entry = _db.get(url, None)
-        if db_entry and db_entry[0] == mtime:
-            _db.move_to_end(url, True)  # refresh the entry position
-            results = pickle.loads(db_entry[1])
-        else:
-            results = _full_details(url, True, True, True, True)
-            _db[url] = (mtime, pickle.dumps(results))
-            if len(_db) > _db_maxsize:
-                _db.popitem(False)  # remove the oldest entry
-
-        # drop unrequested items
-        for show, key in zip(
-            (show_format, show_streams, show_programs, show_chapters),
-            ("format", "streams", "programs", "chapters"),
-        ):
-            if not show:
-                del results[key]
+        sspec = None if select_streams is None else _parse_sspec(select_streams)
+
+        st = os.stat(url)
+        info = _cache_get(url, st)
+        if info is None:
+            info = _cache_put(url, st, _full_details(url, True, True, True, True))
+
+        # pick requested items from the frozen info
+        results = {
+            key: info[key]
+            for show, key in zip(
+                (show_format, show_streams, show_programs, show_chapters),
+                ("format", "streams", "programs", "chapters"),
+            )
+            if show and key in info
+        }
 
         # pick streams if specified
         if sspec is not None:
-            t, i = sspec
-            streams = results["streams"]
-            if t is not None:
-                streams = [st for st in streams if st["codec_type"] == t]
-            if i is not None:
-                streams = streams[i : i + 1]
-            results["streams"] = streams
+            results["streams"] = _pick_streams(results["streams"], sspec)
 
-        return results
+        # return a mutable copy
+        return thaw(results)
 
     if not show_streams:
         select_streams = None
@@ -333,6 +451,35 @@ def full_details(
         )
 
 
+def _parse_sspec(select_streams):
+    # parse a simple stream specifier: index or media type with optional index
+    # raises exception if not supported
+    try:
+        return (None, int(select_streams))
+    except:
+        m = re.match("([avstd])(?::([0-9]+))?$", select_streams)
+        return (
+            {
+                "a": "audio",
+                "v": "video",
+                "s": "subtitle",
+                "t": "attachment",
+                "d": "data",
+            }[m[1]],
+            m[2] and int(m[2]),
+        )
+
+
+def _pick_streams(streams, sspec):
+    # select the streams matching the parsed stream specifier
+    t, i = sspec
+    if t is not None:
+        streams = tuple(st for st in streams if st["codec_type"] == t)
+    if i is not None:
+        streams = streams[i : i + 1]
+    return streams
+
+
 def _resolve_entries(info_type, entries, default_entries, default_dep_entries={}):
 
     query = set(default_entries)
@@ -626,13 +773,14 @@ def query(url, streams=None, fields=None, return_none=False):
     get_stream = streams is not None
 
     # check if full details are already available
-    info = _db.get(url, None)
-
-    if info is not None:
-        # decode the info
-        mtime = os.stat(url).st_mtime
-        if info[0] == mtime:
-            info = pickle.loads(info[1])
+    try:
+        info = _cache_get(url, os.stat(url))
+        if info is not None and get_stream:
+            # frozen info: pick the streams without copying everything
+            info = {"streams": _pick_streams(info["streams"], _parse_sspec(streams))}
+    except Exception:
+        # not a file or the stream specifier is not supported
+        info = None
 
     do_query = info is None
 
@@ -659,12 +807,14 @@ def query(url, streams=None, fields=None, return_none=False):
         # return dict only if a specific stream requested
         info = info[0]
 
-    if not do_query and fields is not None:
-        # has full details from db, only return requested fields
-        if isinstance(info, dict):
-            info = {f: info[f] for f in fields if f in info}
+    if not do_query:
+        # has full details (frozen) from db, only return (copies of) requested fields
+        if fields is None:
+            info = thaw(info)
+        elif isinstance(info, Mapping):
+            info = {f: thaw(info[f]) for f in fields if f in info}
         else:
-            info = [{f: st[f] for f in fields if f in st} for st in info]
+            info = [{f: thaw(st[f]) for f in fields if f in st} for st in info]
 
     if return_none:
         info = (
@@ -676,6 +826,96 @@ def query(url, streams=None, fields=None, return_none=False):
     return info
 
 
+def _batch_probe(url, entries):
+    # full query (cached if url is a path) then keep only the requested entries
+    info = full_details(url, True, True, True, True)
+    if entries is None:
+        return info
+
+    results = {}
+    for key, fields in entries.items():
+        if not fields or key not in info:
+            continue
+        value = info[key]
+        if fields is not True:
+            fields = (fields,) if isinstance(fields, str) else fields
+            value = (
+                {f: value[f] for f in fields if f in value}
+                if isinstance(value, dict)
+                else [{f: v[f] for f in fields if f in v} for v in value]
+            )
+        results[key] = value
+    return results
+
+
+def batch(urls, entries=None, max_workers=None, ordered=False):
+    """Probe multiple media files concurrently
+
+    :param urls: URLs of the media files/streams
+    :type urls: iterable of str
+    :param entries: info to return with keys "format", "streams", "programs",
+                    and/or "chapters" and their values either True (all
+                    fields) or a sequence of field names, defaults to None
+                    (full details of all the sections)
+    :type entries: dict, optional
+    :param max_workers: maximum number of concurrent ffprobe processes,
+                        defaults to None (number of CPUs)
+    :type max_workers: int, optional
+    :param ordered: True to yield the results in the order of `urls`, defaults
+                    to False (as soon as each probe completes)
+    :type ordered: bool, optional
+    :yield: url and its media information (same format as
+            :py:func:`full_details`) or the exception raised while probing it
+    :rtype: Iterator[tuple[str, dict | Exception]]
+
+    Each file is probed fully by :py:func:`full_details` in a worker thread,
+    hence its result populates the probe cache for the subsequent queries.
+    An error probing one file does not stop the others: the exception is
+    yielded in place of its info. `urls` is consumed lazily, and at most
+    ``2*max_workers`` probes are pending at any time.
+
+    :Example:
+
+    .. code-block:: python
+
+        for url, info in ffmpegio.probe.batch(files, {"format": ["duration"]}):
+            if isinstance(info, Exception):
+                print(f"{url}: {info}")
+            else:
+                print(f"{url}: {info['format']['duration']} s")
+
+    """
+
+    max_workers = max_workers or os.cpu_count() or 1
+    urls = iter(urls)
+
+    def task(url):
+        try:
+            return url, _batch_probe(url, entries)
+        except Exception as e:
+            return url, e
+
+    with ThreadPoolExecutor(max_workers) as executor:
+
+        def submit(n):
+            return [executor.submit(task, url) for url in islice(urls, n)]
+
+        if ordered:
+            # executor.map submits all the urls at once, keep a sliding window
+            pending = submit(2 * max_workers)
+            while pending:
+                fut = pending.pop(0)
+                pending.extend(submit(1))
+                yield fut.result()
+        else:
+            pending = set(submit(2 * max_workers))
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                pending.update(submit(len(done)))
+                for fut in done:
+                    yield fut.result()
+
+
 def frames(url, entries=None, streams=None, intervals=None, accurate_time=False):
     """get frame information
 
@@ -783,3 +1023,192 @@ def frames(url, entries=None, streams=None, intervals=None, accurate_time=False)
         return [d[entry] for d in out] if is_single else out
     except:
         raise ValueError(f"invalid frame attribute: {entry}")
+
+
+def _index_key(url, streams):
+    # returns the cache key and the file signature (size & mtime) of the media file
+    realpath = os.path.realpath(url)
+    st = os.stat(realpath)
+    return (realpath, streams), (st.st_size, st.st_mtime_ns)
+
+
+def _index_file(key, create=False):
+    name = hashlib.sha1("|".join(key).encode("utf-8")).hexdigest()
+    return os.path.join(cache_dir("index", create=create), f"{name}.json")
+
+
+def _dump_index(sig, idx):
+    # JSON-serializable sidecar file content
+    return {
+        "signature": list(sig),
+        **{k: list(v) if isinstance(v, array) else v for k, v in idx.items()},
+        "time_base": str(idx["time_base"]),
+    }
+
+
+def _load_index(data, sig):
+    # packet index from the sidecar file content (None if outdated)
+    if tuple(data["signature"]) != sig:
+        return None
+    return {
+        "stream_index": int(data["stream_index"]),
+        "time_base": fractions.Fraction(data["time_base"]),
+        "start_time": float(data["start_time"]),
+        "pts": array("q", data["pts"]),
+        "size": array("q", data["size"]),
+        "keyframes": array("q", data["keyframes"]),
+    }
+
+
+def _build_index(url, streams):
+    # run ffprobe to list all the packets of the stream
+
+    res = _exec(
+        url,
+        {
+            "packet": ["pts", "dts", "size", "flags"],
+            "stream": ["index", "time_base"],
+            "format": ["start_time"],
+        },
+        streams,
+    )
+
+    try:
+        st = res["streams"][0]
+    except (KeyError, IndexError):
+        raise ValueError(f"Unknown or invalid stream specifier: {streams}")
+
+    packets = []
+    for pkt in res.get("packets", ()):
+        ts = pkt.get("pts", pkt.get("dts", None))
+        if ts is not None:
+            packets.append(
+                (int(ts), int(pkt.get("size", 0)), "K" in pkt.get("flags", ""))
+            )
+
+    # sort in the presentation order
+    packets.sort()
+    pts, size, flags = zip(*packets) if len(packets) else ((),) * 3
+
+    return {
+        "stream_index": int(st["index"]),
+        "time_base": fractions.Fraction(st["time_base"]),
+        "start_time": float(res.get("format", {}).get("start_time", 0.0)),
+        "pts": array("q", pts),
+        "size": array("q", size),
+        "keyframes": array("q", (i for i, k in enumerate(flags) if k)),
+    }
+
+
+def index(url, streams="v:0", build=True, cache=True):
+    """Get the packet index of a media stream
+
+    :param url: path of the media file
+    :type url: str
+    :param streams: stream specifier of the stream to index, defaults to "v:0"
+    :type streams: str, optional
+    :param build: False to return None instead of running ffprobe if the index
+                  has not been cached, defaults to True
+    :type build: bool, optional
+    :param cache: False to bypass the sidecar cache files, defaults to True
+    :type cache: bool, optional
+    :return: packet index (or None if not available and `build=False`)
+    :rtype: dict or None
+
+    The packet index is built by ffprobe once, by reading every packet of the
+    stream, and saved as a JSON sidecar file in the ``index`` subdirectory of
+    :py:func:`ffmpegio.path.cache_dir`. The cached index is keyed by the real
+    path of the file, its size, and its modification time, and automatically
+    rebuilt if the file is modified.
+
+    Packet Index Entries
+
+    ============  ==========  ========================================
+    name          type        description
+    ============  ==========  ========================================
+    stream_index  int         index of the stream in the file
+    time_base     Fraction    time base of pts
+    start_time    float       start time of the file in seconds
+    pts           array('q')  presentation timestamps in ascending order
+    size          array('q')  size of the packets in bytes
+    keyframes     array('q')  indices of the keyframe packets
+    ============  ==========  ========================================
+
+    """
+
+    key, sig = _index_key(url, streams)
+
+    entry = _index_db.get(key, None)
+    if entry is not None and entry[0] == sig:
+        _index_db.move_to_end(key, True)
+        return entry[1]
+
+    idx = None
+    if cache:
+        try:
+            with open(_index_file(key), "rt") as f:
+                idx = _load_index(json.load(f), sig)
+        except Exception:
+            idx = None
+
+    if idx is None:
+        if not build:
+            return None
+        idx = _build_index(url, streams)
+        if cache:
+            # write to a temp file first to keep other processes from seeing a partial file
+            try:
+                filename = _index_file(key, True)
+                tmpfile = f"{filename}.{os.getpid()}"
+                with open(tmpfile, "wt") as f:
+                    json.dump(_dump_index(sig, idx), f)
+                os.replace(tmpfile, filename)
+            except OSError:
+                pass
+
+    _index_db[key] = (sig, idx)
+    if len(_index_db) > _index_db_maxsize:
+        _index_db.popitem(False)  # remove the oldest entry
+
+    return idx
+
+
+def seek_point(index, time, duration=None):
+    """Find the keyframe to seek to reach the specified time
+
+    :param index: packet index returned by :py:func:`index`
+    :type index: dict
+    :param time: target time in seconds (relative to the start of the file)
+    :type time: float
+    :param duration: duration in seconds to count the frames, defaults to None
+    :type duration: float, optional
+    :return: time of the last keyframe at or before `time`, number of frames
+             between the keyframe and `time`, and number of frames presented
+             in `duration` seconds from `time` (None if duration not given)
+    :rtype: tuple(float, int, int|None)
+    """
+
+    tb = index["time_base"]
+    t0 = index["start_time"]
+    pts = index["pts"]
+    keyframes = index["keyframes"]
+
+    if not len(keyframes):
+        raise ValueError("no keyframe found in the index")
+
+    def to_ts(t):
+        # convert time to the index timebase (round to avoid floating-point errors)
+        return round((fractions.Fraction(t) + fractions.Fraction(t0)) / tb)
+
+    # index of the target frame
+    i = bisect_left(pts, to_ts(time))
+
+    # last keyframe at or before the target frame
+    j = bisect_right(keyframes, i) - 1
+    ikf = keyframes[max(j, 0)]
+
+    nframes = (
+        None if duration is None else bisect_left(pts, to_ts(time + duration)) - i
+    )
+
+    return float(pts[ikf] * tb) - t0, max(i - ikf, 0), nframes
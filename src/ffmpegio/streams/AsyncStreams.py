@@ -0,0 +1,968 @@
+"""asyncio counterparts of the SISO media stream classes
+
+The stream classes in this module drive FFmpeg's stdin, stdout, and stderr
+pipes on the running event loop (via :py:mod:`ffmpegio.ffmpegprocess.aio`)
+instead of dedicated reader/writer/logger threads. A stream is started by
+awaiting it or by entering its async context::
+
+    async with AsyncVideoReader("video.mp4") as reader:
+        async for frames in reader:
+            ...
+
+"""
+
+import asyncio
+import codecs
+import re
+import logging
+
+logger = logging.getLogger("ffmpegio")
+
+from .. import utils, configure, plugins
+from ..errors import FFmpegError
+from ..ffmpegprocess import aio
+from ..utils.log import extract_output_stream as _extract_output_stream
+from .SimpleStreams import (
+    SimpleVideoReader,
+    SimpleAudioReader,
+    SimpleVideoWriter,
+    SimpleAudioWriter,
+    SimpleVideoFilter,
+    SimpleAudioFilter,
+)
+
+# fmt:off
+__all__ = [ "AsyncVideoReader", "AsyncAudioReader", "AsyncVideoWriter",
+    "AsyncAudioWriter", "AsyncVideoFilter", "AsyncAudioFilter"]
+# fmt:on
+
+_newline = re.compile(r"\r\n|\r|\n")
+
+
+class AsyncLogger:
+    """FFmpeg log collector task (asyncio counterpart of LoggerThread)
+
+    :param stderr: FFmpeg stderr pipe
+    :type stderr: asyncio.StreamReader
+    :param echo: True to print the log lines, defaults to False
+    :type echo: bool, optional
+    """
+
+    def __init__(self, stderr, echo=False):
+        self.logs = []
+        self.echo = echo
+        self._newline = asyncio.Condition()
+        self._done = False
+        self._task = asyncio.ensure_future(self._run(stderr))
+
+    async def _run(self, stderr):
+        logger.debug("[async logger] starting")
+        pending = ""
+        # a multibyte character may be split across the chunks
+        decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        try:
+            while True:
+                # FFmpeg separates the progress status lines with "\r", which
+                # StreamReader.readline() does not recognize
+                chunk = await stderr.read(4096)
+                if not chunk:
+                    lines = [pending + decoder.decode(b"", final=True)]
+                else:
+                    *lines, pending = _newline.split(pending + decoder.decode(chunk))
+                lines = [log for log in lines if log]
+                if lines:
+                    if self.echo:
+                        for log in lines:
+                            print(log)
+                    async with self._newline:
+                        self.logs.extend(lines)
+                        self._newline.notify_all()
+                if not chunk:
+                    break
+        finally:
+            async with self._newline:
+                self._done = True
+                self._newline.notify_all()
+            logger.debug("[async logger] exiting")
+
+    async def index(self, prefix, start=None):
+        """wait for the log line starting with prefix
+
+        :param prefix: log line prefix
+        :type prefix: str
+        :param start: index of the first line to search, defaults to None (0)
+        :type start: int, optional
+        :return: log line index
+        :rtype: int
+        """
+        start = int(start or 0)
+        async with self._newline:
+            while True:
+                logs = self.logs
+                for i in range(start, len(logs)):
+                    if logs[i].startswith(prefix):
+                        return i
+                start = len(logs)
+
+                # FFmpeg could have been terminated without match
+                if self._done:
+                    raise ValueError("Specified line not found")
+
+                await self._newline.wait()
+
+    async def output_stream(self, file_id=0, stream_id=0):
+        """wait for and parse the output stream info
+
+        :param file_id: output file id, defaults to 0
+        :type file_id: int, optional
+        :param stream_id: output stream id, defaults to 0
+        :type stream_id: int, optional
+        :return: output stream info
+        :rtype: dict
+        """
+        try:
+            i = await self.index(f"Output #{file_id}")
+            await self.index(f"  Stream #{file_id}:{stream_id}", i)
+        except ValueError:
+            raise ValueError("Specified output stream not found")
+
+        return _extract_output_stream(self.logs, hint=i)
+
+    async def join(self):
+        """wait till FFmpeg closes its stderr"""
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+
+    def cancel(self):
+        """stop collecting the log"""
+        self._task.cancel()
+
+    async def join_and_raise(self):
+        """wait till FFmpeg closes its stderr and raise exception based on the log"""
+        await self.join()
+        e = self.Exception
+        if e is not None:
+            raise e
+
+    @property
+    def Exception(self):
+        """Exception gathered from the current log or None if there is no log"""
+        return FFmpegError(self.logs) if len(self.logs) else None
+
+
+class _AsyncStreamBase:
+    # common async context/await protocols
+
+    _proc = None  # aio.Popen
+    _logger = None  # AsyncLogger
+
+    def __await__(self):
+        return self._start().__await__()
+
+    async def __aenter__(self):
+        await self._start()
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+    async def _start(self):
+        return self
+
+    @property
+    def closed(self):
+        """:bool: True if the stream is closed."""
+        return self._proc is not None and self._proc.returncode is not None
+
+    @property
+    def lasterror(self):
+        """:FFmpegError: Last error FFmpeg posted"""
+        if self._proc is not None and self._proc.returncode:
+            return self._logger.Exception
+        else:
+            return None
+
+    def readlog(self, n=None):
+        """get FFmpeg log lines
+
+        :param n: number of lines to return, defaults to None (every line logged)
+        :type n: int, optional
+        :return: string containing the requested logs
+        :rtype: str
+        """
+        if self._logger is None:
+            return ""
+        return "\n".join(self._logger.logs[:n])
+
+
+class AsyncReaderBase(_AsyncStreamBase):
+    """base class for SISO media async read stream classes"""
+
+    def __init__(
+        self,
+        converter,
+        viewer,
+        url,
+        show_log=None,
+        progress=None,
+        blocksize=None,
+        sp_kwargs=None,
+        **options,
+    ) -> None:
+        self._converter = converter  # :Callable: f(b,dtype,shape) -> data_object
+        self._memoryviewer = viewer  #:Callable: f(data_object)->bytes-like object
+        self.dtype = None  # :str: output data type
+        self.shape = (
+            None  # :tuple of ints: dimension of each video frame or audio sample
+        )
+        self.samplesize = (
+            None  #:int: number of bytes of each video frame or audio sample
+        )
+        self.blocksize = blocksize  #:positive int: number of video frames or audio samples to read when used as an iterator
+
+        # get url/file stream
+        input_options = utils.pop_extra_options(options, "_in")
+        url, stdin, input = configure.check_url(
+            url, False, format=input_options.get("f", None)
+        )
+
+        ffmpeg_args = configure.empty()
+        configure.add_url(ffmpeg_args, "input", url, input_options)
+        configure.add_url(ffmpeg_args, "output", "-", options)
+
+        kwargs = {**sp_kwargs} if sp_kwargs else {}
+        kwargs.update({"stdin": stdin, "progress": progress, "capture_log": True})
+
+        self._cfg = (ffmpeg_args, kwargs, input, show_log)
+        self._feeder = None  # task to feed the input bytes
+
+    async def _start(self):
+        if self._cfg is None:
+            return self
+
+        ffmpeg_args, kwargs, input, show_log = self._cfg
+        self._cfg = None
+
+        # finalize the options (may run ffprobe) => sets self.dtype and self.shape if known
+        await asyncio.get_running_loop().run_in_executor(
+            None, self._finalize, ffmpeg_args
+        )
+
+        # start FFmpeg
+        self._proc = await aio.Popen(ffmpeg_args, **kwargs)
+        self._logger = AsyncLogger(self._proc.stderr, show_log)
+
+        # if byte data is given, feed it
+        if input is not None:
+            self._feeder = asyncio.ensure_future(self._feed(input))
+
+        # wait until output stream log is captured if output format is unknown
+        try:
+            if self.dtype is None or self.shape is None:
+                logger.debug(
+                    "[async reader] waiting for logger to provide output stream info"
+                )
+                info = await self._logger.output_stream()
+                logger.debug(f"[async reader] received {info}")
+                self._finalize_array(info)
+            else:
+                await self._logger.index("Output")
+        except Exception:
+            await self._proc.wait()
+            await self._logger.join()
+            e = self._logger.Exception
+            raise e or ValueError("failed retrieve output data format")
+
+        self.samplesize = utils.get_samplesize(self.shape, self.dtype)
+
+        self.blocksize = self.blocksize or max(1024**2 // self.samplesize, 1)
+
+        logger.debug("[async reader] completed init")
+        return self
+
+    async def _feed(self, input):
+        stdin = self._proc.stdin
+        try:
+            stdin.write(memoryview(input))
+            await stdin.drain()
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+        finally:
+            stdin.close()
+
+    async def close(self):
+        """Close the stream and terminate FFmpeg.
+
+        As a convenience, it is allowed to call this method more than once;
+        only the first call, however, will have an effect.
+        """
+
+        if self._proc is None:
+            return
+
+        if self._feeder is not None:
+            self._feeder.cancel()
+
+        if self._proc.returncode is None:
+            self._proc.terminate()
+        await self._proc.wait()
+        logger.debug(f"[async reader] FFmpeg closed? {self._proc.returncode}")
+
+        await self._logger.join()
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        F = await self.read(self.blocksize)
+        if F is None:
+            raise StopAsyncIteration
+        return F
+
+    async def read(self, n=-1):
+        """Read and return a data block with up to n frames/samples. If
+        the argument is omitted, None, or negative, data is read and
+        returned until EOF is reached. None is returned if the stream is
+        already at EOF."""
+
+        logger.debug(f"[async reader] reading {n} samples")
+        stdout = self._proc.stdout
+        if n is None or n < 0:
+            b = await stdout.read()
+        else:
+            try:
+                b = await stdout.readexactly(n * self.samplesize)
+            except asyncio.IncompleteReadError as e:
+                b = e.partial
+        logger.debug(f"[async reader] read {len(b)} bytes")
+
+        nread = len(b) - len(b) % self.samplesize
+        if not nread:
+            return None
+        return self._converter(
+            b=b[:nread] if nread < len(b) else b,
+            shape=self.shape,
+            dtype=self.dtype,
+            squeeze=False,
+        )
+
+    async def readinto(self, array):
+        """Read frames/samples into a pre-allocated, writable data object and
+        return the number of frames/samples read."""
+
+        mv = memoryview(self._memoryviewer(obj=array)).cast("B")
+        try:
+            b = await self._proc.stdout.readexactly(len(mv))
+        except asyncio.IncompleteReadError as e:
+            b = e.partial
+        mv[: len(b)] = b
+        return len(b) // self.samplesize
+
+
+class AsyncVideoReader(AsyncReaderBase):
+    readable = True
+    writable = False
+    multi_read = False
+    multi_write = False
+
+    def __init__(
+        self,
+        url,
+        show_log=None,
+        progress=None,
+        blocksize=1,
+        sp_kwargs=None,
+        seek_index=None,
+        **options,
+    ):
+        self._seek_index = seek_index  #: packet index option (see video.read)
+        hook = plugins.get_hook()
+        super().__init__(
+            hook.bytes_to_video,
+            hook.video_bytes,
+            url,
+            show_log,
+            progress,
+            blocksize,
+            sp_kwargs,
+            **options,
+        )
+
+    _finalize = SimpleVideoReader._finalize
+    _finalize_array = SimpleVideoReader._finalize_array
+
+
+class AsyncAudioReader(AsyncReaderBase):
+    readable = True
+    writable = False
+    multi_read = False
+    multi_write = False
+
+    def __init__(
+        self,
+        url,
+        show_log=None,
+        progress=None,
+        blocksize=None,
+        sp_kwargs=None,
+        **options,
+    ):
+        hook = plugins.get_hook()
+        super().__init__(
+            hook.bytes_to_audio,
+            hook.audio_bytes,
+            url,
+            show_log,
+            progress,
+            blocksize,
+            sp_kwargs,
+            **options,
+        )
+
+    _finalize = SimpleAudioReader._finalize
+    _finalize_array = SimpleAudioReader._finalize_array
+    channels = SimpleAudioReader.channels
+
+
+###########################################################################
+
+
+class AsyncWriterBase(_AsyncStreamBase):
+    """base class for SISO media async write stream classes"""
+
+    def __init__(
+        self,
+        viewer,
+        url,
+        shape_in=None,
+        dtype_in=None,
+        show_log=None,
+        progress=None,
+        overwrite=None,
+        extra_inputs=None,
+        sp_kwargs=None,
+        **options,
+    ) -> None:
+        self._viewer = viewer
+        self.dtype_in = dtype_in
+        self.shape_in = shape_in
+        self._show_log = show_log
+
+        # get url/file stream
+        url, stdout, _ = configure.check_url(url, True)
+
+        input_options = utils.pop_extra_options(options, "_in")
+
+        ffmpeg_args = configure.empty()
+        configure.add_url(ffmpeg_args, "input", "-", input_options)
+        configure.add_url(ffmpeg_args, "output", url, options)
+
+        # add extra input arguments if given
+        if extra_inputs is not None:
+            for input in extra_inputs:
+                if isinstance(input, str):
+                    configure.add_url(ffmpeg_args, "input", input)
+                else:
+                    configure.add_url(ffmpeg_args, "input", *input)
+
+        # abstract method to finalize the options only if self.dtype and self.shape are given
+        self._ready = self._finalize(ffmpeg_args)
+
+        # FFmpeg Popen arguments
+        self._cfg = {**sp_kwargs} if sp_kwargs else {}
+        self._cfg.update(
+            {
+                "ffmpeg_args": ffmpeg_args,
+                "progress": progress,
+                "capture_log": True,
+                "overwrite": overwrite,
+                "stdout": stdout,
+            }
+        )
+
+    async def _start(self):
+        # start FFmpeg now only if the input format is known
+        if self._cfg and self._ready:
+            await self._open()
+        return self
+
+    async def _open(self, data=None):
+        # if data array is given, finalize the FFmpeg configuration with it
+        if data is not None:
+            self._finalize_with_data(data)
+
+        # start FFmpeg
+        cfg = self._cfg
+        self._cfg = False
+        self._proc = await aio.Popen(**cfg)
+        self._logger = AsyncLogger(self._proc.stderr, self._show_log)
+
+    async def close(self):
+        """Flush and close the output stream and wait for FFmpeg to finish"""
+        if self._proc is None:
+            return
+
+        stdin = self._proc.stdin
+        if not stdin.is_closing():
+            try:
+                await stdin.drain()
+            except (BrokenPipeError, ConnectionResetError):
+                pass
+            stdin.close()
+        await self._proc.wait()
+        await self._logger.join()
+
+    async def write(self, data):
+        """Write the given data block (waits until FFmpeg accepts it)
+
+        The caller may release or mutate data after this method returns.
+        """
+
+        if self._cfg:
+            # if FFmpeg not yet started, finalize the configuration with
+            # the data and start
+            await self._open(data)
+
+        logger.debug("[async writer] writing...")
+
+        try:
+            self._proc.stdin.write(self._viewer(obj=data))
+            await self._proc.stdin.drain()
+        except (BrokenPipeError, ConnectionResetError):
+            await self._proc.wait()
+            await self._logger.join_and_raise()
+            raise
+
+    async def flush(self):
+        """wait until all the written data are sent to FFmpeg"""
+        await self._proc.stdin.drain()
+
+
+class AsyncVideoWriter(AsyncWriterBase):
+    readable = False
+    writable = True
+    multi_read = False
+    multi_write = False
+
+    def __init__(
+        self,
+        url,
+        rate_in,
+        shape_in=None,
+        dtype_in=None,
+        show_log=None,
+        progress=None,
+        overwrite=None,
+        extra_inputs=None,
+        sp_kwargs=None,
+        **options,
+    ):
+        options["r_in"] = rate_in
+        if "r" not in options:
+            options["r"] = rate_in
+
+        super().__init__(
+            plugins.get_hook().video_bytes,
+            url,
+            shape_in,
+            dtype_in,
+            show_log,
+            progress,
+            overwrite,
+            extra_inputs,
+            sp_kwargs,
+            **options,
+        )
+
+    _finalize = SimpleVideoWriter._finalize
+    _finalize_with_data = SimpleVideoWriter._finalize_with_data
+
+
+class AsyncAudioWriter(AsyncWriterBase):
+    readable = False
+    writable = True
+    multi_read = False
+    multi_write = False
+
+    def __init__(
+        self,
+        url,
+        rate_in,
+        shape_in=None,
+        dtype_in=None,
+        show_log=None,
+        progress=None,
+        overwrite=None,
+        extra_inputs=None,
+        sp_kwargs=None,
+        **options,
+    ):
+        options["ar_in"] = rate_in
+        if "ar" not in options:
+            options["ar"] = rate_in
+
+        super().__init__(
+            plugins.get_hook().audio_bytes,
+            url,
+            shape_in,
+            dtype_in,
+            show_log,
+            progress,
+            overwrite,
+            extra_inputs,
+            sp_kwargs,
+            **options,
+        )
+
+    _finalize = SimpleAudioWriter._finalize
+    _finalize_with_data = SimpleAudioWriter._finalize_with_data
+
+
+###############################################################################
+
+
+class AsyncFilterBase(_AsyncStreamBase):
+    """base class for SISO media async filter stream classes
+
+    FFmpeg output is collected by a task on the event loop while the input
+    data are being written, so :py:meth:`filter` never deadlocks on full
+    pipes. See :py:class:`SimpleFilterBase` for the arguments.
+
+    The task stops reading the output once :py:attr:`outbufsize` bytes are
+    buffered and resumes as :py:meth:`filter` returns them. The limit is lifted
+    from the time :py:meth:`filter` writes the input (or :py:meth:`flush`
+    closes it) until the output is returned, so FFmpeg is never left blocked on
+    its stdout while the input is being written.
+    """
+
+    #:int: output buffer size in bytes above which the output is not read
+    #:until retrieved
+    outbufsize = 2**26
+
+    def __init__(
+        # fmt:off
+        self, converter, data_viewer, info_viewer, expr, rate_in, shape_in=None, dtype_in=None,
+        rate=None, shape=None, dtype=None, block_size=None, defaulttimeout=None,
+        progress=None, show_log=None, sp_kwargs=None, **options,
+        # fmt:on
+    ) -> None:
+        if not rate_in:
+            if rate:
+                rate_in = rate
+            else:
+                raise ValueError("Either rate_in or rate must be defined.")
+
+        # :Callable: create a new data block object
+        self._converter = converter
+
+        # :Callable: get bytes-like object of the data block obj
+        self._memoryviewer = data_viewer
+
+        # :Callable: get bytes-like object of the data block obj
+        self._infoviewer = info_viewer
+
+        #:float: default filter timeout in seconds to wait for the output
+        self.defaulttimeout = defaulttimeout or 10e-3
+
+        #:int|Fraction: input sample rate
+        self.rate_in = rate_in
+        #:int|Fraction: output sample rate
+        self.rate = rate
+
+        self.nin = 0  #:int: total number of input samples sent to FFmpeg
+        self.nout = 0  #:int: total number of output sampless received from FFmpeg
+        # :float: # of output samples per 1 input sample
+        self._out2in = None
+
+        # set this to false if guaranteed for the logger to have output stream info
+        self._loggertimeout = True
+
+        self._show_log = show_log
+        self._reader_needs_info = True
+        self._outbuf = bytearray()  # FFmpeg output received but not yet returned
+        self._outcond = None  # asyncio.Condition to notify new output
+        self._outroom = None  # asyncio.Event set when output is retrieved
+        self._uncapped = False  # True to read the output beyond outbufsize
+        self._reader = None  # stdout reader task
+
+        ffmpeg_args = configure.empty()
+        inopts = configure.add_url(
+            ffmpeg_args, "input", "-", utils.pop_extra_options(options, "_in")
+        )[1][1]
+        outopts = configure.add_url(ffmpeg_args, "output", "-", options)[1][1]
+
+        self.shape_in, self.dtype_in = self._set_options(
+            inopts, shape_in, dtype_in, rate_in
+        )
+
+        self.shape, self.dtype = self._set_options(outopts, shape, dtype, rate, expr)
+
+        # FFmpeg Popen arguments
+        self._cfg = {**sp_kwargs} if sp_kwargs else {}
+        self._cfg.update(
+            {
+                "ffmpeg_args": ffmpeg_args,
+                "progress": progress,
+                "capture_log": True,
+            }
+        )
+
+    async def _start(self):
+        # if input is fully configured, start FFmpeg now
+        if self._cfg and self.shape_in is not None and self.dtype_in is not None:
+            await self._open()
+        return self
+
+    async def _open(self, data=None):
+        ffmpeg_args = self._cfg["ffmpeg_args"]
+
+        # if data array is given, finalize the FFmpeg configuration with it
+        if data is not None:
+            self.shape_in, self.dtype_in = self._set_options(
+                ffmpeg_args["inputs"][0][1], *self._infoviewer(obj=data)
+            )
+
+        # final argument tweak before opening the ffmpeg
+        self._pre_open(ffmpeg_args)
+
+        # start FFmpeg
+        cfg = self._cfg
+        self._cfg = False
+        self._proc = await aio.Popen(**cfg)
+        self._logger = AsyncLogger(self._proc.stderr, self._show_log)
+
+        # start collecting the output
+        self._outcond = asyncio.Condition()
+        self._outroom = asyncio.Event()
+        self._reader = asyncio.ensure_future(self._read_output())
+
+        if self.rate is not None and self.dtype is not None and self.shape is not None:
+            self._set_sizes()
+
+    async def _read_output(self):
+        stdout = self._proc.stdout
+        cond = self._outcond
+        try:
+            while True:
+                while len(self._outbuf) >= self.outbufsize and not self._uncapped:
+                    # buffer full, wait till the output is retrieved
+                    self._outroom.clear()
+                    await self._outroom.wait()
+                b = await stdout.read(2**20)
+                async with cond:
+                    self._outbuf += b
+                    cond.notify_all()
+                if not b:
+                    break
+        finally:
+            logger.debug("[async filter] stdout reader exiting")
+
+    async def _get_output_info(self, timeout):
+        # run after the first input block is sent to FFmpeg
+        try:
+            info = await asyncio.wait_for(
+                self._logger.output_stream(),
+                timeout if self._loggertimeout else None,
+            )
+        except asyncio.TimeoutError:
+            raise TimeoutError("Specified output stream not found")
+        except Exception:
+            if self._proc.returncode is None:
+                raise self._logger.Exception
+            else:
+                raise ValueError("failed retrieve output data format")
+
+        self._finalize_output(info)
+        self._set_sizes()
+
+    def _set_sizes(self):
+        self._bps_out = utils.get_samplesize(self.shape, self.dtype)
+        self._bps_in = utils.get_samplesize(self.shape_in, self.dtype_in)
+        self._out2in = self.rate / self.rate_in
+        self._reader_needs_info = False
+
+    def _pop_output(self, nmax=None):
+        # return all the complete output samples (up to nmax) received so far
+        n = len(self._outbuf) // self._bps_out
+        if nmax is not None:
+            n = min(n, nmax)
+        nbytes = n * self._bps_out
+        with memoryview(self._outbuf) as mv:
+            y = bytes(mv[:nbytes])
+        del self._outbuf[:nbytes]
+        self._set_uncapped(False)
+        self.nout += n
+        return self._converter(b=y, dtype=self.dtype, shape=self.shape, squeeze=False)
+
+    async def close(self):
+        """Close the stream and terminate FFmpeg.
+
+        As a convenience, it is allowed to call this method more than once;
+        only the first call, however, will have an effect.
+        """
+
+        if self._proc is None:
+            return
+
+        if self._proc.returncode is None:
+            self._proc.terminate()
+        await self._proc.wait()
+
+        if self._reader is not None:
+            self._reader.cancel()
+            try:
+                await self._reader
+            except asyncio.CancelledError:
+                pass
+        await self._logger.join()
+
+    def _set_uncapped(self, uncapped):
+        self._uncapped = uncapped
+        self._outroom.set()
+
+    async def filter(self, data, timeout=None):
+        """Run filter operation
+
+        :param data: input data block
+        :type data: numpy.ndarray
+        :param timeout: maximum time in seconds to wait for the expected
+                        output, defaults to None (`defaulttimeout`)
+        :type timeout: float, optional
+        :return: output data block
+        :rtype: numpy.ndarray
+
+        See :py:meth:`SimpleVideoFilter.filter` for the caveats regarding the
+        number of output frames/samples.
+        """
+
+        timeout = timeout or self.defaulttimeout
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+
+        if self._cfg:
+            # if FFmpeg not yet started, finalize the configuration with
+            # the data and start
+            await self._open(data)
+
+        inbytes = self._memoryviewer(obj=data)
+
+        # keep reading the output while FFmpeg consumes the input
+        self._set_uncapped(True)
+        stdin = self._proc.stdin
+        try:
+            stdin.write(inbytes)
+            await stdin.drain()
+        except (BrokenPipeError, ConnectionResetError):
+            await self._proc.wait()
+            await self._logger.join_and_raise()
+            raise
+
+        if self._reader_needs_info:
+            # with the data written, FFmpeg should inform the output setup
+            await self._get_output_info(deadline - loop.time())
+
+        self.nin += len(memoryview(inbytes).cast("B")) // self._bps_in
+        nexpected = int(self.nin * self._out2in) - self.nout
+
+        # wait for the expected number of output samples (or timeout)
+        nbytes = nexpected * self._bps_out
+        cond = self._outcond
+
+        async def wait_output():
+            async with cond:
+                await cond.wait_for(
+                    lambda: len(self._outbuf) >= nbytes or self._reader.done()
+                )
+
+        try:
+            await asyncio.wait_for(wait_output(), max(deadline - loop.time(), 0))
+        except asyncio.TimeoutError:
+            pass
+
+        return self._pop_output(max(nexpected, 0))
+
+    async def flush(self):
+        """Close the stream input and retrieve the remaining output samples
+
+        :return: remaining output samples
+        :rtype: numpy.ndarray
+        """
+
+        stdin = self._proc.stdin
+        if not stdin.is_closing():
+            stdin.close()
+        self._set_uncapped(True)
+        await self._reader
+        await self._proc.wait()
+        if self._reader_needs_info:
+            await self._get_output_info(None)
+        return self._pop_output()
+
+
+class AsyncVideoFilter(AsyncFilterBase):
+    """SISO video async filter stream class
+
+    See :py:class:`SimpleVideoFilter` for the arguments.
+    """
+
+    readable = True
+    writable = True
+    multi_read = False
+    multi_write = False
+
+    def __init__(
+        # fmt:off
+        self, expr, rate_in, shape_in=None, dtype_in=None, rate=None, shape=None, dtype=None,
+        block_size=None, defaulttimeout=None, progress=None, show_log=None, sp_kwargs=None,
+        **options,
+        # fmt:on
+    ) -> None:
+        hook = plugins.get_hook()
+        # fmt:off
+        super().__init__(
+            hook.bytes_to_video, hook.video_bytes, hook.video_info,
+            expr, rate_in, shape_in, dtype_in, rate, shape, dtype,
+            block_size, defaulttimeout, progress, show_log, sp_kwargs, **options,
+        )
+        # fmt:on
+        self._loggertimeout = False
+
+    _pre_open = SimpleVideoFilter._pre_open
+    _set_options = SimpleVideoFilter._set_options
+    _finalize_output = SimpleVideoFilter._finalize_output
+
+
+class AsyncAudioFilter(AsyncFilterBase):
+    """SISO audio async filter stream class
+
+    See :py:class:`SimpleAudioFilter` for the arguments.
+    """
+
+    readable = True
+    writable = True
+    multi_read = False
+    multi_write = False
+
+    def __init__(
+        # fmt:off
+        self, expr, rate_in, shape_in=None, dtype_in=None, rate=None, shape=None, dtype=None,
+        block_size=None, defaulttimeout=None, progress=None, show_log=None, sp_kwargs=None,
+        **options,
+        # fmt:on
+    ) -> None:
+        hook = plugins.get_hook()
+        # fmt:off
+        super().__init__(
+            hook.bytes_to_audio, hook.audio_bytes, hook.audio_info,
+            expr, rate_in, shape_in, dtype_in, rate, shape, dtype,
+            block_size, defaulttimeout, progress, show_log, sp_kwargs, **options,
+        )
+        # fmt:on
+
+    _pre_open = SimpleAudioFilter._pre_open
+    _set_options = SimpleAudioFilter._set_options
+    _finalize_output = SimpleAudioFilter._finalize_output
+    channels = SimpleAudioFilter.channels
+    channels_in = SimpleAudioFilter.channels_in
@@ -1,4 +1,7 @@
+import os
+
 from .. import configure, threading, utils, ffmpegprocess
+from ..errors import FFmpegioError
 
 __all__ = ["AviMediaReader"]
 
@@ -17,10 +20,18 @@ class AviMediaReader:
                      defaults to None (no show/capture)
                      Ignored if stream format must be retrieved automatically.
     :type show_log: bool, optional
+    :param batchsize: if given, demux the AVI stream in batches of this many bytes,
+                      defaults to None (one chunk at a time)
+    :type batchsize: int, optional
     :param sp_kwargs: dictionary with keywords passed to `subprocess.run()` or
                       `subprocess.Popen()` call used to run the FFmpeg, defaults
                       to None
     :type sp_kwargs: dict, optional
+    :param iomux: True to receive the FFmpeg output and log by the shared I/O
+                  multiplexer thread and demux the AVI stream on the calling
+                  thread instead of two dedicated threads, defaults to False
+                  (POSIX only)
+    :type iomux: bool, optional
     :param \\**options: FFmpeg options, append '_in[input_url_id]' for input option names for specific
                         input url or '_in' to be applied to all inputs. The url-specific option gets the
                         preference (see :doc:`options` for custom options)
@@ -56,9 +67,13 @@ class AviMediaReader:
         progress=None,
         show_log=None,
         queuesize=0,
+        batchsize=None,
         sp_kwargs=None,
+        iomux=False,
         **options
     ):
+        if iomux and os.name != "posix":
+            raise FFmpegioError("iomux option requires a POSIX system.")
 
         self.ref_stream = ref_stream
         #:str: specifier of reference output stream for iterator
@@ -87,10 +102,14 @@ class AviMediaReader:
         # configure output options
         use_ya = configure.finalize_media_read_opts(args)
 
-        self._reader = threading.AviReaderThread(queuesize)
+        self._reader = (
+            threading.IOMuxAviReader if iomux else threading.AviReaderThread
+        )(queuesize, batchsize)
 
         # create logger without assigning the source stream
-        self._logger = threading.LoggerThread(None, show_log)
+        self._logger = (threading.IOMuxLogger if iomux else threading.LoggerThread)(
+            None, show_log
+        )
 
         # start FFmpeg
         self._proc = ffmpegprocess.Popen(args, progress=progress, capture_log=True)
@@ -0,0 +1,477 @@
+import os
+from math import ceil
+
+from .. import configure, utils, ffmpegprocess, plugins, probe
+from ..errors import FFmpegioError
+from ..filtergraph import Graph
+from ..threading import LoggerThread, ReaderThread
+
+__all__ = ["PipedMediaReader"]
+
+# output options only relevant to one media type
+_video_options = {"pix_fmt", "s", "r", "vf", "vcodec", "vframes", "aspect", "vn"}
+_audio_options = {"sample_fmt", "ar", "ac", "af", "acodec", "aframes", "an"}
+_stream_options = {"c", "codec", "filter", "frames", "b", "q"}
+
+# options which must be given to FFmpeg as global options
+_global_options = ("filter_complex", "filter_complex_script", "lavfi")
+
+
+class PipedMediaReader:
+    """Read multiple media streams, each through its own pipe
+
+    :param *urls: URLs of the media files to read.
+    :type *urls: tuple(str)
+    :param map: output streams, each given by an input stream specifier (e.g.,
+                ``"0:v:0"``, ``(1, "a:0")``) or a filtergraph output label (e.g.,
+                ``"[out]"``), defaults to None, which outputs the first video and
+                the first audio streams found in the inputs
+    :type map: seq(str|tuple), optional
+    :param ref_stream: specifier of reference output stream for iterator,
+                       defaults to None (the first stream)
+    :type ref_stream: str, optional
+    :param blocksize: number of samples of reference stream to include in each
+                      iteration, defaults to None (1 sample)
+    :type blocksize: int, optional
+    :param progress: progress callback function, defaults to None
+    :type progress: callable object, optional
+    :param show_log: True to show FFmpeg log messages on the console,
+                     defaults to None (no show/capture)
+    :type show_log: bool, optional
+    :param bufsize: capacity of the buffer of each stream in bytes, defaults to
+                    None (unbounded). A full buffer blocks FFmpeg (and all the
+                    other streams) until the stream is read.
+    :type bufsize: int, optional
+    :param sp_kwargs: dictionary with keywords passed to `subprocess.Popen()`
+                      call used to run the FFmpeg, defaults to None
+    :type sp_kwargs: dict, optional
+    :param \\**options: FFmpeg options, append '_in[input_url_id]' for input option names for specific
+                        input url or '_in' to be applied to all inputs. The url-specific option gets the
+                        preference (see :doc:`options` for custom options)
+    :type \\**options: dict, optional
+
+    Unlike :py:class:`AviMediaReader`, FFmpeg writes each output stream to its
+    own OS pipe (``pipe:<fd>`` output url) as raw data, so the streams are not
+    muxed into an AVI container. Each stream is read by its own thread and can
+    be consumed independently of the others without head-of-line blocking.
+    This transport requires a POSIX system.
+
+    The media type of each stream must be resolvable: the stream specifier
+    includes the media type (e.g., ``"0:v:0"``), the input file can be probed
+    (e.g., ``"0:1"``), or the filtergraph output label is connected to a filter
+    with known output media type.
+
+    If 'pix_fmt' option is not explicitly set, 'rgb24' is used. For audio
+    streams, if 'sample_fmt' output option is not specified, 's16'.
+    """
+
+    readable = True
+    writable = False
+    multi_read = True
+    multi_write = False
+
+    def __init__(
+        self,
+        *urls,
+        map=None,
+        ref_stream=None,
+        blocksize=None,
+        progress=None,
+        show_log=None,
+        bufsize=None,
+        sp_kwargs=None,
+        **options,
+    ):
+        if os.name != "posix":
+            raise FFmpegioError("PipedMediaReader requires a POSIX system.")
+
+        self.ref_stream = ref_stream
+        #:str: specifier of reference output stream for iterator
+        self.blocksize = blocksize or 1
+        #:int: number of samples of reference stream to include in each iteration
+
+        ninputs = len(urls)
+        if not ninputs:
+            raise ValueError("At least one URL must be given.")
+
+        # separate the options
+        spec_inopts = utils.pop_extra_options_multi(options, r"_in(\d+)$")
+        inopts = utils.pop_extra_options(options, "_in")
+
+        # create a new FFmpeg dict
+        gopts = {k: options.pop(k) for k in _global_options if k in options}
+        args = configure.empty(gopts or None)
+        for i, url in enumerate(urls):  # add inputs
+            opts = {**inopts, **spec_inopts.get(i, {})}
+            # check url (must be url and not fileobj)
+            configure.check_url(
+                url, nodata=True, nofileobj=True, format=opts.get("f", None)
+            )
+            configure.add_url(args, "input", url, opts)
+
+        # resolve the output streams and their media types
+        if map is None:
+            map = _default_map(urls)
+        elif isinstance(map, str) or (
+            isinstance(map, tuple) and len(map) == 2 and isinstance(map[0], int)
+        ):
+            # a single map entry: spec string or (file id, stream spec) pair
+            map = [map]
+        cnt = {"v": 0, "a": 0}
+        self._streams = []  # output stream info
+        for spec in map:
+            spec = _map_spec(spec)
+            type = _media_type(spec, urls, gopts)
+            self._streams.append(
+                {"spec": utils.stream_spec(cnt[type], type), "map": spec, "type": type}
+            )
+            cnt[type] += 1
+
+        # create a pipe per output stream
+        self._readers = []
+        wfds = []
+        try:
+            for i, info in enumerate(self._streams):
+                rfd, wfd = os.pipe()
+                wfds.append(wfd)
+                self._readers.append(
+                    ReaderThread(open(rfd, "rb", buffering=0), bufsize=bufsize)
+                )
+                configure.add_url(
+                    args, "output", f"pipe:{wfd}", _output_options(options, info)
+                )
+
+            # create logger without assigning the source stream
+            self._logger = LoggerThread(None, show_log)
+
+            # start FFmpeg
+            self._proc = ffmpegprocess.Popen(
+                args,
+                progress=progress,
+                capture_log=True,
+                pass_fds=wfds,
+                **(sp_kwargs or {}),
+            )
+        except:
+            for reader in self._readers:
+                reader.stdout.close()
+            raise
+        finally:
+            # FFmpeg owns the write ends now
+            for wfd in wfds:
+                os.close(wfd)
+
+        # the sample size is not known until FFmpeg logs the output format; start
+        # reading the pipes right away (in bytes) so FFmpeg never blocks on them
+        for reader in self._readers:
+            reader.itemsize = 1
+            reader.nmin = 2**16
+            reader.start()
+
+        # set the log source and start the logger
+        self._logger.stderr = self._proc.stderr
+        self._logger.start()
+
+        hook = plugins.get_hook()
+        self._converters = {"v": hook.bytes_to_video, "a": hook.bytes_to_audio}
+        self._nread = [0] * len(self._streams)  # number of samples read
+
+    def _get_info(self, i, timeout=None):
+        # get the format of the i-th stream from the FFmpeg log
+        info = self._streams[i]
+        if "dtype" in info:
+            return info
+
+        try:
+            log = self._logger.output_stream(i, 0, timeout=timeout)
+        except TimeoutError as e:
+            raise e
+        except Exception:
+            e = self._logger.Exception if self._proc.poll() else None
+            raise e or ValueError("failed to retrieve output data format")
+
+        if info["type"] == "v":
+            info["frame_rate"] = log["r"]
+            info["dtype"], info["shape"] = utils.get_video_format(
+                log["pix_fmt"], log["s"]
+            )
+        else:
+            info["sample_rate"] = log["ar"]
+            info["dtype"], info["shape"] = utils.get_audio_format(
+                log["sample_fmt"], log["ac"]
+            )
+        self._readers[i].itemsize = utils.get_samplesize(info["shape"], info["dtype"])
+        return info
+
+    def _find(self, spec):
+        # index of the stream
+        try:
+            return next(i for i, v in enumerate(self._streams) if v["spec"] == spec)
+        except StopIteration:
+            raise ValueError(f"{spec} is not a valid stream specifier")
+
+    def specs(self):
+        """:list(str): list of specifiers of the streams"""
+        return [v["spec"] for v in self._streams]
+
+    def types(self):
+        """:dict(str:str): media type associated with the streams (key)"""
+        ts = {"v": "video", "a": "audio"}
+        return {v["spec"]: ts[v["type"]] for v in self._streams}
+
+    def rates(self):
+        """:dict(str:int|Fraction): sample or frame rates associated with the streams (key)"""
+        return {
+            v["spec"]: v["frame_rate"] if v["type"] == "v" else v["sample_rate"]
+            for v in (self._get_info(i) for i in range(len(self._streams)))
+        }
+
+    def dtypes(self):
+        """:dict(str:str): frame/sample data type associated with the streams (key)"""
+        return {
+            v["spec"]: v["dtype"]
+            for v in (self._get_info(i) for i in range(len(self._streams)))
+        }
+
+    def shapes(self):
+        """:dict(str:tuple(int)): frame/sample shape associated with the streams (key)"""
+        return {
+            v["spec"]: v["shape"]
+            for v in (self._get_info(i) for i in range(len(self._streams)))
+        }
+
+    def get_stream_info(self, spec):
+        return self._get_info(self._find(spec))
+
+    def _convert(self, i, b):
+        info = self._streams[i]
+        self._nread[i] += len(b) // self._readers[i].itemsize
+        return self._converters[info["type"]](
+            b=b, dtype=info["dtype"], shape=info["shape"], squeeze=False
+        )
+
+    def read_stream(self, spec, n=-1, timeout=None):
+        """read data from one stream
+
+        :param spec: stream specifier
+        :type spec: str
+        :param n: number of samples, if negative, read all currently available
+                  samples (waits for at least one), and if zero, read all available
+                  samples without waiting, defaults to -1
+        :type n: int, optional
+        :param timeout: timeout in seconds, defaults to None (waits indefinitely)
+        :type timeout: float, optional
+        :return: data object created by `bytes_to_video` or `bytes_to_audio`
+                 plugin hook
+        :rtype: object
+        """
+        i = self._find(spec)
+        self._get_info(i, timeout)
+        return self._convert(i, self._readers[i].read(n, timeout))
+
+    def read(self, n=-1, ref_stream=None, timeout=None):
+        """read data from all streams
+
+        :param n: number of samples of the reference stream, if non-positive,
+                  read all the samples currently available in every stream
+                  (without waiting), defaults to -1
+        :type n: int, optional
+        :param ref_stream: stream specifier to count the samples,
+                           defaults to None (first stream)
+        :type ref_stream: str, optional
+        :param timeout: timeout in seconds for each stream, defaults to None
+                        (waits indefinitely)
+        :type timeout: float, optional
+        :return: dict of data object keyed by stream specifier string, each data object is
+                 created by `bytes_to_video` or `bytes_to_audio` plugin hook
+        :rtype: dict(spec:str, object)
+        """
+
+        return self._convert_all(*self._read(n, ref_stream, timeout))
+
+    def _read(self, n, ref_stream, timeout):
+        # read bytes of all streams
+        infos = [self._get_info(i, timeout) for i in range(len(self._streams))]
+        if n <= 0:
+            data = [reader.read(0) for reader in self._readers]
+        else:
+            # identify how many samples are needed for each stream
+            iref = 0 if ref_stream is None else self._find(ref_stream)
+            rates = [v["frame_rate"] if v["type"] == "v" else v["sample_rate"] for v in infos]
+            tref = (self._nread[iref] + n) / rates[iref]
+            data = [
+                reader.read(
+                    n if i == iref else ceil(tref * rates[i]) - self._nread[i], timeout
+                )
+                for i, reader in enumerate(self._readers)
+            ]
+        return infos, data
+
+    def _convert_all(self, infos, data):
+        return {v["spec"]: self._convert(i, b) for i, (v, b) in enumerate(zip(infos, data))}
+
+    def readall(self, timeout=None):
+        """read the remaining data of all streams until FFmpeg finishes
+
+        :param timeout: timeout in seconds for each stream, defaults to None
+                        (waits indefinitely)
+        :type timeout: float, optional
+        :return: dict of data object keyed by stream specifier string
+        :rtype: dict(spec:str, object)
+        """
+
+        infos = [self._get_info(i, timeout) for i in range(len(self._streams))]
+        data = {
+            v["spec"]: self._convert(i, self._readers[i].read_all(timeout))
+            for i, v in enumerate(infos)
+        }
+        if timeout is None:
+            self._proc.wait()  # all pipes closed, FFmpeg is exiting
+        return data
+
+    def close(self):
+        """Flush and close this stream. This method has no effect if the stream is already
+            closed. Once the stream is closed, any read operation on the stream will raise
+            a ValueError.
+
+        As a convenience, it is allowed to call this method more than once; only the first call,
+        however, will have an effect.
+
+        """
+        try:
+            self._proc.terminate()
+        except:
+            pass
+        self._proc.wait()
+        for reader in self._readers:
+            reader.join()  # pipes reached EOF as FFmpeg terminated
+            reader.stdout.close()
+        self._proc.stderr.close()
+        self._logger.join()
+
+    @property
+    def closed(self):
+        """:bool: True if the FFmpeg has been terminated."""
+        return self._proc.poll() is not None
+
+    @property
+    def lasterror(self):
+        """:FFmpegError: Last error FFmpeg posted"""
+        if self._proc.poll():
+            return self._logger.Exception
+        else:
+            return None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        infos, data = self._read(self.blocksize, self.ref_stream, None)
+        if not any(data):  # all streams ended
+            raise StopIteration
+        return self._convert_all(infos, data)
+
+    def readlog(self, n=None):
+        if n is not None:
+            self._logger.index(n)
+        with self._logger._newline_mutex:
+            return "\n".join(self._logger.logs or self._logger.logs[:n])
+
+
+def _map_spec(spec):
+    # normalize map entry to a str
+    if isinstance(spec, str):
+        return spec
+    try:
+        file, sspec = spec
+    except:
+        raise ValueError(f"invalid map entry: {spec}")
+    return f"{file}:{sspec}"
+
+
+def _default_map(urls):
+    # first video and first audio streams found in the inputs
+    map = {}
+    for i, url in enumerate(urls):
+        try:
+            streams = probe.streams_basic(url, entries=("codec_type",))
+        except Exception:
+            raise ValueError(
+                f"Failed to probe {url}. Specify the output streams with map argument."
+            )
+        for st in streams:
+            type = st["codec_type"][0]
+            if type in "va" and type not in map:
+                map[type] = f"{i}:{type}:0"
+    if not map:
+        raise ValueError("No video or audio stream found in the inputs.")
+    return [map[t] for t in "va" if t in map]
+
+
+def _media_type(spec, urls, gopts):
+    # resolve the media type ("v" or "a") of an output stream
+
+    if spec.startswith("[") and spec.endswith("]"):
+        # filtergraph output label
+        expr = gopts.get("filter_complex", None) or gopts.get("lavfi", None)
+        if expr is None:
+            raise ValueError(f"{spec} is given but filter_complex is not specified.")
+        fg = Graph(expr)
+        (cid, fid, pid), _ = fg.get_output_pad(spec[1:-1])
+        type = fg[cid][fid].get_pad_media_type("output", pid)
+        if type not in ("video", "audio"):
+            raise ValueError(f"cannot resolve the media type of {spec}.")
+        return type[0]
+
+    try:
+        sspec = utils.parse_stream_spec(spec, True)
+    except ValueError:  # no file index
+        sspec = utils.parse_stream_spec(spec)
+    type = sspec.get("type", None)
+    if type is not None:
+        if type.lower() not in "va":
+            raise ValueError(f"{spec}: only video and audio streams are supported.")
+        return type.lower()
+
+    # probe the input to get the media type of the stream
+    if "index" not in sspec or "file_index" not in sspec or len(sspec) != 2:
+        raise ValueError(
+            f"cannot resolve the media type of {spec}. Specify the media type (e.g., '0:v:0')."
+        )
+    streams = probe.streams_basic(urls[sspec["file_index"]], entries=("codec_type",))
+    type = streams[sspec["index"]]["codec_type"][0]
+    if type not in "va":
+        raise ValueError(f"{spec}: only video and audio streams are supported.")
+    return type
+
+
+def _output_options(options, info):
+    # output options of a piped stream
+
+    def applies(k):
+        name, _, sspec = k.partition(":")
+        if name in _video_options:
+            return info["type"] == "v"
+        if name in _audio_options:
+            return info["type"] == "a"
+        if name in _stream_options and sspec:
+            return sspec[0].lower() == info["type"]
+        return True
+
+    opts = {k: v for k, v in options.items() if applies(k)}
+    opts["map"] = info["map"]
+    if info["type"] == "v":
+        opts.setdefault("pix_fmt", "rgb24")
+        opts["f"] = "rawvideo"
+        opts["c:v"] = "rawvideo"
+    else:
+        codec, f = utils.get_audio_codec(opts.setdefault("sample_fmt", "s16"))
+        opts["f"] = f
+        opts["c:a"] = codec
+    return opts
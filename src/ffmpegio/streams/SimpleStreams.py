@@ -1,10 +1,38 @@
 from time import time
-import logging
+import ctypes, logging, os, re, weakref
 
 logger = logging.getLogger("ffmpegio")
 
-from .. import utils, configure, ffmpegprocess, probe, plugins
-from ..threading import LoggerThread, ReaderThread, WriterThread
+from .. import utils, configure, ffmpegprocess, path, probe, plugins
+from ..threading import LoggerThread, ReaderThread, WriterThread, BufferedWriterThread
+from ..threading import IOMuxLogger, IOMuxReader, IOMuxWriter
+from ..errors import FFmpegioError
+
+# frame logger line of the exact filter mode: [<name> @ 0x...] n: <frame #> ...
+_re_showinfo = re.compile(
+    r"\[\S*ffmpegio_(in|out)\S* @ \S+\]( n:\s*\d+(?:.*?\bnb_samples:(\d+))?)?"
+)
+
+# FFmpeg log levels
+# fmt:off
+_loglevels = {
+    "quiet": -8, "panic": 0, "fatal": 8, "error": 16, "warning": 24,
+    "info": 32, "verbose": 40, "debug": 48, "trace": 56,
+}
+# fmt:on
+
+
+def _info_loglevel(value):
+    # raise the log level value ([flags+]level) to info if set lower
+    if value is None:
+        return "info"
+    *flags, level = str(value).split("+")
+    try:
+        level = _loglevels[level] if level in _loglevels else int(level)
+    except ValueError:
+        return value  # only flags given, the level stays at the default (info)
+    return value if level >= 32 else "+".join([*flags, "info"])
+
 
 # fmt:off
 __all__ = [ "SimpleVideoReader", "SimpleAudioReader", "SimpleVideoWriter",
@@ -13,7 +41,20 @@ __all__ = [ "SimpleVideoReader", "SimpleAudioReader", "SimpleVideoWriter",
 
 
 class SimpleReaderBase:
-    """base class for SISO media read stream classes"""
+    """base class for SISO media read stream classes
+
+    If `pool_size` is specified, the iterator reads each block of `blocksize`
+    frames/samples with `readinto` into one of `pool_size` preallocated buffers,
+    which are reused in a round-robin fashion. A data block yielded by the
+    iterator is only valid until the consumer releases it: once `pool_size`
+    more blocks are read, its buffer is recycled if no object created from it
+    is alive (otherwise, a new buffer replaces it in the pool).
+
+    If `prefetch` is specified, a background :py:class:`threading.ReaderThread`
+    keeps reading the FFmpeg output into a buffer of up to `prefetch` blocks of
+    `blocksize` frames/samples so FFmpeg keeps decoding while the consumer
+    processes the previously read blocks. The reads are served from this buffer.
+    """
 
     def __init__(
         self,
@@ -24,6 +65,8 @@ class SimpleReaderBase:
         progress=None,
         blocksize=None,
         sp_kwargs=None,
+        pool_size=None,
+        prefetch=None,
         **options,
     ) -> None:
         self._converter = converter  # :Callable: f(b,dtype,shape) -> data_object
@@ -36,6 +79,10 @@ class SimpleReaderBase:
             None  #:int: number of bytes of each video frame or audio sample
         )
         self.blocksize = None  #:positive int: number of video frames or audio samples to read when used as an iterator
+        self._pool = None  #:list of bytearray: preallocated iterator buffers (None if not pooled)
+        self._pool_refs = None  #:list of weakref: exporters of the pooled buffers handed out
+        self._pool_index = 0  #:int: next pool buffer to use
+        self._reader = None  #:ReaderThread: background prefetcher (None if not prefetching)
 
         # get url/file stream
         input_options = utils.pop_extra_options(options, "_in")
@@ -87,6 +134,22 @@ class SimpleReaderBase:
         self.samplesize = utils.get_samplesize(self.shape, self.dtype)
 
         self.blocksize = blocksize or max(1024**2 // self.samplesize, 1)
+
+        if pool_size:
+            nbytes = self.blocksize * self.samplesize
+            self._pool = [bytearray(nbytes) for _ in range(pool_size)]
+            self._pool_refs = [None] * pool_size
+
+        if prefetch:
+            # start reading the output in the background
+            self._reader = ReaderThread(
+                self._proc.stdout,
+                self.blocksize,
+                bufsize=prefetch * self.blocksize * self.samplesize,
+            )
+            self._reader.itemsize = self.samplesize
+            self._reader.start()
+
         logger.debug("[reader main] completed init")
 
     def close(self):
@@ -102,6 +165,16 @@ class SimpleReaderBase:
         if self._proc is None:
             return
 
+        if self._reader is not None:
+            # discard the prefetched data and stop FFmpeg before closing stdout
+            # as the reader thread may be blocked reading it
+            self._reader.cool_down()
+            try:
+                self._proc.terminate()
+            except:
+                pass
+            self._reader.join()
+
         self._proc.stdout.close()
         self._proc.stderr.close()
 
@@ -144,11 +217,56 @@ class SimpleReaderBase:
         return self
 
     def __next__(self):
-        F = self.read(self.blocksize)
+        F = self.read(self.blocksize) if self._pool is None else self._read_pooled()
         if F is None:
             raise StopIteration
         return F
 
+    def _read_pooled(self):
+        # read the next block into the next buffer of the pool (iterator w/ pool_size)
+
+        i = self._pool_index
+        self._pool_index = (i + 1) % len(self._pool)
+
+        # recycle the buffer only if the data object previously handed out from
+        # it is no longer in use (i.e., its exporter has been garbage collected)
+        ref = self._pool_refs[i]
+        if ref is not None:
+            if ref() is not None:
+                logger.debug(f"[reader main] pool buffer {i} still in use, replacing")
+                self._pool[i] = bytearray(len(self._pool[i]))
+            self._pool_refs[i] = None
+
+        buf = self._pool[i]
+        nbytes = len(buf)
+        nread = 0
+        with memoryview(buf) as mv:
+            if self._reader is not None:
+                nread = self._reader.readinto(mv)
+            else:
+                while nread < nbytes:
+                    n = self._proc.stdout.readinto(mv[nread:])
+                    if not n:
+                        break
+                    nread += n
+        logger.debug(f"[reader main] read {nread} bytes into pool buffer {i}")
+
+        nread -= nread % self.samplesize
+        if not nread:
+            self._proc.stdout.close()
+            return None
+
+        # export the buffer via a per-read ctypes array, which is kept alive by
+        # every object created from the data
+        exporter = (ctypes.c_char * nread).from_buffer(buf)
+        self._pool_refs[i] = weakref.ref(exporter)
+        return self._converter(
+            b=memoryview(exporter).cast("B"),
+            shape=self.shape,
+            dtype=self.dtype,
+            squeeze=False,
+        )
+
     def readlog(self, n=None):
         if n is not None:
             self._logger.index(n)
@@ -170,10 +288,16 @@ class SimpleReaderBase:
         A BlockingIOError is raised if the underlying raw stream is in non
         blocking-mode, and has no data available at the moment."""
         logger.debug(f"[reader main] reading {n} samples")
-        b = self._proc.stdout.read(n * self.samplesize if n > 0 else n)
+        if self._reader is None:
+            b = self._proc.stdout.read(n * self.samplesize if n > 0 else n)
+        elif n is not None and n > 0:
+            b = self._reader.read(n)
+        else:
+            b = self._reader.read_all()
         logger.debug(f"[reader main] read {len(b)} bytes")
         if not len(b):
-            self._proc.stdout.close()
+            if self._reader is None:
+                self._proc.stdout.close()
             return None
         return self._converter(b=b, shape=self.shape, dtype=self.dtype, squeeze=False)
 
@@ -187,9 +311,10 @@ class SimpleReaderBase:
         A BlockingIOError is raised if the underlying raw stream is in non
         blocking-mode, and has no data available at the moment."""
 
-        return (
-            self._proc.stdout.readinto(self._memoryviewer(obj=array)) // self.samplesize
-        )
+        b = self._memoryviewer(obj=array)
+        if self._reader is not None:
+            return self._reader.readinto(b) // self.samplesize
+        return self._proc.stdout.readinto(b) // self.samplesize
 
 
 class SimpleVideoReader(SimpleReaderBase):
@@ -199,8 +324,18 @@ class SimpleVideoReader(SimpleReaderBase):
     multi_write = False
 
     def __init__(
-        self, url, show_log=None, progress=None, blocksize=1, sp_kwargs=None, **options
+        self,
+        url,
+        show_log=None,
+        progress=None,
+        blocksize=1,
+        sp_kwargs=None,
+        pool_size=None,
+        seek_index=None,
+        prefetch=None,
+        **options,
     ):
+        self._seek_index = seek_index  #: packet index option (see video.read)
         hook = plugins.get_hook()
         super().__init__(
             hook.bytes_to_video,
@@ -210,6 +345,8 @@ class SimpleVideoReader(SimpleReaderBase):
             progress,
             blocksize,
             sp_kwargs,
+            pool_size,
+            prefetch,
             **options,
         )
 
@@ -251,6 +388,9 @@ class SimpleVideoReader(SimpleReaderBase):
             ffmpeg_args, utils.alpha_change(pix_fmt_in, pix_fmt, -1)
         )
 
+        # seek to the keyframe using the packet index
+        configure.finalize_video_seek_opts(ffmpeg_args, self._seek_index)
+
     def _finalize_array(self, info):
         # finalize array setup from FFmpeg log
 
@@ -271,6 +411,8 @@ class SimpleAudioReader(SimpleReaderBase):
         progress=None,
         blocksize=None,
         sp_kwargs=None,
+        pool_size=None,
+        prefetch=None,
         **options,
     ):
         hook = plugins.get_hook()
@@ -282,6 +424,8 @@ class SimpleAudioReader(SimpleReaderBase):
             progress,
             blocksize,
             sp_kwargs,
+            pool_size,
+            prefetch,
             **options,
         )
 
@@ -329,6 +473,17 @@ class SimpleAudioReader(SimpleReaderBase):
 
 
 class SimpleWriterBase:
+    """base class for SISO media write stream classes
+
+    If `async_bufsize` is specified, :py:meth:`write` copies the data to a queue
+    of up to `async_bufsize` bytes and returns while a background
+    :py:class:`threading.BufferedWriterThread` sends the queued data (small
+    frames combined into larger writes) to FFmpeg. :py:meth:`flush` and
+    :py:meth:`close` wait until the queue is drained. An encoder error is
+    raised by the next :py:meth:`write`, :py:meth:`flush`, or :py:meth:`close`
+    call.
+    """
+
     def __init__(
         self,
         viewer,
@@ -340,10 +495,13 @@ class SimpleWriterBase:
         overwrite=None,
         extra_inputs=None,
         sp_kwargs=None,
+        async_bufsize=None,
         **options,
     ) -> None:
         self._proc = None
         self._viewer = viewer
+        self._async_bufsize = async_bufsize
+        self._writer = None  #:BufferedWriterThread: background writer (None if synchronous)
         self.dtype_in = dtype_in
         self.shape_in = shape_in
 
@@ -398,11 +556,24 @@ class SimpleWriterBase:
         self._logger.stderr = self._proc.stderr
         self._logger.start()
 
+        if self._async_bufsize:
+            # start the background writer
+            self._writer = BufferedWriterThread(self._proc.stdin, self._async_bufsize)
+            self._writer.start()
+
     def close(self):
         """close the output stream"""
         if self._proc is None:
             return
 
+        error = None
+        if self._writer is not None:
+            self._writer.join()  # drains the queue
+            try:
+                self._writer.flush()  # re-raises the error of a failed write
+            except (BrokenPipeError, OSError) as e:
+                error = e
+
         if self._proc.stdin and not self._proc.stdin.closed:
             try:
                 self._proc.stdin.close()  # flushes the buffer first before closing
@@ -416,6 +587,11 @@ class SimpleWriterBase:
                 pass
         self._logger.join()
 
+        if error is not None:
+            # the background encoding failed, raise FFmpeg's error if logged
+            self._logger.join_and_raise()
+            raise error
+
     @property
     def closed(self):
         """:bool: True if stream is closed"""
@@ -463,12 +639,22 @@ class SimpleWriterBase:
         logger.debug("[writer main] writing...")
 
         try:
-            self._proc.stdin.write(self._viewer(obj=data))
+            if self._writer is None:
+                self._proc.stdin.write(self._viewer(obj=data))
+            else:
+                self._writer.write(self._viewer(obj=data))
         except (BrokenPipeError, OSError):
             self._logger.join_and_raise()
 
     def flush(self):
-        self._proc.stdin.flush()
+        if self._writer is None:
+            self._proc.stdin.flush()
+            return
+
+        try:
+            self._writer.flush()
+        except (BrokenPipeError, OSError):
+            self._logger.join_and_raise()
 
 
 class SimpleVideoWriter(SimpleWriterBase):
@@ -488,6 +674,7 @@ class SimpleVideoWriter(SimpleWriterBase):
         overwrite=None,
         extra_inputs=None,
         sp_kwargs=None,
+        async_bufsize=None,
         **options,
     ):
         options["r_in"] = rate_in
@@ -504,6 +691,7 @@ class SimpleVideoWriter(SimpleWriterBase):
             overwrite,
             extra_inputs,
             sp_kwargs,
+            async_bufsize,
             **options,
         )
 
@@ -514,7 +702,7 @@ class SimpleVideoWriter(SimpleWriterBase):
         ready = "s" in inopts and "pix_fmt" in inopts
 
         if not (ready or (self.dtype_in is None or self.shape_in is None)):
-            s, pix_fmt = utils.guess_video_format((self.shape_in, self.dtype_in))
+            s, pix_fmt = utils.guess_video_format(self.shape_in, self.dtype_in)
             if "s" not in inopts:
                 inopts["s"] = s
             if "pix_fmt" not in inopts:
@@ -564,6 +752,7 @@ class SimpleAudioWriter(SimpleWriterBase):
         overwrite=None,
         extra_inputs=None,
         sp_kwargs=None,
+        async_bufsize=None,
         **options,
     ):
         options["ar_in"] = rate_in
@@ -580,6 +769,7 @@ class SimpleAudioWriter(SimpleWriterBase):
             overwrite,
             extra_inputs,
             sp_kwargs,
+            async_bufsize,
             **options,
         )
 
@@ -641,25 +831,45 @@ class SimpleFilterBase:
                     defaults to None (no show/capture)
 
     :type show_log: bool, optional
+    :param iomux: True to service the FFmpeg pipes by the shared I/O multiplexer
+                  thread (:py:class:`threading.IOMultiplexerThread`) instead of
+                  three dedicated threads, defaults to False (POSIX only)
+    :type iomux: bool, optional
+    :param exact: True to account the output by the frame/sample counts FFmpeg
+                  logs at both ends of the filtergraph so :py:meth:`filter`
+                  blocks, without any timeout, until FFmpeg consumes the input
+                  and then returns exactly the output it produced (the FFmpeg
+                  log level is raised to "info" if set lower), defaults to
+                  False
+    :type exact: bool, optional
     :param \\**options: FFmpeg options, append '_in' for input option names (see :doc:`options`)
     :type \\**options: dict, optional
 
     """
 
+    #:str: name of the FFmpeg filter to log the frames (set by subclass)
+    _showinfo = None
+    #:str: FFmpeg filtergraph option name (set by subclass)
+    _fg_opt = None
+
     # fmt:off
     def _set_options(self, options, shape, dtype, rate=None, expr=None): ...
     def _pre_open(self, ffmpeg_args): ...
     def _finalize_output(self, info): ...
+    def _exact_filters(self, outopts): ...
     # fmt:on
 
     def __init__(
         # fmt:off
         self, converter, data_viewer, info_viewer, expr, rate_in, shape_in=None, dtype_in=None, 
         rate=None, shape=None, dtype=None, block_size=None, defaulttimeout=None,
-        progress=None, show_log=None,         sp_kwargs=None,
-**options,
+        progress=None, show_log=None,         sp_kwargs=None, iomux=False,
+        exact=False, **options,
         # fmt:on
     ) -> None:
+        if iomux and os.name != "posix":
+            raise FFmpegioError("iomux option requires a POSIX system.")
+
         if not rate_in:
             if rate:
                 rate_in = rate
@@ -700,6 +910,13 @@ class SimpleFilterBase:
         # set this to false in _finalize() if guaranteed for the logger to have output stream info
         self._loggertimeout = True
 
+        # frame-accounted operation: numbers of samples logged at the input and
+        # output of the filtergraph and the number of samples per input packet
+        self._exact = exact
+        self._nconsumed = 0
+        self._nemitted = 0
+        self._pktsize = None
+
         self._proc = None
 
         ffmpeg_args = configure.empty()
@@ -729,14 +946,14 @@ class SimpleFilterBase:
         self.shape, self.dtype = self._set_options(outopts, shape, dtype, rate, expr)
 
         # create the stdin writer without assigning the sink stream
-        self._writer = WriterThread(None, 0)
+        self._writer = (IOMuxWriter if iomux else WriterThread)(None, 0)
 
         # create the stdout reader without assigning the source stream
-        self._reader = ReaderThread(None, block_size, 0)
+        self._reader = (IOMuxReader if iomux else ReaderThread)(None, block_size, 0)
         self._reader_needs_info = True
 
         # create logger without assigning the source stream
-        self._logger = LoggerThread(None, show_log)
+        self._logger = (IOMuxLogger if iomux else LoggerThread)(None, show_log)
 
         # FFmpeg Popen arguments
         self._cfg = {**sp_kwargs} if sp_kwargs else {}
@@ -763,12 +980,18 @@ class SimpleFilterBase:
 
         # final argument tweak before opening the ffmpeg
         self._pre_open(ffmpeg_args)
+        if self._exact:
+            self._set_exact_options(ffmpeg_args)
+
+        self._bps_in = utils.get_samplesize(self.shape_in, self.dtype_in)
 
         # start FFmpeg
         self._proc = ffmpegprocess.Popen(**self._cfg)
 
         # set the log source and start the logger
         self._logger.stderr = self._proc.stderr
+        if self._exact:
+            self._logger.on_line = self._count_samples
         self._logger.start()
 
         # start the writer
@@ -797,9 +1020,63 @@ class SimpleFilterBase:
         self._finalize_output(info)
         self._reader_needs_info = False
 
+    def _set_exact_options(self, ffmpeg_args):
+        inopts = ffmpeg_args["inputs"][0][1]
+        outopts = ffmpeg_args["outputs"][0][1]
+
+        # start filtering with the first input packet (no probing) and write
+        # each output packet to the pipe immediately
+        inopts["probesize"] = 32
+        inopts["analyzeduration"] = 0
+        outopts["flush_packets"] = 1
+
+        # the frame loggers require the info log level
+        gopts = ffmpeg_args["global_options"]
+        if gopts is None:
+            gopts = ffmpeg_args["global_options"] = {}
+        level = None
+        for opts in (inopts, outopts, gopts):
+            for name in ("loglevel", "v"):
+                if name in opts:
+                    level = opts.pop(name)
+        gopts["loglevel"] = _info_loglevel(level)
+
+        # sandwich the filtergraph (incl. the output format conversion) between
+        # a pair of frame loggers
+        expr = outopts.get(self._fg_opt, None)
+        outopts[self._fg_opt] = ",".join(
+            [
+                f"{self._showinfo}@ffmpegio_in",
+                *([str(expr)] if expr else []),
+                *self._exact_filters(outopts),
+                f"{self._showinfo}@ffmpegio_out",
+            ]
+        )
+
+    def _count_samples(self, log):
+        # logger hook (runs on the logger thread): count the frames/samples
+        # logged by the frame loggers and keep their lines out of the logs
+        m = _re_showinfo.search(log)
+        if not m:
+            return False
+        if not m[2]:
+            return True  # additional frame info line
+        n = int(m[3]) if m[3] else 1
+        if m[1] == "in":
+            self._nconsumed += n
+            if self._pktsize is None:
+                self._pktsize = n
+        else:
+            self._nemitted += n
+        return True
+
+    def _pending_input(self):
+        # number of input samples FFmpeg cannot consume until more data arrives
+        # (audio input is demuxed in fixed-size packets)
+        return 0
+
     def _start_reader(self):
         self._bps_out = utils.get_samplesize(self.shape, self.dtype)
-        self._bps_in = utils.get_samplesize(self.shape_in, self.dtype_in)
         self._out2in = self.rate / self.rate_in
 
         # start the FFmpeg output reader
@@ -920,8 +1197,19 @@ class SimpleFilterBase:
           each use case (`blocksize` property, I/O rate ratio, typical size of
           `data` argument, etc.).
 
+        .. note::
+          If the stream is created with `exact=True`, the operation is not
+          timed (`timeout` is ignored). This method blocks until FFmpeg
+          consumes `data` and returns exactly the output samples FFmpeg has
+          produced so far (those of the last input frame may be returned by
+          the next call). It returns None if FFmpeg has not produced any
+          output yet and the output format is not known in advance.
+
         """
 
+        if self._exact:
+            return self._filter_exact(data)
+
         timeout = timeout or self.defaulttimeout
 
         timeout += time()
@@ -950,6 +1238,57 @@ class SimpleFilterBase:
         self.nout += len(y) // self._bps_out
         return self._converter(b=y, dtype=self.dtype, shape=self.shape, squeeze=False)
 
+    def _filter_exact(self, data):
+        if self._cfg:
+            self._open(data)
+
+        inbytes = self._memoryviewer(obj=data)
+        self._writer.write(inbytes)
+        self.nin += len(inbytes) // self._bps_in
+
+        # wait till FFmpeg consumes all the input it can
+        consumed = lambda: self._nconsumed >= self.nin - self._pending_input()
+        self._wait_exact(consumed)
+        if not consumed():
+            # FFmpeg quit prematurely
+            raise self._logger.Exception or BrokenPipeError("FFmpeg terminated")
+
+        if self._reader_needs_info:
+            return None
+
+        y = self._reader.read(self._nemitted - self.nout)
+        self.nout += len(y) // self._bps_out
+        return self._converter(b=y, dtype=self.dtype, shape=self.shape, squeeze=False)
+
+    def _wait_exact(self, predicate):
+        # wait on the log lines till predicate() is met or FFmpeg ends. The
+        # reader is started as soon as the first output frame is logged as
+        # FFmpeg could otherwise be blocked by the full stdout pipe
+        logger = self._logger
+        proc = self._proc
+        newframe = lambda: self._reader_needs_info and self._nemitted
+        ended = lambda: logger.stderr is None or proc.poll() is not None
+        while True:
+            with logger.newline:
+                # poll the process periodically in case no more log line arrives
+                logger.newline.wait_for(
+                    lambda: predicate() or ended() or newframe(), 0.1
+                )
+                done = predicate() or ended()
+            if newframe():
+                # the output stream info is logged before the first frame is written
+                self._get_output_info(None)
+                self._start_reader()
+            if done:
+                if not predicate():
+                    # FFmpeg exited: let the logger process the remaining lines
+                    # (stderr is closed by the reaper)
+                    logger.join()
+                    if newframe():
+                        self._get_output_info(None)
+                        self._start_reader()
+                return
+
     def flush(self, timeout=None):
         """Close the stream input and retrieve the remaining output samples
 
@@ -959,11 +1298,25 @@ class SimpleFilterBase:
         :rtype: numpy.ndarray
         """
 
+        if self._exact:
+            # close stdin and read till FFmpeg ends
+            self._writer.join()
+            self._wait_exact(lambda: False)
+            if self._reader_needs_info:
+                self._proc.wait()
+                return None
+            y = self._reader.read_all()
+            self._proc.wait()
+            self.nout += len(y) // self._bps_out
+            return self._converter(
+                b=y, dtype=self.dtype, shape=self.shape, squeeze=False
+            )
+
         timeout = timeout or self.defaulttimeout
 
         # If no input, close stdin and read all remaining frames
         y = self._reader.read_all(timeout)
-        self._proc.stdin.close()
+        self._writer.join()
         self._proc.wait()
         y += self._reader.read_all(None)
         self.nout += len(y) // self._bps_out
@@ -1000,6 +1353,14 @@ class SimpleVideoFilter(SimpleFilterBase):
     :param show_log: True to show FFmpeg log messages on the console,
                     defaults to None (no show/capture)
     :type show_log: bool, optional
+    :param iomux: True to service the FFmpeg pipes by the shared I/O multiplexer
+                  thread instead of three dedicated threads, defaults to False
+                  (POSIX only)
+    :type iomux: bool, optional
+    :param exact: True to account the output by the frame counts FFmpeg logs
+                  at both ends of the filtergraph (no timeouts, see
+                  :py:meth:`filter`), defaults to False
+    :type exact: bool, optional
     :param \\**options: FFmpeg options, append '_in' for input option names (see :doc:`options`)
     :type \\**options: dict, optional
 
@@ -1010,11 +1371,14 @@ class SimpleVideoFilter(SimpleFilterBase):
     multi_read = False
     multi_write = False
 
+    _showinfo = "showinfo"
+    _fg_opt = "vf"
+
     def __init__(
         # fmt:off
         self, expr, rate_in, shape_in=None, dtype_in=None, rate=None, shape=None, dtype=None,
         block_size=None, defaulttimeout=None, progress=None, show_log=None,         sp_kwargs=None,
-**options,
+        iomux=False, exact=False, **options,
         # fmt:on
     ) -> None:
         hook = plugins.get_hook()
@@ -1022,7 +1386,8 @@ class SimpleVideoFilter(SimpleFilterBase):
         super().__init__(
             hook.bytes_to_video, hook.video_bytes, hook.video_info,
             expr, rate_in, shape_in, dtype_in, rate, shape, dtype,
-            block_size, defaulttimeout, progress, show_log, sp_kwargs,**options,
+            block_size, defaulttimeout, progress, show_log, sp_kwargs, iomux, exact,
+            **options,
         )
         # fmt:on
         self._loggertimeout = False
@@ -1057,6 +1422,14 @@ class SimpleVideoFilter(SimpleFilterBase):
 
         return shape, dtype
 
+    def _exact_filters(self, outopts):
+        # convert the frame rate in the filtergraph and output the frames as is
+        outopts[
+            "fps_mode" if path.check_version("5.1") else "vsync"
+        ] = "passthrough"
+        r = outopts.pop("r", None)
+        return [f"fps={r}"] if r else []
+
     def _finalize_output(self, info):
         # finalize array setup from FFmpeg log
         self.rate = info["r"]
@@ -1098,6 +1471,14 @@ class SimpleAudioFilter(SimpleFilterBase):
     :param show_log: True to show FFmpeg log messages on the console,
                     defaults to None (no show/capture)
     :type show_log: bool, optional
+    :param iomux: True to service the FFmpeg pipes by the shared I/O multiplexer
+                  thread instead of three dedicated threads, defaults to False
+                  (POSIX only)
+    :type iomux: bool, optional
+    :param exact: True to account the output by the sample counts FFmpeg logs
+                  at both ends of the filtergraph (no timeouts, see
+                  :py:meth:`filter`), defaults to False
+    :type exact: bool, optional
     :param \\**options: FFmpeg options, append '_in' for input option names (see :doc:`options`)
     :type \\**options: dict, optional
 
@@ -1111,6 +1492,9 @@ class SimpleAudioFilter(SimpleFilterBase):
     multi_read = False
     multi_write = False
 
+    _showinfo = "ashowinfo"
+    _fg_opt = "af"
+
     def __init__(
         self,
         expr,
@@ -1125,13 +1509,16 @@ class SimpleAudioFilter(SimpleFilterBase):
         progress=None,
         show_log=None,
         sp_kwargs=None,
+        iomux=False,
+        exact=False,
         **options,
     ) -> None:
         hook = plugins.get_hook()
         # fmt: off
         super().__init__(hook.bytes_to_audio, hook.audio_bytes, hook.audio_info,
             expr, rate_in, shape_in, dtype_in, rate, shape, dtype, 
-            block_size, defaulttimeout, progress, show_log, sp_kwargs,**options)
+            block_size, defaulttimeout, progress, show_log, sp_kwargs, iomux, exact,
+            **options)
         # fmt: on
 
     def _pre_open(self, ffmpeg_args):
@@ -1166,6 +1553,30 @@ class SimpleAudioFilter(SimpleFilterBase):
 
         return shape, dtype
 
+    def _exact_filters(self, outopts):
+        # convert the sample format in the filtergraph (resampling is not 1:1)
+        ac = outopts.get("ac", None)
+        fmts = {
+            "sample_fmts": outopts.get("sample_fmt", None),
+            "sample_rates": outopts.get("ar", None),
+            "channel_layouts": ac and f"{ac}c",
+        }
+        fmts = ":".join(f"{k}={v}" for k, v in fmts.items() if v)
+        return [f"aformat={fmts}"] if fmts else []
+
+    def _pending_input(self):
+        # PCM demuxer reads packets of the (largest power of 2) number of
+        # samples per 100 ms (4096 bytes before FFmpeg 5.0) until the size of
+        # the first packet is known
+        n = self._pktsize
+        if n is None:
+            rate = int(self.rate_in)
+            n = max(
+                1 << (max(rate // 10, 1).bit_length() - 1),
+                4096 // self._bps_in or 1,
+            )
+        return self.nin % n
+
     def _finalize_output(self, info):
         # finalize array setup from FFmpeg log
         self.rate = info["ar"]
@@ -7,6 +7,15 @@ from .SimpleStreams import (
     SimpleAudioFilter,
 )
 from .AviStreams import AviMediaReader
+from .PipedStreams import PipedMediaReader
+from .AsyncStreams import (
+    AsyncVideoReader,
+    AsyncVideoWriter,
+    AsyncAudioReader,
+    AsyncAudioWriter,
+    AsyncVideoFilter,
+    AsyncAudioFilter,
+)
 
 # TODO multi-stream write
 # TODO Buffered reverse video read
@@ -14,5 +23,6 @@ from .AviStreams import AviMediaReader
 # fmt: off
 __all__ = ["SimpleVideoReader", "SimpleVideoWriter", "SimpleAudioReader",
     "SimpleAudioWriter", "SimpleVideoFilter", "SimpleAudioFilter",
-    "AviMediaReader"]
+    "AviMediaReader", "PipedMediaReader", "AsyncVideoReader", "AsyncVideoWriter",
+    "AsyncAudioReader", "AsyncAudioWriter", "AsyncVideoFilter", "AsyncAudioFilter"]
 # fmt: on
@@ -3,8 +3,9 @@
 
 from __future__ import annotations
 from copy import deepcopy
-import re, os
-from threading import Thread, Condition, Lock, Event
+import re, os, codecs, selectors, socket
+from threading import Thread, Condition, Lock, Event, current_thread
+from collections import deque
 from io import TextIOBase, TextIOWrapper
 from time import sleep, time
 from tempfile import TemporaryDirectory
@@ -20,7 +21,9 @@ from .errors import FFmpegError
 
 # fmt:off
 __all__ = ['AviReader', 'FFmpegError', 'ThreadNotActive', 'ProgressMonitorThread',
- 'LoggerThread', 'ReaderThread', 'WriterThread', 'AviReaderThread', 'Empty', 'Full']
+ 'ProcessReaperThread', 'LoggerThread', 'ReaderThread', 'WriterThread', 'BufferedWriterThread',
+ 'AviReaderThread',
+ 'IOMultiplexerThread', 'IOMuxLogger', 'IOMuxReader', 'IOMuxWriter', 'IOMuxAviReader', 'Empty', 'Full']
 # fmt:on
 
 
@@ -134,6 +137,136 @@ class ProgressMonitorThread(Thread):
         logger.debug("[progress_monitor] terminated")
 
 
+class ProcessReaperThread(Thread):
+    """a daemon thread to wait for the termination of subprocesses
+
+    :param timeout: polling interval in seconds for the subprocesses that cannot
+                    be watched via pidfd, defaults to 10e-3
+    :type timeout: float, optional
+
+    A single thread watches all the registered subprocesses and runs their
+    callbacks once they terminate, so the number of threads does not grow with
+    the number of subprocesses. On Linux (kernel 5.3+), each subprocess is
+    watched by its pidfd in a selector, and the thread sleeps until one of
+    them exits. On the other platforms, the subprocesses are polled.
+
+    The callbacks run on a separate callback thread, one process at a time, so
+    a slow callback delays the other callbacks but not the reaping. An
+    exception raised by a callback is logged, and the event returned by
+    :py:meth:`register` is set regardless.
+    """
+
+    def __init__(self, timeout=10e-3):
+        super().__init__(name="ffmpegio-reaper", daemon=True)
+        self.timeout = timeout
+        self._selector = selectors.DefaultSelector()
+        self._wakeup_r, self._wakeup_w = socket.socketpair()
+        self._wakeup_r.setblocking(False)
+        self._selector.register(self._wakeup_r, selectors.EVENT_READ)
+        self._lock = Lock()
+        self._pending = []  # (pidfd, entry) to be added by the reaper thread
+        self._polled = []  # entries of subprocesses without pidfd
+        self._callbacks = Queue()  # (returncode, on_exit, done) to be run
+        self._worker = Thread(
+            target=self._run_callbacks, name="ffmpegio-reaper-callbacks", daemon=True
+        )
+
+    def register(self, proc, on_exit=None):
+        """watch a subprocess
+
+        :param proc: subprocess to be watched
+        :type proc: subprocess.Popen
+        :param on_exit: callback function(s) to be called after the process is
+                        terminated, defaults to None
+
+                            on_exit(returncode)
+
+        :type on_exit: Callable or seq(Callable), optional
+        :return: event, which is set after all the callbacks are executed
+        :rtype: threading.Event
+        """
+        if on_exit is None:
+            on_exit = []
+        elif callable(on_exit):
+            on_exit = [on_exit]
+
+        done = Event()
+        pidfd = None
+        if hasattr(os, "pidfd_open"):
+            try:
+                pidfd = os.pidfd_open(proc.pid)
+            except OSError:
+                # kernel without pidfd support or already reaped process
+                pass
+
+        with self._lock:
+            self._pending.append((pidfd, (proc, [*on_exit], done)))
+            if self.ident is None:
+                self._worker.start()
+                self.start()
+        self._wakeup_w.send(b"\0")
+        return done
+
+    def in_callback(self):
+        """True if called from the reaper or its callback thread
+
+        :rtype: bool
+        """
+        return current_thread() in (self, self._worker)
+
+    def run(self):
+        while True:
+            exited = []
+            for key, _ in self._selector.select(self.timeout if self._polled else None):
+                if key.fileobj is self._wakeup_r:
+                    try:
+                        while self._wakeup_r.recv(4096):
+                            pass
+                    except BlockingIOError:
+                        pass
+                else:
+                    self._selector.unregister(key.fileobj)
+                    os.close(key.fileobj)
+                    exited.append(key.data)
+
+            with self._lock:
+                pending, self._pending = self._pending, []
+            for pidfd, entry in pending:
+                if pidfd is None:
+                    self._polled.append(entry)
+                else:
+                    self._selector.register(pidfd, selectors.EVENT_READ, entry)
+
+            if self._polled:
+                polled = self._polled
+                self._polled = [e for e in polled if e[0].poll() is None]
+                exited.extend(e for e in polled if e[0].returncode is not None)
+
+            for proc, on_exit, done in exited:
+                # reap the process (if not already) & hand off the callbacks
+                try:
+                    returncode = proc.wait()
+                    logger.debug(f"[reaper] process {proc.pid} terminated")
+                except Exception as e:
+                    returncode = proc.returncode
+                    logger.critical(
+                        f"[reaper] failed to reap process {proc.pid}:\n\n{e}"
+                    )
+                self._callbacks.put((returncode, on_exit, done))
+
+    def _run_callbacks(self):
+        while True:
+            returncode, on_exit, done = self._callbacks.get()
+            try:
+                for fcn in on_exit:
+                    try:
+                        fcn(returncode)
+                    except Exception as e:
+                        logger.critical(f"[reaper] on_exit callback error:\n\n{e}")
+            finally:
+                done.set()
+
+
 class LoggerThread(Thread):
     def __init__(self, stderr, echo=False) -> None:
         self.stderr = stderr
@@ -141,6 +274,10 @@ class LoggerThread(Thread):
         self._newline_mutex = Lock()
         self.newline = Condition(self._newline_mutex)
         self.echo = echo
+        #:Callable[[str],bool]|None: called with each new log line while
+        #::py:attr:`newline` is locked; the line is not kept in :py:attr:`logs`
+        #:if it returns True (waiters on :py:attr:`newline` are notified regardless)
+        self.on_line = None
         super().__init__()
 
     def __enter__(self):
@@ -180,7 +317,8 @@ class LoggerThread(Thread):
                 print(log)
 
             with self.newline:
-                self.logs.append(log)
+                if self.on_line is None or not self.on_line(log):
+                    self.logs.append(log)
                 self.newline.notify_all()
 
         with self.newline:
@@ -248,7 +386,7 @@ class LoggerThread(Thread):
             raise ValueError("Specified output stream not found")
 
         with self._newline_mutex:
-            return _extract_output_stream(self.logs, hint=i)
+            return _extract_output_stream(self.logs, file_id, stream_id, hint=i)
 
     def join_and_raise(self, timeout: float | None = None):
         """wait till thread terminates and raise exception based on the log
@@ -272,13 +410,38 @@ class LoggerThread(Thread):
 
 
 class ReaderThread(Thread):
-    def __init__(self, stdout, nmin=None, queuesize=None):
+    """a thread to read byte data from a readable stream into a ring buffer
+
+    :param stdout: stream to read data from
+    :type stdout: readable stream
+    :param nmin: expected minimum number of read()'s n arg (not enforced), defaults to None
+    :type nmin: int, optional
+    :param queuesize: (legacy) buffer capacity in the number of read blocks,
+                      ignored if bufsize is given, defaults to None (unbounded)
+    :type queuesize: int, optional
+    :param bufsize: buffer capacity in bytes, defaults to None (unbounded)
+    :type bufsize: int, optional
+
+    The data are read directly into a preallocated ``bytearray`` with
+    ``readinto()``, and each call of :py:meth:`read` copies the requested bytes
+    out of the buffer only once. :py:meth:`readinto` copies the data straight
+    into a user-provided buffer (e.g., a NumPy array). If the buffer is bounded,
+    the thread stops reading the stream (thus applies backpressure to FFmpeg)
+    while the buffer is full; otherwise, the buffer grows as needed.
+    """
+
+    def __init__(self, stdout, nmin=None, queuesize=None, bufsize=None):
         super().__init__()
         self.stdout = stdout  #:readable stream: data source
         self.nmin = nmin  #:positive int: expected minimum number of read()'s n arg (not enforced)
         self.itemsize = None  #:int: number of bytes per time sample
-        self._queue = Queue(queuesize or 0)  # inter-thread data I/O
-        self._carryover = None  # extra data that was not previously read by user
+        self.bufsize = bufsize  #:int|None: buffer capacity in bytes (None if unbounded)
+        self._queuesize = queuesize
+        self._buf = bytearray(0)  # ring buffer
+        self._head = 0  # position of the first unread byte
+        self._size = 0  # number of unread bytes in the buffer
+        self._cv = Condition()  # guards _buf, _head, _size, and _eof
+        self._eof = False  # True once the thread stopped reading
         self._collect = True
 
     def start(self):
@@ -287,27 +450,41 @@ class ReaderThread(Thread):
                 "Thread object's must have its itemsize property set with the expected sample/frame size in bytes"
             )
 
+        self._alloc()
         super().start()
 
+    def _alloc(self):
+        # allocate the ring buffer
+        if self.bufsize is None and self._queuesize:
+            self.bufsize = self._queuesize * self._blocksize()
+
+        nbuf = self.bufsize or 4 * self._blocksize()
+        self._buf = bytearray(max(nbuf, self.itemsize))
+
+    def _blocksize(self):
+        return (
+            self.nmin if self.nmin is not None else 1 if self.itemsize > 1024 else 1024
+        ) * self.itemsize
+
     def cool_down(self):
-        # stop enqueue read samples
-        self._collect = False
-        try:
-            self._queue.get_nowait()
-        except:
-            pass
+        # stop collecting read samples and discard the buffered data
+        with self._cv:
+            self._collect = False
+            self._discard()
 
     def join(self, timeout=None):
-        if self._queue.full():
-            if timeout:
-                self._queue.not_full.wait(timeout)
-                if self._queue.full():
-                    return
-            else:
-                with self._queue.mutex:
-                    self._queue.queue.clear()
+        with self._cv:
+            if self.bufsize and self._size >= len(self._buf):
+                # buffer is full, thread is blocked
+                if timeout:
+                    self._cv.wait_for(
+                        lambda: self._size < len(self._buf) or self._eof, timeout
+                    )
+                    if self._size >= len(self._buf) and not self._eof:
+                        return
+                else:
+                    self._discard()
 
-        # if queue is full,
         super().join(timeout)
 
     def __enter__(self):
@@ -320,30 +497,139 @@ class ReaderThread(Thread):
         return self
 
     def run(self):
-        blocksize = (
-            self.nmin if self.nmin is not None else 1 if self.itemsize > 1024 else 1024
-        ) * self.itemsize
-        while True:
-            try:
-                data = self.stdout.read(blocksize)
-            except:
-                # stdout stream closed/FFmpeg terminated, end the thread as well
-                break
-            # print(f"reader thread: read {len(data)} bytes")
-            if not data:
-                if self.stdout.closed:  # just in case
+        stdout = self.stdout
+        # read whatever available (up to blocksize) to minimize latency
+        readinto = getattr(stdout, "readinto1", None) or stdout.readinto
+        blocksize = self._blocksize()
+        cv = self._cv
+
+        try:
+            while True:
+                with cv:
+                    if self.bufsize and self._size >= len(self._buf):
+                        # wait till the consumer frees up space
+                        cv.wait_for(lambda: self._size < len(self._buf))
+                    view = self._free_view(blocksize)
+
+                # the free space is only touched by this thread, no lock needed
+                try:
+                    nread = readinto(view)
+                except:
+                    # stdout stream closed/FFmpeg terminated, end the thread as well
                     break
-                else:
+                finally:
+                    view.release()
+
+                if not nread:
                     break
 
-            if self._collect:  # True until self.cooloff
-                self._queue.put(data)
-                # print(f"reader thread: queued samples")
+                with cv:
+                    if self._collect:  # True until self.cool_down
+                        self._size += nread
+                        cv.notify_all()
+        finally:
+            with cv:
+                self._eof = True
+                cv.notify_all()
+
+    def _free_view(self, blocksize):
+        # memoryview of the contiguous free space following the buffered data
+        # (must be called with the lock) or None if a bounded buffer is full
+        nbuf = len(self._buf)
+        if self._size >= nbuf:
+            if self.bufsize:
+                return None
+            self._grow(2 * nbuf)
+            nbuf = len(self._buf)
+
+        tail = (self._head + self._size) % nbuf
+        nfree = (nbuf if tail >= self._head else self._head) - tail
+        if self._size == 0:  # rewind to read into contiguous space
+            self._head = tail = 0
+            nfree = nbuf
+        return memoryview(self._buf)[tail : tail + min(nfree, blocksize)]
+
+    def _grow(self, nbuf):
+        # reallocate the buffer (must be called with the lock) with the
+        # buffered data placed at the beginning
+        buf = bytearray(nbuf)
+        nbytes = self._size
+        self._copy(memoryview(buf), nbytes)
+        self._buf = buf
+        self._head = 0
+        self._size = nbytes
+
+    def _copy(self, dst, nbytes):
+        # copy nbytes from the head of the ring buffer to dst and release them
+        # (must be called with the lock)
+        buf = memoryview(self._buf)
+        nbuf = len(buf)
+        i0 = self._head
+        n0 = min(nbytes, nbuf - i0)
+        dst[:n0] = buf[i0 : i0 + n0]
+        if n0 < nbytes:
+            # wrap around
+            dst[n0:nbytes] = buf[: nbytes - n0]
+        self._head = (i0 + nbytes) % nbuf
+        self._size -= nbytes
+
+    def _discard(self):
+        # drop all the buffered data (must be called with the lock)
+        self._head = (self._head + self._size) % len(self._buf)
+        self._size = 0
+        self._cv.notify_all()
+
+    def _readinto(self, view, n, timeout):
+        # copy up to n samples to view, draining the buffer as the data arrive
+        # so n may exceed the buffer capacity (must be called with the lock)
+        cv = self._cv
+        itemsize = self.itemsize
+        if timeout is not None:
+            timeout = time() + timeout
+        nbytes = n * itemsize
+        pos = 0
+        while pos < nbytes:
+            navail = min(self._size, nbytes - pos)
+            if not self._eof:  # only complete samples unless ended
+                navail -= navail % itemsize
+            if navail:
+                self._copy(view[pos:], navail)
+                pos += navail
+                cv.notify_all()  # wake the thread if it is waiting for space
+            elif self._eof:
+                break
+            else:
+                tout = None if timeout is None else timeout - time()
+                if (tout is not None and tout <= 0) or not cv.wait_for(
+                    lambda: self._size >= itemsize or self._eof, tout
+                ):
+                    break
+        return pos
+
+    def _read(self, n, timeout):
+        # read n samples into a new bytearray
+        with self._cv:
+            if n <= 0:
+                if n < 0 and not self._eof:
+                    # wait for at least one sample
+                    self._cv.wait_for(
+                        lambda: self._size >= self.itemsize or self._eof, timeout
+                    )
+                n = self._size // self.itemsize
+                if self._eof and self._size % self.itemsize:
+                    n += 1  # incomplete last sample
+                timeout = 0
+            out = bytearray(n * self.itemsize)
+            nread = self._readinto(memoryview(out), n, timeout)
+        del out[nread:]
+        return out
 
     def read(self, n=-1, timeout=None):
         """read n samples
 
-        :param n: number of samples/frames to read, if non-positive, read all, defaults to -1
+        :param n: number of samples/frames to read, if negative, read all
+                  currently available samples (waits for at least one), and if
+                  zero, read all available samples without waiting, defaults to -1
         :type n: int, optional
         :param timeout: timeout in seconds, defaults to None
         :type timeout: float, optional
@@ -351,76 +637,72 @@ class ReaderThread(Thread):
         :rtype: bytes
         """
 
-        # wait till matching line is read by the thread
-        block = self.is_alive() and n != 0
-        if timeout is not None:
-            timeout = time() + timeout
+        return bytes(self._read(n, timeout))
 
-        arrays = []
-        n_new = max(n, -n)
+    def read_view(self, n=-1, timeout=None):
+        """read n samples as a memoryview
 
-        # grab any leftover data from previous read
-        if self._carryover:
-            arrays = [self._carryover]
-            if n_new != 0:
-                n_new -= len(self._carryover) // self.itemsize
-            self._carryover = None
+        :param n: number of samples/frames to read, see :py:meth:`read`,
+                  defaults to -1
+        :type n: int, optional
+        :param timeout: timeout in seconds, defaults to None
+        :type timeout: float, optional
+        :return: memoryview of a new bytearray, owned by the caller
+        :rtype: memoryview
 
-        # loop till enough data are collected
-        nreads = 1 if n <= 0 else max(n_new, 0)
-        nr = 0
-        while True:
-            tout = timeout and timeout - time()
-            if tout <= 0:
-                break
-            try:
-                b = self._queue.get(block, tout)
-                self._queue.task_done()
-                arrays.append(b)
-            except Empty:
-                break
+        Same as :py:meth:`read` but skips the extra copy to ``bytes``.
+        """
 
-            nr += len(b) // self.itemsize
-            if nr >= nreads:  # enough read
-                if n < 0:
-                    block = False  # keep reading until queue is empty
-                else:
-                    break
+        return memoryview(self._read(n, timeout))
 
-        # combine all the data and return requested amount
-        if not len(arrays):
-            return b""
+    def readinto(self, b, timeout=None):
+        """read samples directly into a pre-allocated buffer
 
-        all_data = b"".join(arrays)
-        if n <= 0:
-            return all_data
-        nbytes = self.itemsize * n
-        if len(all_data) > nbytes:
-            self._carryover = all_data[nbytes:]
-        return all_data[:nbytes]
+        :param b: writable bytes-like object (e.g., bytearray or contiguous
+                  NumPy array) to receive the samples
+        :type b: bytes-like
+        :param timeout: timeout in seconds, defaults to None
+        :type timeout: float, optional
+        :return: number of bytes written to b
+        :rtype: int
 
-    def read_all(self, timeout=None):
-        # wait till matching line is read by the thread
-        if timeout is not None:
-            timeout = time() + timeout
+        Blocks until the buffer is filled with whole samples, the stream ends,
+        or timeout expires.
+        """
 
-        arrays = arrays = [self._carryover] if self._carryover else []
-        self._carryover = None
+        view = memoryview(b).cast("B")
+        with self._cv:
+            return self._readinto(view, len(view) // self.itemsize, timeout)
 
-        # loop till enough data are collected
-        while not self.is_alive() or timeout and timeout > time():
-            try:
-                data = self._queue.get(self.is_alive(), timeout and timeout - time())
-                self._queue.task_done()
-                arrays.append(data)
-            except Empty:
-                break
+    def read_all(self, timeout=None):
+        """read all the remaining data after the stream ends
 
-        # combine all the data and return requested amount
-        if not len(arrays):
-            return b""
+        :param timeout: timeout in seconds, defaults to None
+        :type timeout: float, optional
+        :return: all the bytes buffered when the stream ended or timeout expired
+        :rtype: bytes
+        """
 
-        return b"".join(arrays)
+        if timeout is not None:
+            timeout = time() + timeout
+
+        out = bytearray()
+        cv = self._cv
+        with cv:
+            while True:
+                # keep draining the buffer so a bounded buffer cannot stall the thread
+                n0 = len(out)
+                out.extend(bytes(self._size))
+                self._copy(memoryview(out)[n0:], self._size)
+                cv.notify_all()
+                if self._eof:
+                    break
+                tout = None if timeout is None else timeout - time()
+                if (tout is not None and tout <= 0) or not cv.wait_for(
+                    lambda: self._size or self._eof, tout
+                ):
+                    break
+        return bytes(out)
 
 
 class WriterThread(Thread):
@@ -438,15 +720,14 @@ class WriterThread(Thread):
         self._queue = Queue(queuesize or 0)  # inter-thread data I/O
 
     def join(self, timeout=None):
-        # close the stream if not already closed
-        self.stdin.close()
-
-        # if empty, queue a dummy item to wake up the thread
-        if self._queue.empty():
+        # queue the end marker so the thread finishes writing the queued data
+        # before the stream is closed
+        if self.is_alive():
             self._queue.put(None)
+            super().join(timeout)
 
-        # if queue is full,
-        super().join(timeout)
+        # close the stream if not already closed
+        self.stdin.close()
 
     def __enter__(self):
         self.start()
@@ -466,6 +747,7 @@ class WriterThread(Thread):
             # print(f"writer thread: received {data.shape[0]} samples to write")
             try:
                 nbytes = self.stdin.write(data)
+                self.stdin.flush()  # pass the block on to FFmpeg now
                 # print(f"writer thread: written {nbytes} written")
             except:
                 # stdout stream closed/FFmpeg terminated, end the thread as well
@@ -480,10 +762,150 @@ class WriterThread(Thread):
         data = self._queue.put(data, timeout)
 
 
+class BufferedWriterThread(Thread):
+    """a thread to write byte data to a writable stream from a byte-budgeted queue
+
+    :param stdin: stream to write data to
+    :type stdin: writable stream
+    :param bufsize: queue capacity in bytes
+    :type bufsize: int
+    :param blocksize: target number of bytes per write, defaults to None (64 KiB
+                      or `bufsize`, whichever is smaller)
+    :type blocksize: int, optional
+
+    :py:meth:`write` copies the data into the queue, appending it to the last
+    queued block if the block is shorter than `blocksize` so small data (e.g.,
+    individual video frames) are written to the stream in larger chunks. It
+    blocks while the queue holds `bufsize` bytes or more. If writing to the
+    stream fails, the thread stops, and the exception is raised by the next
+    :py:meth:`write` or :py:meth:`flush` call. Unlike :py:class:`WriterThread`,
+    the thread does not close the stream.
+    """
+
+    def __init__(self, stdin, bufsize, blocksize=None):
+        super().__init__()
+        self.stdin = stdin  #:writable stream: data sink
+        self.bufsize = bufsize  #:int: queue capacity in bytes
+        #:int: target number of bytes per write
+        self.blocksize = blocksize or min(65536, bufsize)
+        self._blocks = deque()  # queued data blocks
+        self._size = 0  # number of queued bytes incl. the block being written
+        self._cv = Condition()  # guards _blocks, _size, _error, and _closing
+        self._error = None  # exception raised by the last write
+        self._closing = False
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *_):
+        self.join()  # will wait until the queue is drained
+        return self
+
+    def run(self):
+        cv = self._cv
+        while True:
+            with cv:
+                cv.wait_for(lambda: self._blocks or self._closing)
+                if not self._blocks:
+                    break
+                data = self._blocks.popleft()
+            try:
+                self.stdin.write(data)
+                self.stdin.flush()
+            except Exception as e:
+                # FFmpeg terminated, keep the error for the caller
+                with cv:
+                    self._error = e
+                    self._blocks.clear()
+                    self._size = 0
+                    cv.notify_all()
+                break
+            with cv:
+                self._size -= len(data)
+                cv.notify_all()
+
+    def _raise(self):
+        # raise the error of the writer thread (must be called with the lock)
+        if self._error is not None:
+            raise self._error
+
+    def write(self, data, timeout=None):
+        """queue data to write
+
+        :param data: bytes-like object to write
+        :type data: bytes-like
+        :param timeout: timeout in seconds, defaults to None
+        :type timeout: float, optional
+        :raises Full: if timed out before the queue has room
+        """
+        if not self.is_alive() and self._error is None:
+            raise ThreadNotActive("BufferedWriterThread is not running")
+
+        data = memoryview(data).cast("B")
+        nbytes = len(data)
+        cv = self._cv
+        with cv:
+            self._raise()
+            # an oversized data block is accepted once the queue is empty
+            if not cv.wait_for(
+                lambda: self._size + nbytes <= self.bufsize
+                or not self._size
+                or self._error is not None,
+                timeout,
+            ):
+                raise Full
+            self._raise()
+
+            blocks = self._blocks
+            if blocks and len(blocks[-1]) < self.blocksize:
+                blocks[-1] += data  # coalesce
+            else:
+                blocks.append(bytearray(data))
+            self._size += nbytes
+            cv.notify_all()
+
+    def flush(self, timeout=None):
+        """wait till all the queued data are written
+
+        :param timeout: timeout in seconds, defaults to None
+        :type timeout: float, optional
+        :return: True unless timed out
+        :rtype: bool
+        """
+        with self._cv:
+            done = self._cv.wait_for(
+                lambda: not self._size or not self.is_alive(), timeout
+            )
+            self._raise()
+        return done
+
+    def join(self, timeout=None):
+        # let the thread write all the queued data before it exits
+        with self._cv:
+            self._closing = True
+            self._cv.notify_all()
+        if self.is_alive():
+            super().join(timeout)
+
+
 class AviReaderThread(Thread):
-    def __init__(self, queuesize=None):
+    """a thread to demux an AVI stream
+
+    :param queuesize: maximum number of queued chunks, defaults to None (unbounded)
+    :type queuesize: int, optional
+    :param batchsize: if given, the number of bytes to demux at once, defaults
+                      to None (demux one chunk at a time)
+    :type batchsize: int, optional
+
+    In the batch mode, each queue item holds the memoryviews of all the frames
+    of a stream found in a batch (see :py:meth:`utils.avi.AviReader.read_batch`).
+    """
+
+    def __init__(self, queuesize=None, batchsize=None):
         super().__init__()
         self.reader = AviReader()  #:utils.avi.AviReader: AVI demuxer
+        self.batchsize = batchsize  #:int|None: number of bytes to demux at once
         self.streamsready = Event()  #:Event: Set when received stream header info
         self.rates = None  # :dict(int:int|Fraction)
         self._queue = Queue(queuesize or 0)  # inter-thread data I/O
@@ -492,6 +914,8 @@ class AviReaderThread(Thread):
         self._carryover = (
             None  #:dict(int:ndarray) extra data that was not previously read by user
         )
+        self._eos = False  # True once the end of stream is reached
+        self._error = None  # exception which ended the stream early
 
     @property
     def streams(self):
@@ -514,19 +938,8 @@ class AviReaderThread(Thread):
     #     return self
 
     def run(self):
-        reader = self.reader
-
         try:
-            # start the AVI reader to process stdout byte stream
-            reader.start(*self._args)
-
-            # initialize the stream properties
-            self._ids = ids = [i for i in reader.streams]
-            self._nread = {k: 0 for k in ids}
-            self.rates = {
-                k: v["frame_rate"] if v["type"] == "v" else v["sample_rate"]
-                for k, v in reader.streams.items()
-            }
+            self._read_header()
         except Exception as e:
             logger.critical(e)
             return
@@ -534,12 +947,62 @@ class AviReaderThread(Thread):
             self.streamsready.set()
 
         reader = self.reader
-        for id, data in reader:
-            self._queue.put((id, data))
+        if self.batchsize:
+            while True:
+                try:
+                    batch = reader.read_batch(self.batchsize)
+                except Exception as e:
+                    # raised by the consumer after the queued chunks
+                    self._error = e
+                    break
+                if batch is None:
+                    break
+                for item in batch.items():
+                    self._queue.put(item)
+        else:
+            for id, data in reader:
+                self._queue.put((id, data))
         self._queue.put(None)  # end of stream
 
+    def _read_header(self):
+        # start the AVI reader to process stdout byte stream
+        reader = self.reader
+        reader.start(*self._args)
+
+        # initialize the stream properties
+        self._ids = ids = [i for i in reader.streams]
+        self._nread = {k: 0 for k in ids}
+        self.rates = {
+            k: v["frame_rate"] if v["type"] == "v" else v["sample_rate"]
+            for k, v in reader.streams.items()
+        }
+
+    def _get_chunk(self, block, timeout):
+        # get the next queued (id, data) item, None at the end of stream
+        # raises Empty if no item is available (or the end has been reached)
+        if self._eos:
+            raise Empty
+        chunk = self._queue.get(block, timeout)
+        self._queue.task_done()
+        if chunk is None:
+            self._eos = True
+            self._raise()
+        return chunk
+
+    def _raise(self):
+        # raise the exception which ended the stream early
+        if self._error is not None:
+            raise self._error
+
+    def _ended(self):
+        # True if no more chunk will be available
+        return self._eos or not self.is_alive()
+
     def wait(self, timeout=None):
-        return self.is_alive() and self.streamsready.wait(timeout)
+        # the thread may have already finished processing the stream
+        return (
+            self.is_alive() or self.streamsready.is_set()
+        ) and self.streamsready.wait(timeout)
 
     def readchunk(self, timeout=None):
         """read the next avi chunk
@@ -547,6 +1010,7 @@ class AviReaderThread(Thread):
         :param timeout: timeout in seconds, defaults to None (waits indefinitely)
         :type timeout: float, optional
         :raises TimeoutError: if terminated due to timeout
+        :raises ThreadNotActive: if reached the end of stream
         :return: tuple of stream specifier and data array
         :rtype: (str, object)
         """
@@ -575,14 +1039,17 @@ class AviReaderThread(Thread):
             if timeout is not None:
                 timeout = tend - time()
                 assert timeout > 0
-            chunk = self._queue.get(block, timeout)
+            chunk = self._get_chunk(block, timeout)
             if chunk is None:
                 raise ThreadNotActive("reached end-of-stream")
             id, data = chunk
         except Empty:
+            if self._ended():
+                raise ThreadNotActive("reached end-of-stream")
             raise TimeoutError("timed out waiting for next chunk")
-        self._queue.task_done()
 
+        if isinstance(data, list):  # batch
+            data = b"".join(data)
         return self.reader.streams[id]["spec"], self.reader.from_bytes(id, data)
 
     def find_id(self, ref_stream):
@@ -605,6 +1072,7 @@ class AviReaderThread(Thread):
         :param timeout: timeout in seconds, defaults to None (waits indefinitely)
         :type timeout: float, optional
         :raises TimeoutError: if terminated due to timeout
+        :raises ThreadNotActive: if reached the end of stream
         :return: tuple of stream specifier and data array
         :return: dict of data object keyed by stream specifier string, each data object is
                  created by `bytes_to_video` or `bytes_to_image` plugin hook
@@ -654,17 +1122,19 @@ class AviReaderThread(Thread):
                     timeout = tend - time()
                     if timeout <= 0:
                         break
-                chunk = self._queue.get(block, timeout)
+                chunk = self._get_chunk(block, timeout)
                 if chunk is None:
                     break
                 k, data = chunk
-                self._queue.task_done()
-                arrays[k].append(data)
-                nremain[k] -= len(data) // itemsizes[k]
+                nremain[k] -= _append_data(arrays[k], data) // itemsizes[k]
 
             except Empty:
                 break
 
+        # nothing left to read
+        if not any(arrays.values()) and self._ended():
+            raise ThreadNotActive("reached end-of-stream")
+
         def combine(id, array, n, nr):
             # combine all the data and return requested amount
             if not len(array):
@@ -674,7 +1144,7 @@ class AviReaderThread(Thread):
             return (
                 (id, all_data, None)
                 if nr >= 0
-                else (id, all_data[:nbytes, ...], all_data[nbytes:, ...])
+                else (id, all_data[:nbytes], all_data[nbytes:])
             )
 
         ids, data, excess = zip(
@@ -726,13 +1196,11 @@ class AviReaderThread(Thread):
         # loop till enough data are collected
         while True:
             try:
-                chunk = self._queue.get(self.is_alive(), timeout and timeout - time())
+                chunk = self._get_chunk(self.is_alive(), timeout and timeout - time())
                 if chunk is None:
                     break  # end of stream
                 k, data = chunk
-                self._queue.task_done()
-                arrays[k].append(data)
-                self._nread[k] += len(data) // itemsizes[k]
+                self._nread[k] += _append_data(arrays[k], data) // itemsizes[k]
             except Empty:
                 break
 
@@ -746,3 +1214,576 @@ class AviReaderThread(Thread):
             )
 
         return out
+
+
+def _open_nonblocking(fd):
+    # open a non-blocking file descriptor of the pipe. A new open file
+    # description is opened via procfs (Linux) so the original file object
+    # stays blocking; otherwise (e.g., macOS or a write end without a reader),
+    # the duplicate shares the non-blocking mode with the original
+    import fcntl
+
+    flags = fcntl.fcntl(fd, fcntl.F_GETFL) & os.O_ACCMODE
+    try:
+        return os.open(f"/proc/self/fd/{fd}", flags | os.O_NONBLOCK)
+    except OSError:
+        newfd = os.dup(fd)
+        os.set_blocking(newfd, False)
+        return newfd
+
+
+class IOMultiplexerThread(Thread):
+    """a daemon thread to service the pipes of many FFmpeg processes (POSIX only)
+
+    Every attached pipe is opened again in the non-blocking mode and watched
+    with a selector, so a single thread fills the ring buffers of
+    :py:class:`IOMuxReader` objects, drains the queues of
+    :py:class:`IOMuxWriter` objects, and splits the log lines of
+    :py:class:`IOMuxLogger` objects for any number of streams.
+
+    The engine owns the new file descriptor, so the original file object may
+    be closed at any time (e.g., by :py:class:`ffmpegprocess.Popen` at exit)
+    without disrupting the engine. On Linux, the pipe is reopened via
+    ``/proc/self/fd`` so the original file object stays in the blocking mode.
+    Elsewhere, the file descriptor is duplicated, which shares the
+    non-blocking mode with the original file object; it must not be read
+    from or written to while attached.
+
+    An attached object (handler) implements two methods, which are called on
+    the engine thread:
+
+    - ``_on_ready(fd, mask)``: service the ready file descriptor and return
+      the selector events to watch next, 0 to stop watching until
+      :py:meth:`modify` is called, or None to detach
+    - ``_on_detach()``: called once the handler is detached and its file
+      descriptor is closed
+
+    If ``_on_ready()`` raises an exception, it is stored in the ``_error``
+    attribute of the handler, and the handler is detached. The handler raises
+    it again to its consumer.
+    """
+
+    def __init__(self):
+        super().__init__(name="ffmpegio-iomux", daemon=True)
+        self._selector = selectors.DefaultSelector()
+        self._wakeup_r, self._wakeup_w = socket.socketpair()
+        self._wakeup_r.setblocking(False)
+        self._selector.register(self._wakeup_r, selectors.EVENT_READ)
+        self._lock = Lock()
+        self._ops = []  # operations to be performed by the engine thread
+        self._fds = {}  # handler -> engine's file descriptor
+
+    def _submit(self, op):
+        with self._lock:
+            self._ops.append(op)
+            if self.ident is None:
+                self.start()
+        self._wakeup_w.send(b"\0")
+
+    def attach(self, handler, fileobj, events):
+        """start servicing a pipe
+
+        :param handler: object to service the pipe
+        :type handler: IOMuxLogger|IOMuxReader|IOMuxWriter
+        :param fileobj: pipe file object
+        :type fileobj: file object
+        :param events: initial selector events (0 to attach without watching)
+        :type events: int
+        """
+        fd = _open_nonblocking(fileobj.fileno())
+        self._submit(lambda: self._attach(handler, fd, events))
+
+    def modify(self, handler, events):
+        """change the selector events to watch
+
+        :param handler: attached handler
+        :type handler: IOMuxLogger|IOMuxReader|IOMuxWriter
+        :param events: new selector events (0 to stop watching)
+        :type events: int
+        """
+        self._submit(lambda: self._modify(handler, events))
+
+    def detach(self, handler, timeout=None):
+        """stop servicing a pipe and close its file descriptor
+
+        :param handler: attached handler
+        :type handler: IOMuxLogger|IOMuxReader|IOMuxWriter
+        :param timeout: seconds to wait for the engine to detach the handler,
+                        defaults to None (waits indefinitely)
+        :type timeout: float, optional
+        :return: True if detached
+        :rtype: bool
+        """
+        done = Event()
+        self._submit(lambda: (self._detach(handler), done.set()))
+        return current_thread() is self or done.wait(timeout)
+
+    def _attach(self, handler, fd, events):
+        self._fds[handler] = fd
+        if events:
+            self._selector.register(fd, events, handler)
+
+    def _modify(self, handler, events):
+        fd = self._fds.get(handler, None)
+        if fd is None:
+            return  # already detached
+        try:
+            key = self._selector.get_key(fd)
+        except KeyError:
+            key = None
+        if not events:
+            if key is not None:
+                self._selector.unregister(fd)
+        elif key is None:
+            self._selector.register(fd, events, handler)
+        elif key.events != events:
+            self._selector.modify(fd, events, handler)
+
+    def _detach(self, handler):
+        fd = self._fds.pop(handler, None)
+        if fd is None:
+            return  # already detached
+        try:
+            self._selector.unregister(fd)
+        except KeyError:
+            pass
+        os.close(fd)
+        handler._on_detach()
+
+    def run(self):
+        while True:
+            for key, mask in self._selector.select():
+                handler = key.data
+                if handler is None:  # wakeup call
+                    try:
+                        while self._wakeup_r.recv(4096):
+                            pass
+                    except BlockingIOError:
+                        pass
+                    continue
+                try:
+                    events = handler._on_ready(key.fd, mask)
+                except Exception as e:
+                    logger.critical(f"[iomux] I/O handler error:\n\n{e}")
+                    handler._error = e
+                    events = None
+                self._run(
+                    lambda: self._detach(handler)
+                    if events is None
+                    else self._modify(handler, events)
+                )
+
+            with self._lock:
+                ops, self._ops = self._ops, []
+            for op in ops:
+                self._run(op)
+
+    def _run(self, op):
+        # an error must not stop the engine serving the other streams
+        try:
+            op()
+        except Exception as e:
+            logger.critical(f"[iomux] operation failed:\n\n{e}")
+
+
+_iomux = None
+_iomux_lock = Lock()
+
+
+def _get_iomux():
+    # the process-wide I/O multiplexer thread
+    global _iomux
+    with _iomux_lock:
+        if _iomux is None or (_iomux.ident is not None and not _iomux.is_alive()):
+            # first use or the thread is gone (e.g., in a forked child process)
+            _iomux = IOMultiplexerThread()
+        return _iomux
+
+
+class IOMuxLogger(LoggerThread):
+    """:py:class:`LoggerThread` served by the shared :py:class:`IOMultiplexerThread`
+
+    :param stderr: stream to read the log from
+    :type stderr: readable stream
+    :param echo: True to print the log lines, defaults to False
+    :type echo: bool, optional
+
+    :py:meth:`start` attaches the stream to the I/O multiplexer instead of
+    starting a new thread.
+    """
+
+    def __init__(self, stderr, echo=False) -> None:
+        super().__init__(stderr, echo)
+        self._file = None  # attached stream
+        self._partial = ""  # incomplete last line
+        self._decoder = codecs.getincrementaldecoder("utf-8")("replace")
+        self._done = Event()
+        self._error = None  # exception raised while servicing the stream
+
+    def start(self):
+        stderr = self._file = self.stderr
+        if not stderr or stderr.closed:
+            logger.debug("[logger] exiting (stderr pipe not open)")
+            self.stderr = None
+            self._done.set()
+        else:
+            _get_iomux().attach(self, stderr, selectors.EVENT_READ)
+
+    def is_alive(self):
+        return self._file is not None and not self._done.is_set()
+
+    def join(self, timeout=None):
+        if self._file is None:
+            return
+        if self._file.closed:
+            # like LoggerThread, stop reading once the stream is closed
+            _get_iomux().detach(self, timeout)
+        self._done.wait(timeout)
+        if self._error is not None:
+            raise self._error
+
+    def _append(self, text):
+        # split the text into lines (universal newlines) and log complete lines
+        lines = re.split(r"\r\n|\r|\n", self._partial + text)
+        self._partial = lines.pop()
+        lines = [log for log in lines if log]
+        if lines:
+            if self.echo:
+                for log in lines:
+                    print(log)
+            with self.newline:
+                on_line = self.on_line
+                self.logs.extend(
+                    lines if on_line is None else (l for l in lines if not on_line(l))
+                )
+                self.newline.notify_all()
+
+    def _on_ready(self, fd, mask):
+        try:
+            b = os.read(fd, 65536)
+        except BlockingIOError:
+            return selectors.EVENT_READ
+        except OSError:
+            b = b""
+        if not b:
+            return None  # end of stream
+        self._append(self._decoder.decode(b))
+        return selectors.EVENT_READ
+
+    def _on_detach(self):
+        self._append(self._decoder.decode(b"", True) + "\n")
+        with self.newline:
+            self.stderr = None
+            self.newline.notify_all()
+        self._done.set()
+        logger.debug("[logger] exiting")
+
+
+class IOMuxReader(ReaderThread):
+    """:py:class:`ReaderThread` served by the shared :py:class:`IOMultiplexerThread`
+
+    :param stdout: stream to read data from
+    :type stdout: readable stream
+    :param nmin: expected minimum number of read()'s n arg (not enforced), defaults to None
+    :type nmin: int, optional
+    :param queuesize: (deprecated) buffer capacity in the number of blocks, defaults to None
+    :type queuesize: int, optional
+    :param bufsize: buffer capacity in bytes, defaults to None (unbounded)
+    :type bufsize: int, optional
+
+    :py:meth:`start` attaches the stream to the I/O multiplexer instead of
+    starting a new thread. The multiplexer stops watching the stream while a
+    bounded buffer is full. If reading the stream fails, the data received
+    before the failure are returned first, then the exception is raised by
+    the read methods and :py:meth:`join`.
+    """
+
+    def __init__(self, stdout, nmin=None, queuesize=None, bufsize=None):
+        super().__init__(stdout, nmin, queuesize, bufsize)
+        self._file = None  # attached stream
+        self._paused = False  # True while a bounded buffer is full
+        self._error = None  # exception raised while servicing the stream
+
+    def start(self):
+        if self.itemsize is None:
+            raise ValueError(
+                "Thread object's must have its itemsize property set with the expected sample/frame size in bytes"
+            )
+        self._alloc()
+        self._file = self.stdout
+        _get_iomux().attach(self, self.stdout, selectors.EVENT_READ)
+
+    def is_alive(self):
+        return self._file is not None and not self._eof
+
+    def join(self, timeout=None):
+        if self._file is None:
+            return
+        if self._file.closed:
+            # like ReaderThread, stop reading once the stream is closed
+            _get_iomux().detach(self, timeout)
+        with self._cv:
+            if self.bufsize and self._size >= len(self._buf):
+                self._discard()  # let the multiplexer read till the end
+            self._cv.wait_for(lambda: self._eof, timeout)
+            if self._eof and self._error is not None:
+                raise self._error
+
+    def _raise(self):
+        # raise the error once the data received before it are consumed
+        # (must be called with the lock)
+        if self._eof and not self._size and self._error is not None:
+            raise self._error
+
+    def _readinto(self, view, n, timeout):
+        nread = super()._readinto(view, n, timeout)
+        if not nread:
+            self._raise()
+        return nread
+
+    def read_all(self, timeout=None):
+        out = super().read_all(timeout)
+        with self._cv:
+            self._raise()
+        return out
+
+    def _resume(self):
+        # watch the stream again once a full buffer has space (with the lock)
+        if self._paused and self._size < len(self._buf):
+            self._paused = False
+            _get_iomux().modify(self, selectors.EVENT_READ)
+
+    def _copy(self, dst, nbytes):
+        super()._copy(dst, nbytes)
+        self._resume()
+
+    def _discard(self):
+        super()._discard()
+        self._resume()
+
+    def _on_ready(self, fd, mask):
+        with self._cv:
+            view = self._free_view(self._blocksize())
+            if view is None:
+                self._paused = True
+                return 0
+
+        # the free space is only touched by the multiplexer, no lock needed
+        try:
+            nread = os.readv(fd, [view])
+        except BlockingIOError:
+            return selectors.EVENT_READ
+        except OSError:
+            nread = 0
+        finally:
+            view.release()
+
+        if not nread:
+            return None  # end of stream
+
+        with self._cv:
+            if self._collect:  # True until self.cool_down
+                self._size += nread
+                self._cv.notify_all()
+        return selectors.EVENT_READ
+
+    def _on_detach(self):
+        with self._cv:
+            self._eof = True
+            self._cv.notify_all()
+
+
+class IOMuxWriter(WriterThread):
+    """:py:class:`WriterThread` served by the shared :py:class:`IOMultiplexerThread`
+
+    :param stdin: stream to write data to
+    :type stdin: writable stream
+    :param queuesize: maximum number of queued data blocks, defaults to None (unbounded)
+    :type queuesize: int, optional
+
+    :py:meth:`start` attaches the stream to the I/O multiplexer instead of
+    starting a new thread. Like :py:meth:`WriterThread.join`, :py:meth:`join`
+    lets the multiplexer write all the queued data before the stream is
+    closed, but the multiplexer closes the stream, so :py:meth:`join` may
+    return without waiting if ``timeout=0``.
+    """
+
+    def __init__(self, stdin, queuesize=None):
+        super().__init__(stdin, queuesize)
+        self._queuesize = queuesize or 0
+        self._blocks = deque()  # queued data blocks (None to end)
+        self._cv = Condition()  # guards _blocks and _idle
+        self._idle = True  # True while the multiplexer is not watching
+        self._data = None  # memoryview of the remaining data being written
+        self._started = False
+        self._done = Event()
+        self._error = None  # exception raised while servicing the stream
+
+    def start(self):
+        self._started = True
+        _get_iomux().attach(self, self.stdin, 0)
+
+    def is_alive(self):
+        return self._started and not self._done.is_set()
+
+    def join(self, timeout=None):
+        if not self._started:
+            return
+        self._put(None)
+        self._done.wait(timeout)
+        if self._error is not None:
+            raise self._error
+
+    def write(self, data, timeout=None):
+        if self._error is not None:
+            raise self._error
+        if not self.is_alive():
+            raise ThreadNotActive("WriterThread is not running")
+
+        with self._cv:
+            if not self._cv.wait_for(
+                lambda: len(self._blocks) < self._queuesize or not self._queuesize,
+                timeout,
+            ):
+                raise Full
+        self._put(data)
+
+    def _put(self, data):
+        with self._cv:
+            self._blocks.append(data)
+            if not self._idle:
+                return
+            self._idle = False
+        _get_iomux().modify(self, selectors.EVENT_WRITE)
+
+    def _on_ready(self, fd, mask):
+        while True:
+            if self._data is None:
+                with self._cv:
+                    if not self._blocks:
+                        self._idle = True
+                        return 0
+                    data = self._blocks.popleft()
+                    self._cv.notify_all()
+                if data is None:
+                    return None  # end of stream
+                self._data = memoryview(data).cast("B")
+
+            try:
+                nbytes = os.write(fd, self._data)
+            except BlockingIOError:
+                return selectors.EVENT_WRITE
+            except OSError:
+                # FFmpeg terminated
+                return None
+
+            self._data = self._data[nbytes:] if nbytes < len(self._data) else None
+
+    def _on_detach(self):
+        with self._cv:
+            self._blocks.clear()
+            self._data = None
+            self._cv.notify_all()
+        try:
+            # FFmpeg sees the end of stream once the original is closed as well
+            self.stdin.close()
+        except:
+            pass
+        self._done.set()
+
+
+class IOMuxAviReader(AviReaderThread):
+    """:py:class:`AviReaderThread` without its own thread
+
+    :param queuesize: ignored, the received bytes are buffered without a limit
+    :type queuesize: int, optional
+    :param batchsize: if given, the maximum number of bytes to demux at once,
+                      defaults to None (demux one chunk at a time)
+    :type batchsize: int, optional
+
+    The AVI stream is received by an :py:class:`IOMuxReader`, and the chunks
+    are demuxed on demand by the calling thread. The headers are parsed by the
+    first call to :py:meth:`wait` (blocking regardless of its timeout), and
+    the timeout of the read methods only applies to the wait for the next
+    chunk to begin arriving.
+    """
+
+    def __init__(self, queuesize=None, batchsize=None):
+        super().__init__(queuesize, batchsize)
+        self._stdout = None  #:IOMuxReader: buffered AVI stream
+        self._items = deque()  # demuxed (id, data) items not yet returned
+        self._lock = Lock()
+
+    def start(self, stdout, use_ya=None):
+        self._stdout = IOMuxReader(stdout, 2**16)
+        self._stdout.itemsize = 1
+        self._stdout.start()
+        self._args = (self._stdout, use_ya)
+
+    def is_alive(self):
+        return self._stdout is not None and not self._eos
+
+    def join(self, timeout=None):
+        if self._stdout is not None:
+            self._stdout.join(timeout)
+
+    def wait(self, timeout=None):
+        with self._lock:
+            if self._stdout is not None and not self.streamsready.is_set():
+                try:
+                    self._read_header()
+                except Exception as e:
+                    logger.critical(e)
+                    self._eos = True
+                finally:
+                    self.streamsready.set()
+        return self.streamsready.is_set()
+
+    def _get_chunk(self, block, timeout):
+        if timeout is not None:
+            timeout = time() + timeout
+        stdout = self._stdout
+        with self._lock:
+            while not self._items:
+                if self._eos:
+                    raise Empty
+                with stdout._cv:
+                    tout = None if timeout is None else max(timeout - time(), 0)
+                    if not stdout._cv.wait_for(
+                        lambda: stdout._size or stdout._eof, tout if block else 0
+                    ):
+                        raise Empty
+                    navail = stdout._size
+
+                if self.batchsize:
+                    batch = self.reader.read_batch(
+                        max(min(navail, self.batchsize), 1)
+                    )
+                    if batch is None:
+                        self._eos = True
+                        self._raise()
+                        return None
+                    self._items.extend(batch.items())
+                else:
+                    try:
+                        self._items.append(next(self.reader))
+                    except StopIteration:
+                        self._eos = True
+                        self._raise()
+                        return None
+            return self._items.popleft()
+
+    def _raise(self):
+        # the AVI reader ends the iteration on an error of the stream as well
+        if self._error is None and self._stdout is not None:
+            self._error = self._stdout._error
+        super()._raise()
+
+
+def _append_data(arrays, data):
+    # append a chunk or a batch of chunks to arrays and return the number of bytes
+    if isinstance(data, list):
+        arrays.extend(data)
+        return sum(len(d) for d in data)
+    arrays.append(data)
+    return len(data)
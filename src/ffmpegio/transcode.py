@@ -1,6 +1,5 @@
-from . import ffmpegprocess as fp, configure, utils, FFmpegError
 from .path import check_version
-from .errors import scan_stderr
+from .errors import FFmpegError, scan_stderr
 
 __all__ = ["transcode"]
 
@@ -63,6 +62,9 @@ def transcode(
 
     """
 
+    # imported here to keep `import ffmpegio` light
+    from . import ffmpegprocess as fp, configure, utils
+
     # split input and global options from options
     input_options = utils.pop_extra_options(options, "_in")
     global_options = utils.pop_global_options(options)
@@ -248,6 +248,33 @@ VPRP_VideoField = StructProcessor(
 )
 
 
+# OpenDML extensions (AVI 2.0)
+# http://www.jmcgowan.com/odmlff2.pdf
+
+AVI_INDEX_OF_INDEXES = 0
+
+AVISuperIndex = StructProcessor(
+    "AVISUPERINDEX",
+    "<HBBI4S3I",
+    (
+        "longs_per_entry",
+        "index_sub_type",
+        "index_type",
+        "entries_in_use",
+        "chunk_id",
+        "reserved0",
+        "reserved1",
+        "reserved2",
+    ),
+    ((0,) * 4, b"\0" * 4, *((0,) * 3)),
+)
+
+AVISuperIndexEntry = StructProcessor(
+    "AVISUPERINDEX_ENTRY", "<QII", ("offset", "size", "duration"), (0,) * 3
+)
+
+AVIExtHeader = StructProcessor("AVIEXTHEADER", "<I", ("grand_frames",), (0,))
+
 ChunkHeader = StructProcessor("CHDR", "<4SI", ("id", "datasize"))
 
 
@@ -324,9 +351,39 @@ def get_stream_header(b, offset, end):
     else:
         raise RuntimeError(f"Unsupported stream type: {strh.fcc_type}")
 
+    # look for OpenDML super index
+    offset += chunksize
+    while offset + ChunkHeader.size <= end:
+        offset, chunksize, id, _ = get_chunk_header(b, offset)
+        if id == "indx":
+            data[id] = get_super_index(b, offset)
+        offset += chunksize
+
     return data
 
 
+def get_super_index(b, offset):
+    """parse OpenDML super index (indx) chunk
+
+    :param b: buffer
+    :type b: bytes-like
+    :param offset: position of the chunk data
+    :type offset: int
+    :return: index header and its entries (empty if not an index of indexes,
+             e.g., a placeholder written to a pipe)
+    :rtype: tuple(AVISUPERINDEX, list(AVISUPERINDEX_ENTRY))
+    """
+    hdr = AVISuperIndex.unpack_from(b, offset)
+    if hdr.index_type != AVI_INDEX_OF_INDEXES:
+        return hdr, []
+    offset += AVISuperIndex.size
+    n = AVISuperIndexEntry.size
+    return hdr, [
+        AVISuperIndexEntry.unpack_from(b, i)
+        for i in range(offset, offset + n * hdr.entries_in_use, n)
+    ]
+
+
 def _seek(f, n):
     try:
         f.seek(n, SEEK_CUR)
@@ -363,15 +420,15 @@ def read_header(f, pix_fmt=None):
     avih = AVIMainHeader.unpack_from(b, offset)
     offset += chunksize
     streams = []
-    while True:
-        try:
-            offset, chunksize, id, list_type = get_chunk_header(b, offset)
-        except:
-            break
-        if list_type != "strl":
-            break
-
-        streams.append(get_stream_header(b, offset, offset + chunksize))
+    dmlh = None  # OpenDML extended header
+    while offset + ChunkHeader.size <= len(b):
+        offset, chunksize, id, list_type = get_chunk_header(b, offset)
+        if list_type == "strl":
+            streams.append(get_stream_header(b, offset, offset + chunksize))
+        elif list_type == "odml":
+            i, _, id, _ = get_chunk_header(b, offset)
+            if id == "dmlh":
+                dmlh = AVIExtHeader.unpack_from(b, i)
         offset += chunksize
 
     def get_stream_info(i, strl, use_ya):
@@ -379,6 +436,12 @@ def read_header(f, pix_fmt=None):
         strf = strl["strf"]
         type = fcc_types[strh.fcc_type]  # raises if not valid type
         info = dict(index=i, type=type)
+
+        # total number of frames/sample blocks, only known if indexed by OpenDML
+        # super index (i.e., finalized file)
+        indx = strl.get("indx", None)
+        info["length"] = sum(e.duration for e in indx[1]) if indx and indx[1] else None
+
         if type == fcc_types["vids"]:
             info["frame_rate"] = fractions.Fraction(strh.rate, strh.scale)
             info["width"] = strf.width
@@ -438,26 +501,106 @@ def read_header(f, pix_fmt=None):
     return [get_stream_info(i, strl, pix_fmt) for i, strl in enumerate(streams)], (
         avih,
         streams,
+        dmlh,
     )
 
 
 re_movi = re.compile(r"\d{2}(?:wb|db|dc|tx)")
 
+# lists containing data chunks: OpenDML continuation RIFF, movi, and rec
+movi_lists = ("AVIX", "movi", "rec ")
 
-def read_frame(f):
+
+def read_frame_header(f):
+    """skip to the next data chunk and read its header
+
+    :param f: AVI stream positioned at a chunk in the movi list
+    :type f: readable stream
+    :return: stream index, data size in bytes, and number of padding bytes
+    :rtype: tuple(int, int, int)
+    """
     while True:
         id, datasize, chunksize, list_type = read_chunk_header(f)
-        if not list_type:
+        if list_type:
+            if list_type not in movi_lists:
+                if id == "RIFF":
+                    raise RuntimeError(f"Unexpected RIFF form: {list_type}")
+                _seek(f, chunksize)
+            # else step into the list
+        else:
             m = re_movi.match(id)
             if m:  # data chunk found
-                b = f.read(datasize)
-                if chunksize > datasize:
-                    _seek(f, chunksize - datasize)
-                return int(id[:2]), b
-            else:
+                return int(id[:2]), datasize, chunksize - datasize
+            else:  # e.g., OpenDML standard index (ix##), idx1, JUNK
                 _seek(f, chunksize)
 
-        id, datasize, chunksize, list_type = read_chunk_header(f)
+
+def read_frame(f):
+    i, datasize, npad = read_frame_header(f)
+    b = f.read(datasize)
+    if npad:
+        _seek(f, npad)
+    return i, b
+
+
+_chunk_header = Struct("<4sI")
+_list_ids = (b"RIFF", b"LIST")
+_movi_lists = tuple(t.encode() for t in movi_lists)
+
+
+def find_frames(b, ids, offset=0, end=None):
+    """locate the data chunks in a buffered span of the movi list
+
+    :param b: buffered bytes, starting at a chunk boundary
+    :type b: bytes-like
+    :param ids: stream index keyed by chunk id (e.g., ``{b"00dc": 0}``)
+    :type ids: dict(bytes, int)
+    :param offset: position of the first chunk in b, defaults to 0
+    :type offset: int, optional
+    :param end: end of the valid data in b, defaults to None (``len(b)``)
+    :type end: int, optional
+    :return: list of (stream index, data start, data end) of the complete data
+             chunks, the position of the first incomplete chunk, and the number
+             of bytes of an unwanted chunk beyond end to be skipped
+    :rtype: tuple(list(tuple(int, int, int)), int, int)
+
+    Descends into the lists with data chunks (``rec``, ``movi``, and OpenDML
+    ``AVIX`` RIFF) and skips the other lists and the chunks with unknown ids
+    (e.g., ``idx1``, ``ix##``, ``JUNK``).
+    """
+    if end is None:
+        end = len(b)
+    unpack_from = _chunk_header.unpack_from
+    frames = []
+    append = frames.append
+    get_id = ids.get
+    nhdr = _chunk_header.size
+    while offset + nhdr <= end:
+        id, datasize = unpack_from(b, offset)
+        if id in _list_ids:
+            if offset + nhdr + 4 > end:
+                break
+            list_type = bytes(b[offset + nhdr : offset + nhdr + 4])
+            if list_type in _movi_lists:
+                offset += nhdr + 4  # step into the list
+                continue
+            if id == b"RIFF":
+                raise RuntimeError(f"Unexpected RIFF form: {list_type}")
+            i = None  # skip the list
+        else:
+            i = get_id(id)
+        start = offset + nhdr
+        next = start + datasize + (datasize & 1)
+        if i is None:  # skip unknown chunk
+            if next > end:
+                return frames, end, next - end
+        elif start + datasize > end:
+            break  # incomplete frame
+        else:
+            append((i, start, start + datasize))
+        offset = next
+    # the pad byte of the last chunk may lie beyond end
+    return frames, min(offset, end), max(offset - end, 0)
 
 
 #######################################################################################################
@@ -469,6 +612,8 @@ class AviReader:
         self.ready = False  #:bool: True if AVI headers has been processed
         self.streams = None  #:dict: Stream headers keyed by stream id (int key)
         self.itemsizes = None  #:dict: sample size of each stream in bytes
+        self.batch_size = 2**22  #:int: default number of bytes to read per read_batch()
+        self._batch = None  # read_batch() state: (chunk ids, partial chunk, bytes to skip)
 
         hook = plugins.get_hook()
         self.converters = {"v": hook.bytes_to_video, "a": hook.bytes_to_audio}
@@ -507,6 +652,104 @@ class AviReader:
     def __iter__(self):
         return self
 
+    def readall(self):
+        """read all the remaining frames into per-stream buffers
+
+        :return: bytearray of each stream keyed by stream id
+        :rtype: dict(int, bytearray)
+
+        The stream is demuxed in batches (see :py:meth:`read_batch`) and the
+        frames are copied into the per-stream buffers, which are grown
+        geometrically as needed, so the stream is never held in memory twice.
+        """
+        bufs = {
+            k: bytearray(
+                v["length"] * self.itemsizes[k] if v["length"] else 2**16
+            )  # preallocate if the length is known
+            for k, v in self.streams.items()
+        }
+        sizes = dict.fromkeys(self.streams, 0)
+        while True:
+            batch = self.read_batch()
+            if batch is None:
+                break
+            for i, frames in batch.items():
+                buf = bufs[i]
+                n0 = sizes[i]
+                n1 = n0 + sum(len(frame) for frame in frames)
+                while n1 > len(buf):
+                    buf *= 2  # grow in place (no temporary buffer)
+                view = memoryview(buf)
+                for frame in frames:
+                    n = n0 + len(frame)
+                    view[n0:n] = frame
+                    n0 = n
+                view.release()
+                sizes[i] = n1
+
+        for k, buf in bufs.items():
+            del buf[sizes[k] :]
+        return bufs
+
+    def read_batch(self, blocksize=None):
+        """read a batch of frames
+
+        :param blocksize: number of bytes to read at once, defaults to None
+                          (:py:attr:`batch_size`)
+        :type blocksize: int, optional
+        :return: memoryviews of the frames grouped by stream id or None if
+                 the stream has ended
+        :rtype: dict(int, list(memoryview)) or None
+
+        A large span of the movi list is read into a new buffer and the chunk
+        boundaries are located in bulk. The returned memoryviews slice this
+        buffer without copying, and they remain valid after the next call.
+        """
+        f = self._f
+        if self._batch is None:
+            self._batch = (
+                {
+                    f"{k:02d}{t}".encode(): k
+                    for k in self.streams
+                    for t in ("wb", "db", "dc", "tx")
+                },
+                b"",  # partial chunk
+                0,  # number of bytes to skip
+            )
+        ids, tail, nskip = self._batch
+        if nskip:
+            _seek(f, nskip)
+
+        ntail = len(tail)
+        nbuf = max(blocksize or self.batch_size, ntail + 12)
+        if ntail >= 8:
+            # make sure the partial chunk fits in the buffer
+            id, datasize = _chunk_header.unpack_from(tail)
+            if id not in _list_ids:
+                nbuf = max(nbuf, datasize + 8 + (datasize & 1))
+
+        buf = bytearray(nbuf)
+        view = memoryview(buf)
+        view[:ntail] = tail
+        nread = f.readinto(view[ntail:]) or 0
+        end = ntail + nread
+        frames, offset, nskip = find_frames(buf, ids, 0, end)
+
+        if not nread and not frames:
+            # end of stream (ignore incomplete chunk)
+            self._batch = (ids, b"", 0)
+            return None
+
+        self._batch = (ids, bytes(view[offset:end]), nskip)
+        out = {}
+        for i, start, stop in frames:
+            v = view[start:stop]
+            try:
+                out[i].append(v)
+            except KeyError:
+                out[i] = [v]
+        return out
+
     def from_bytes(self, id, b):
         info = self.streams[id]
         return self.converters[info["type"]](
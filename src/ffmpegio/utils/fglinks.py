@@ -1,10 +1,21 @@
 import re
 from collections import UserDict, abc
+from contextlib import contextmanager
 from . import is_stream_spec
 from ..errors import FFmpegioError
 
 
 class GraphLinks(UserDict):
+    """Filtergraph link definitions
+
+    :param links: initial links, defaults to None
+    :type links: dict, optional
+
+    Each item maps a link label to a pair of filter pad ids: (dst(s), src).
+    The labels are also indexed by the dst and src pad ids, so the pad-to-label
+    lookups do not scan all the links.
+    """
+
     class Error(FFmpegioError):
         pass
 
@@ -167,9 +178,58 @@ class GraphLinks(UserDict):
         # label auto-renaming database
         self.label_lookup = {int: -1}
 
+        # links are already validated
+        self._defer_validation = 1
+
         # calls update() if links set
         super().__init__(links or {})
 
+        self._defer_validation = 0
+
+    @property
+    def data(self):
+        """dict: link label to (dst(s), src) pair (indexed by the pad ids)"""
+        return self._data
+
+    @data.setter
+    def data(self, value):
+        self._data = _IndexedLinks(value)
+
+    @contextmanager
+    def batch(self):
+        """context manager to defer the link validation until the end of the block
+
+        Within the block, the mappings given to :py:meth:`update` are not validated
+        individually. Instead, all the links are validated once when the block
+        exits. If the validation fails (or an exception is raised in the block),
+        the links are restored to the state before the block and the exception
+        is re-raised.
+
+        .. code-block:: python
+
+           with links.batch():
+               for other in others:
+                   links.update(other, offset)
+
+        """
+
+        if self._defer_validation:
+            # nested
+            yield self
+            return
+
+        backup = (dict(self.data), {**self.label_lookup})
+        self._defer_validation = 1
+        try:
+            yield self
+            self._defer_validation = 0
+            self.validate(self.data)
+        except:
+            self.data, self.label_lookup = backup
+            raise
+        finally:
+            self._defer_validation = 0
+
     def _register_label(self, label):
         """check the label name for duplicate, adjust as needed
 
@@ -249,7 +309,7 @@ class GraphLinks(UserDict):
 
     def __setitem__(self, key, value):
         # can only set named key
-        self.link(value[1], value[0], label=key, force=False, validate=True)
+        self.link(value[0], value[1], label=key, force=False)
 
     def is_linked(self, label):
         """True if label specifies a link
@@ -398,7 +458,7 @@ class GraphLinks(UserDict):
         """
         if dst is None:
             return None
-        return next((label for label, dst1, _ in self.iter_dsts() if dst == dst1), None)
+        return self.data.dst_index.get(dst, None)
 
     def find_src_labels(self, src):
         """get labels of a source/output pad id
@@ -410,7 +470,7 @@ class GraphLinks(UserDict):
         """
         if src is None:
             return None
-        return [label for label, (_, src1) in self.data.items() if src == src1]
+        return list(self.data.src_index.get(src, ()))
 
     def find_input_label(self, dst):
         """get labels of an unconnected input pad id
@@ -420,9 +480,8 @@ class GraphLinks(UserDict):
         :return: found label or None if no match found
         :rtype: str or None
         """
-        if dst is None:
-            return None
-        return next((label for label, dst1 in self.iter_inputs() if dst == dst1), None)
+        label = self.find_dst_label(dst)
+        return None if label is None or self.data[label][1] is not None else label
 
     def find_output_labels(self, src):
         """get labels of an unconnected source/output pad id
@@ -434,17 +493,20 @@ class GraphLinks(UserDict):
         """
         if src is None:
             return None
-        return [label for label, src1 in self.iter_outputs() if src == src1]
+        return [
+            label
+            for label in self.data.src_index.get(src, ())
+            if any((d is None for d in self.iter_dst_ids(self.data[label][0], True)))
+        ]
 
     def find_link_label(self, dst, src):
         if src is None or dst is None:
             return None
-        return next((l for l, d, s in self.iter_links() if src == s and dst == d), None)
+        label = self.find_dst_label(dst)
+        return label if label is not None and self.data[label][1] == src else None
 
     def are_linked(self, dst, src):
-        if src is None or dst is None:
-            return False
-        return any((src == s and dst == d for _, d, s in self.iter_links()))
+        return self.find_link_label(dst, src) is not None
 
     def unlink(self, label=None, dst=None, src=None):
         """unlink specified links
@@ -518,7 +580,8 @@ class GraphLinks(UserDict):
             None
             if preserve_src_label
             else next(
-                (k for k, (d, s) in self.data.items() if d is None and s == src), None
+                (k for k in self.data.src_index.get(src, ()) if self.data[k][0] is None),
+                None,
             )
         )
 
@@ -701,7 +764,8 @@ class GraphLinks(UserDict):
                 raise GraphLinks.Error(
                     f"Other must be a dict-like mapping object"
                 )
-            self.validate(other)
+            if not self._defer_validation:
+                self.validate(other)
 
         n = len(other)
         if not n:
@@ -714,7 +778,7 @@ class GraphLinks(UserDict):
         to_unlink = []  # for forcing dst
 
         def chk_dst(d, do):
-            if any((d == d0 for _, d0, _ in self.iter_dsts())):
+            if d in self.data.dst_index:
                 if force:
                     to_unlink.append(d)
                 else:
@@ -894,6 +958,22 @@ class GraphLinks(UserDict):
         adjust = lambda pid: (pid[0], pid[1] + len, pid[2])
         self._modify_pad_ids(select, adjust)
 
+    def adjust_pad_ids(self, cid, fid, pos, len):
+        """adjust pad id to insert/remove pads of a filter
+
+        :param cid: target chain position in fg
+        :type cid: int
+        :param fid: target filter position in the chain
+        :type fid: int
+        :param pos: first pad position to be shifted
+        :type pos: int
+        :param len: number of pads to be inserted (if positive) or removed (if negative)
+        :type len: int
+        """
+        select = lambda pid: pid[0] == cid and pid[1] == fid and pid[2] >= pos
+        adjust = lambda pid: (pid[0], pid[1], pid[2] + len)
+        self._modify_pad_ids(select, adjust)
+
     def del_chain(self, cid):
         """delete all links involving specified chain
 
@@ -921,7 +1001,7 @@ class GraphLinks(UserDict):
                     else new_dsts  # mutiple survived
                 )
 
-            return True  # output label, not from cid
+            return None  # output label, not from cid
 
         self.data = {
             label: (dst, src)
@@ -931,3 +1011,80 @@ class GraphLinks(UserDict):
             )
             if dst is not False
         }
+
+
+class _IndexedLinks(dict):
+    # link label: (dst(s), src) dict, maintaining the reverse lookup indexes
+    # dst_index - dst pad id: label
+    # src_index - src pad id: {label: None} (insertion-ordered set of labels)
+
+    def __init__(self, items=()):
+        super().__init__()
+        self.dst_index = {}
+        self.src_index = {}
+        for label, value in dict(items).items():
+            self[label] = value
+
+    def __reduce__(self):
+        return (self.__class__, (dict(self),))
+
+    def _add_index(self, label, value):
+        if value is None:  # placeholder
+            return
+        dsts, src = value
+        for d in GraphLinks.iter_dst_ids(dsts):
+            if d is not None:
+                self.dst_index[d] = label
+        if src is not None:
+            self.src_index.setdefault(src, {})[label] = None
+
+    def _remove_index(self, label, value):
+        if value is None:
+            return
+        dsts, src = value
+        for d in GraphLinks.iter_dst_ids(dsts):
+            if d is not None and self.dst_index.get(d, None) == label:
+                del self.dst_index[d]
+        if src is not None:
+            labels = self.src_index.get(src, None)
+            if labels is not None:
+                labels.pop(label, None)
+                if not labels:
+                    del self.src_index[src]
+
+    def __setitem__(self, label, value):
+        self._remove_index(label, super().get(label, None))
+        super().__setitem__(label, value)
+        self._add_index(label, value)
+
+    def __delitem__(self, label):
+        self._remove_index(label, self[label])
+        super().__delitem__(label)
+
+    def pop(self, label, *default):
+        if label in self:
+            value = self[label]
+            del self[label]
+            return value
+        if default:
+            return default[0]
+        raise KeyError(label)
+
+    def popitem(self):
+        label, value = super().popitem()
+        self._remove_index(label, value)
+        return label, value
+
+    def setdefault(self, label, default=None):
+        if label not in self:
+            self[label] = default
+        return self[label]
+
+    def update(self, *args, **kwargs):
+        for label, value in dict(*args, **kwargs).items():
+            self[label] = value
+
+    def clear(self):
+        super().clear()
+        self.dst_index.clear()
+        self.src_index.clear()
@@ -1,6 +1,8 @@
 from fractions import Fraction
 import re, itertools
 from collections.abc import Sequence
+from functools import lru_cache
+from types import MappingProxyType
 from .. import utils
 
 # Filter string parser/composer
@@ -16,16 +18,36 @@ _re_args = re.compile(r"\s*(?<!\\)(?:\\\\)*\:\s*")
 _re_esc = re.compile(r"\\(.)")
 _re_args_kw = re.compile(r"\s*([a-zA-Z0-9_]+)\s*=\s*(.+)\s*")
 
+# The parsers are memoized and return immutable results (tuples and read-only
+# dicts). The public functions return mutable copies unless frozen=True.
 
-def parse_filter_args(expr):
+
+def _freeze_args(args):
+    return tuple(MappingProxyType(a) if isinstance(a, dict) else a for a in args)
+
+
+def _thaw_args(args):
+    return [dict(a) if isinstance(a, MappingProxyType) else a for a in args]
+
+
+def parse_filter_args(expr, frozen=False):
     """parse filter argument string
 
     :param expr: filter argument string
     :type expr: str
+    :param frozen: True to return the memoized immutable result, defaults to False
+    :type frozen: bool, optional
     :return: list of argument strings; last element may be a dict of key-value pairs
-    :rtype: list of str + dict
+    :rtype: list of str + dict (tuple of str + read-only dict if frozen)
     """
 
+    args = _parse_filter_args(expr)
+    return args if frozen else _thaw_args(args)
+
+
+@lru_cache(maxsize=4096)
+def _parse_filter_args(expr):
+
     def conv_val(s):
         # convert a numeric option value
         try:
@@ -82,7 +104,7 @@ def parse_filter_args(expr):
         kwargs = {k: v for k, v in (get_kw(arg) for arg in all_args[ikw:])}
         args = [*args, kwargs]
 
-    return args
+    return _freeze_args(args)
 
 
 def compose_filter_args(*args):
@@ -136,16 +158,25 @@ def compose_filter_args(*args):
 ###################################################################################################
 
 
-def parse_filter(expr):
+def parse_filter(expr, frozen=False):
     """Parse FFmpeg filter expression
 
     :param expr: filter expression, escaped special characters once
     :type expr: str
+    :param frozen: True to return the memoized immutable result (the option
+                   dict is read-only), defaults to False
+    :type frozen: bool, optional
     :return: filter name followed by arguments, followed by a dict containing id string
              (empty if id not given)
     :rtype: tuple(str, *args, {['id':str]})
     """
 
+    spec = _parse_filter(expr)
+    return spec if frozen else (spec[0], *_thaw_args(spec[1:]))
+
+
+@lru_cache(maxsize=4096)
+def _parse_filter(expr):
     m = _re_name_id.match(expr, 0)
 
     if not m:
@@ -157,7 +188,7 @@ def parse_filter(expr):
     s_args = expr[m.end() :]
 
     try:
-        args = parse_filter_args(s_args) if s_args else []
+        args = _parse_filter_args(s_args) if s_args else ()
     except:
         raise ValueError(f'"{expr}" is not a valid filter expression.')
 
@@ -189,11 +220,14 @@ def compose_filter(name, *args):
 # FILTERGRAPH PARSER/COMPOSER
 
 
-def parse_graph(expr):
+def parse_graph(expr, frozen=False):
     """parse filter graph expression
 
     :param expr: twice-escaped filter graph string
     :type expr: str
+    :param frozen: True to return the memoized immutable result (tuples in place
+                   of lists and read-only dicts), defaults to False
+    :type frozen: bool, optional
     :return: tuple of unescaped filter graph blob, input labels, output labels, chain links, and sws_flags list
     :rtype: (list of list of (name, args, id), dict, dict, dict, list)
     :return: tuple of unescaped filter graph blob, pad link map, and sws_flags list
@@ -217,6 +251,22 @@ def parse_graph(expr):
 
     """
 
+    fg, links, sws_flags = _parse_graph(expr)
+    if frozen:
+        return fg, links, sws_flags
+
+    return (
+        [[(f[0], *_thaw_args(f[1:])) for f in fc] for fc in fg],
+        {
+            k: [list(dst) if dst is not None and isinstance(dst[0], tuple) else dst, src]
+            for k, (dst, src) in links.items()
+        },
+        None if sws_flags is None else _thaw_args(sws_flags),
+    )
+
+
+@lru_cache(maxsize=1024)
+def _parse_graph(expr):
     links = {}
 
     def add_pad(label, output, *padspec):
@@ -257,7 +307,7 @@ def parse_graph(expr):
     # get scale flags if given
     m = re.match(r"\s*sws_flags=(.+?);", expr)
     if m:
-        sws_flags = parse_filter_args(m[1])
+        sws_flags = _parse_filter_args(m[1])
         i = m.end()
     else:
         sws_flags = None
@@ -281,7 +331,7 @@ def parse_graph(expr):
             i = parse_labels(expr, j - 1, bool(fs), cid, fid)  # grab all labels
             if i == n:
                 # add new filter to the chain
-                fc.append(parse_filter(fs))
+                fc.append(_parse_filter(fs))
 
                 # if new chain, add it to the graph
                 if not fid:
@@ -303,7 +353,7 @@ def parse_graph(expr):
             else:
 
                 # add new filter to the chain
-                fc.append(parse_filter(fs))
+                fc.append(_parse_filter(fs))
 
                 # if new chain, add it to the graph
                 if not fid:
@@ -318,6 +368,14 @@ def parse_graph(expr):
                     fid += 1
                 fs = ""
 
+    # freeze the results
+    fg = tuple(tuple(fc) for fc in fg)
+    links = MappingProxyType(
+        {
+            k: (tuple(dst) if isinstance(dst, list) else dst, src)
+            for k, (dst, src) in links.items()
+        }
+    )
     return (fg, links, sws_flags)
 
 
@@ -0,0 +1,324 @@
+"""caches of ffprobe results
+
+:py:class:`ProbeMemoryCache` is the in-process cache, which stores the results
+as immutable (frozen) objects so they can be shared among threads without
+copying. It is bounded by the approximate memory footprint of the entries.
+
+:py:class:`ProbeDiskCache` is the persistent cache. It is a SQLite database,
+which can be shared by multiple threads and processes. Each entry is keyed by
+the real path, size, and modification time (in ns) of the media file and the
+signature of the ffprobe executable, and the least-recently-used entries are
+evicted once the number of entries exceeds the limit.
+"""
+
+import pickle, sqlite3, sys, threading
+from collections import OrderedDict
+from types import MappingProxyType
+from time import time
+import logging
+
+logger = logging.getLogger("ffmpegio")
+
+__all__ = ["ProbeMemoryCache", "ProbeDiskCache", "freeze", "thaw"]
+
+
+def freeze(obj):
+    """convert dicts and lists to read-only mapping proxies and tuples
+
+    :param obj: object to freeze (e.g., ffprobe results)
+    :type obj: Any
+    :return: frozen object
+    :rtype: Any
+    """
+    if isinstance(obj, dict):
+        return MappingProxyType({k: freeze(v) for k, v in obj.items()})
+    if isinstance(obj, list):
+        return tuple(freeze(v) for v in obj)
+    return obj
+
+
+def thaw(obj):
+    """convert frozen mapping proxies and tuples back to dicts and lists
+
+    :param obj: object frozen by :py:func:`freeze`
+    :type obj: Any
+    :return: mutable copy of the object
+    :rtype: Any
+    """
+    if isinstance(obj, (dict, MappingProxyType)):
+        return {k: thaw(v) for k, v in obj.items()}
+    if isinstance(obj, tuple):
+        return [thaw(v) for v in obj]
+    return obj
+
+
+def _sizeof(obj):
+    # approximate memory footprint of a frozen object
+    if isinstance(obj, MappingProxyType):
+        return sys.getsizeof(obj) + sum(
+            sys.getsizeof(k) + _sizeof(v) for k, v in obj.items()
+        )
+    if isinstance(obj, tuple):
+        return sys.getsizeof(obj) + sum(_sizeof(v) for v in obj)
+    return sys.getsizeof(obj)
+
+
+class ProbeMemoryCache:
+    """thread-safe LRU cache of frozen ffprobe results
+
+    :param max_bytes: approximate maximum memory footprint of the cached
+                      results, defaults to 16 MiB
+    :type max_bytes: int, optional
+
+    Each entry is validated by a signature (e.g., file size and mtime), and
+    an entry with a mismatched signature is treated as a miss.
+    """
+
+    def __init__(self, max_bytes=16 * 2**20):
+        self.max_bytes = max_bytes  #:int: approximate memory budget in bytes
+        self.nbytes = 0  #:int: approximate memory footprint of the entries
+        self.hits = 0  #:int: number of cache hits
+        self.misses = 0  #:int: number of cache misses
+        self._entries = OrderedDict()  # key: (signature, frozen value, nbytes)
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key, signature):
+        """get the cached value
+
+        :param key: entry key (e.g., url)
+        :type key: Hashable
+        :param signature: expected signature of the entry
+        :type signature: Any
+        :return: frozen value or None if not found
+        :rtype: Any
+        """
+        with self._lock:
+            entry = self._entries.get(key, None)
+            if entry is None or entry[0] != signature:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)  # refresh the entry position
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key, signature, value):
+        """store a value
+
+        :param key: entry key (e.g., url)
+        :type key: Hashable
+        :param signature: signature of the entry
+        :type signature: Any
+        :param value: value to cache
+        :type value: Any
+        :return: frozen value
+        :rtype: Any
+        """
+        value = freeze(value)
+        nbytes = _sizeof(value)
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.nbytes -= old[2]
+            if nbytes <= self.max_bytes:
+                self._entries[key] = (signature, value, nbytes)
+                self.nbytes += nbytes
+                # evict the least recently used entries
+                while self.nbytes > self.max_bytes:
+                    self.nbytes -= self._entries.popitem(False)[1][2]
+        return value
+
+    def clear(self):
+        """remove all the entries"""
+        with self._lock:
+            self._entries.clear()
+            self.nbytes = 0
+
+    def stats(self):
+        """get cache statistics
+
+        :return: dict with "hits", "misses", "entries", and "nbytes"
+        :rtype: dict
+        """
+        with self._lock:
+            return dict(
+                hits=self.hits,
+                misses=self.misses,
+                entries=len(self._entries),
+                nbytes=self.nbytes,
+            )
+
+
+_where_key = "path=? AND size=? AND mtime_ns=? AND version=?"
+
+
+class ProbeDiskCache:
+    """SQLite-backed cross-process cache of ffprobe results
+
+    :param path: path of the database file
+    :type path: str
+    :param max_entries: maximum number of entries to keep, defaults to 65536
+    :type max_entries: int, optional
+    :param timeout: seconds to wait for a lock held by other process, defaults to 30.0
+    :type timeout: float, optional
+
+    The cached values are pickled, so the database must only be shared among
+    trusted users.
+    """
+
+    #: int: number of insertions between the checks of the number of entries
+    evict_interval = 64
+
+    #: float: minimum seconds between the access time updates of an entry
+    touch_interval = 60.0
+
+    def __init__(self, path, max_entries=65536, timeout=30.0):
+        self.path = path  #:str: path of the database file
+        self.max_entries = max_entries  #:int: maximum number of entries
+        self.timeout = timeout  #:float: lock timeout in seconds
+        self.hits = 0  #:int: number of cache hits in this process
+        self.misses = 0  #:int: number of cache misses in this process
+        self._local = threading.local()  # per-thread connection
+        self._dbs = set()  # open connections of all the threads
+        self._nput = 0  # insertions since the last eviction check
+        self._lock = threading.Lock()  # guards the counters
+
+        with self._connect() as db:
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS probe ("
+                "path TEXT NOT NULL, size INTEGER NOT NULL, mtime_ns INTEGER NOT NULL,"
+                "version TEXT NOT NULL, data BLOB NOT NULL, atime REAL NOT NULL,"
+                "PRIMARY KEY (path, size, mtime_ns, version))"
+            )
+            db.execute("CREATE INDEX IF NOT EXISTS probe_atime ON probe (atime)")
+
+    def _connect(self):
+        # sqlite3 connections cannot be shared across threads
+        db = getattr(self._local, "db", None)
+        if db is None or db not in self._dbs:
+            # new thread or the connection was closed by close()
+            db = self._local.db = sqlite3.connect(
+                self.path,
+                timeout=self.timeout,
+                isolation_level=None,
+                check_same_thread=False,
+            )
+            with self._lock:
+                self._dbs.add(db)
+            try:
+                # readers do not block the writer and vice versa
+                db.execute("PRAGMA journal_mode=WAL")
+                db.execute("PRAGMA synchronous=NORMAL")
+            except sqlite3.OperationalError:
+                # e.g., on network file systems
+                pass
+        return db
+
+    def _count(self, hit):
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def get(self, key):
+        """get cached value
+
+        :param key: (realpath, size, mtime_ns, version) key
+        :type key: tuple
+        :return: cached value or None if not found
+        :rtype: Any
+        """
+        db = self._connect()
+        try:
+            sql = f"SELECT data, atime FROM probe WHERE {_where_key}"
+            row = db.execute(sql, key).fetchone()
+            now = time()
+            if row is not None and now - row[1] > self.touch_interval:
+                # refresh LRU position (lazily to avoid a write on every hit)
+                sql = f"UPDATE probe SET atime=? WHERE {_where_key}"
+                db.execute(sql, (now, *key))
+        except sqlite3.Error as e:
+            logger.warning(f"[probe cache] failed to read from {self.path}: {e}")
+            row = None
+
+        self._count(row is not None)
+        return None if row is None else pickle.loads(row[0])
+
+    def put(self, key, value):
+        """store value
+
+        :param key: (realpath, size, mtime_ns, version) key
+        :type key: tuple
+        :param value: value to cache (must be picklable)
+        :type value: Any
+        """
+        db = self._connect()
+        try:
+            db.execute(
+                "INSERT OR REPLACE INTO probe VALUES (?,?,?,?,?,?)",
+                (*key, pickle.dumps(value), time()),
+            )
+        except sqlite3.Error as e:
+            logger.warning(f"[probe cache] failed to write to {self.path}: {e}")
+            return
+
+        with self._lock:
+            self._nput += 1
+            check = self._nput >= self.evict_interval
+            if check:
+                self._nput = 0
+        if check:
+            self.evict()
+
+    def evict(self):
+        """remove the least-recently-used entries in excess of max_entries"""
+        db = self._connect()
+        try:
+            n = db.execute("SELECT COUNT(*) FROM probe").fetchone()[0]
+            n -= self.max_entries
+            if n > 0:
+                db.execute(
+                    "DELETE FROM probe WHERE rowid IN "
+                    "(SELECT rowid FROM probe ORDER BY atime LIMIT ?)",
+                    (n,),
+                )
+        except sqlite3.Error as e:
+            logger.warning(f"[probe cache] failed to evict entries: {e}")
+
+    def clear(self):
+        """remove all the entries"""
+        try:
+            self._connect().execute("DELETE FROM probe")
+        except sqlite3.Error as e:
+            logger.warning(f"[probe cache] failed to clear {self.path}: {e}")
+        with self._lock:
+            self.hits = self.misses = 0
+
+    def stats(self):
+        """get cache statistics
+
+        :return: dict with "hits" and "misses" (this process), "entries" (in
+                 the database, None if failed to count), and "path" (database
+                 file)
+        :rtype: dict
+        """
+        try:
+            n = self._connect().execute("SELECT COUNT(*) FROM probe").fetchone()[0]
+        except sqlite3.Error as e:
+            logger.warning(f"[probe cache] failed to read from {self.path}: {e}")
+            n = None
+        return dict(hits=self.hits, misses=self.misses, entries=n, path=self.path)
+
+    def close(self):
+        """close the connections of all the threads"""
+        with self._lock:
+            dbs = self._dbs
+            self._dbs = set()
+        for db in dbs:
+            try:
+                db.close()
+            except sqlite3.Error as e:
+                logger.warning(f"[probe cache] failed to close {self.path}: {e}")
@@ -1,4 +1,10 @@
-import warnings
+import warnings, logging
+from bisect import bisect_right
+from math import ceil
+from os import path as _path, cpu_count as _os_cpu_count
+
+logger = logging.getLogger("ffmpegio")
+
 from . import (
     ffmpegprocess as fp,
     utils,
@@ -10,7 +16,76 @@ from . import (
 )
 from .utils import log as log_utils
 
-__all__ = ["create", "read", "write", "filter", "detect"]
+__all__ = ["create", "read", "read_segments", "write", "filter", "detect"]
+
+
+def _plan_segments(ffmpeg_args, parallel):
+    """split video read into keyframe-aligned segments
+
+    :param ffmpeg_args: FFmpeg arguments of the whole read
+    :type ffmpeg_args: dict
+    :param parallel: number of concurrent FFmpeg processes
+    :type parallel: int
+    :return: list of input options, output options, and number of frames of the
+             segments or None if the read cannot be split frame-exactly
+    :rtype: list(tuple(dict, dict, int)) or None
+
+    The numbers of frames are counted from the packets. Each segment but the
+    last is bounded by its duration, so its decoded frames can be checked
+    against the count, while the last segment decodes all the remaining
+    frames (hence its count is only an estimate).
+    """
+
+    if not parallel or parallel < 2:
+        return None
+
+    url, inopts = ffmpeg_args["inputs"][0]
+    outopts = ffmpeg_args["outputs"][0][1] or {}
+    inopts = inopts or {}
+
+    # only the whole stream w/out frame rate change can be split
+    if (
+        len(ffmpeg_args["inputs"]) != 1
+        or not isinstance(url, str)
+        or not _path.isfile(url)
+        or any(k in inopts for k in ("ss", "sseof", "t", "to", "itsoffset"))
+        or any(k in outopts for k in ("ss", "t", "to", "r", "frames:v", "vframes"))
+        or configure.has_filtergraph(ffmpeg_args, "video")
+    ):
+        return None
+
+    try:
+        index = probe.index(url, "v:0")
+    except Exception as e:
+        logger.debug(f"[video] failed to index {url}: {e}")
+        return None
+
+    pts = index["pts"]
+    keyframes = index["keyframes"]
+    nframes = len(pts)
+    if not len(keyframes) or keyframes[0] != 0:
+        return None
+
+    # segments start at the keyframes closest to the equal split points
+    nseg = parallel * 4
+    starts = sorted(
+        {keyframes[bisect_right(keyframes, i * nframes // nseg) - 1] for i in range(nseg)}
+    )
+    tb = index["time_base"]
+    t0 = index["start_time"]
+
+    def seg_inopts(i):
+        # seek to the time (in microseconds) at or after the keyframe
+        return {"ss": ceil((float(pts[i] * tb) - t0) * 1e6) / 1e6} if i else {}
+
+    def seg_outopts(i0, i1):
+        # duration till the next segment
+        return {"t": float((pts[i1] - pts[i0]) * tb)} if i1 < nframes else {}
+
+    return [
+        (seg_inopts(i0), seg_outopts(i0, i1), i1 - i0)
+        for i0, i1 in zip(starts, [*starts[1:], nframes])
+    ]
 
 
 def _run_read(
@@ -21,6 +96,8 @@ def _run_read(
     s_in=None,
     show_log=None,
     sp_kwargs=None,
+    parallel=None,
+    segmented=False,
     **kwargs,
 ):
     """run FFmpeg and retrieve audio stream data
@@ -40,6 +117,12 @@ def _run_read(
                       `subprocess.Popen()` call used to run the FFmpeg, defaults
                       to None
     :type sp_kwargs: dict, optional
+    :param parallel: number of concurrent FFmpeg processes to decode keyframe-aligned
+                     segments, defaults to None (single process)
+    :type parallel: int, optional
+    :param segmented: True to return an iterator of the data of the segments,
+                      defaults to False
+    :type segmented: bool, optional
     :param \\**kwargs: All additional keyword arguments to call `ffmpegprocess.run`.
                        These keywords take precedence over `sp_kwargs`.
     :type \\**kwargs: dict, optional
@@ -54,6 +137,34 @@ def _run_read(
     if sp_kwargs is not None:
         kwargs = {**sp_kwargs, **kwargs}
 
+    segments = (
+        None if shape is None or r is None else _plan_segments(args[0], parallel)
+    )
+    if segments is not None:
+        to_video = plugins.get_hook().bytes_to_video
+        samplesize = utils.get_samplesize(shape, dtype)
+        popen_kwargs = {
+            k: v
+            for k, v in kwargs.items()
+            if k not in ("progress", "stdin", "input") and v is not None
+        }
+        if segmented:
+            return r, (
+                to_video(b=b, dtype=dtype, shape=shape, squeeze=False)
+                for b in fp.iter_segments(
+                    args[0], segments, samplesize, parallel, **popen_kwargs
+                )
+            )
+
+        b, counts = fp.run_segments(
+            args[0], segments, samplesize, parallel, **popen_kwargs
+        )
+        if counts == [n for _, _, n in segments]:
+            return r, to_video(b=b, dtype=dtype, shape=shape, squeeze=False)
+        logger.warning(
+            "[video] segmented read did not produce expected frames, reading in a single process"
+        )
+
     if shape is None or r is None:
         configure.clear_loglevel(args[0])
 
@@ -74,9 +185,11 @@ def _run_read(
         )
         if out.returncode:
             raise FFmpegError(out.stderr)
-    return r, plugins.get_hook().bytes_to_video(
+
+    data = plugins.get_hook().bytes_to_video(
         b=out.stdout, dtype=dtype, shape=shape, squeeze=False
     )
+    return r, iter((data,)) if segmented else data
 
 
 def create(expr, *args, progress=None, show_log=None, sp_kwargs=None, **options):
@@ -142,27 +255,8 @@ def create(expr, *args, progress=None, show_log=None, sp_kwargs=None, **options)
     )
 
 
-def read(url, progress=None, show_log=None, sp_kwargs=None, **options):
-    """Read video frames
-
-    :param url: URL of the video file to read.
-    :type url: str
-    :param progress: progress callback function, defaults to None
-    :type progress: callable object, optional
-    :param show_log: True to show FFmpeg log messages on the console,
-                     defaults to None (no show/capture)
-                     Ignored if stream format must be retrieved automatically.
-    :type show_log: bool, optional
-    :param sp_kwargs: dictionary with keywords passed to `subprocess.run()` or
-                      `subprocess.Popen()` call used to run the FFmpeg, defaults
-                      to None
-    :type sp_kwargs: dict, optional
-    :param \\**options: FFmpeg options, append '_in' for input option names (see :doc:`options`)
-    :type \\**options: dict, optional
-
-    :return: frame rate and video frame data, created by `bytes_to_video` plugin hook
-    :rtype: (fractions.Fraction, object)
-    """
+def _config_read(url, sp_kwargs, seek_index, options):
+    # configure video read operation
 
     pix_fmt = options.get("pix_fmt", None)
 
@@ -188,11 +282,65 @@ def read(url, progress=None, show_log=None, sp_kwargs=None, **options):
     configure.add_url(ffmpeg_args, "input", url, input_options)
     configure.add_url(ffmpeg_args, "output", "-", options)
 
+    # seek to the keyframe using the packet index
+    configure.finalize_video_seek_opts(ffmpeg_args, seek_index)
+
     # override user specified stdin and input if given
     sp_kwargs = {**sp_kwargs} if sp_kwargs else {}
     sp_kwargs["stdin"] = stdin
     sp_kwargs["input"] = input
 
+    return ffmpeg_args, pix_fmt_in, s_in, r_in, sp_kwargs
+
+
+def read(
+    url,
+    progress=None,
+    show_log=None,
+    sp_kwargs=None,
+    seek_index=None,
+    parallel=None,
+    **options,
+):
+    """Read video frames
+
+    :param url: URL of the video file to read.
+    :type url: str
+    :param progress: progress callback function, defaults to None
+    :type progress: callable object, optional
+    :param show_log: True to show FFmpeg log messages on the console,
+                     defaults to None (no show/capture)
+                     Ignored if stream format must be retrieved automatically.
+    :type show_log: bool, optional
+    :param sp_kwargs: dictionary with keywords passed to `subprocess.run()` or
+                      `subprocess.Popen()` call used to run the FFmpeg, defaults
+                      to None
+    :type sp_kwargs: dict, optional
+    :param seek_index: True to build (if needed) and use the packet index of the
+                       video stream (see :py:func:`probe.index`) to seek directly
+                       to the keyframe or the index itself, defaults to None (not
+                       to use the index)
+    :type seek_index: bool or dict, optional
+    :param parallel: number of concurrent FFmpeg processes to decode the video in
+                     keyframe-aligned segments, defaults to None (single process)
+    :type parallel: int, optional
+    :param \\**options: FFmpeg options, append '_in' for input option names (see :doc:`options`)
+    :type \\**options: dict, optional
+
+    :return: frame rate and video frame data, created by `bytes_to_video` plugin hook
+    :rtype: (fractions.Fraction, object)
+
+    .. note:: The `parallel` option splits the video only if the entire video stream
+        of a local file is read without seeking, duration, frame-rate, or filter
+        options and the output frame format is known in advance. Otherwise, or if
+        the segments fail to produce the exact number of frames, the video is
+        read by a single FFmpeg process.
+    """
+
+    ffmpeg_args, pix_fmt_in, s_in, r_in, sp_kwargs = _config_read(
+        url, sp_kwargs, seek_index, options
+    )
+
     return _run_read(
         ffmpeg_args,
         progress=progress,
@@ -201,6 +349,56 @@ def read(url, progress=None, show_log=None, sp_kwargs=None, **options):
         s_in=s_in,
         r_in=r_in,
         sp_kwargs=sp_kwargs,
+        parallel=parallel,
+    )
+
+
+def read_segments(
+    url, parallel=None, show_log=None, sp_kwargs=None, seek_index=None, **options
+):
+    """Read video frames in keyframe-aligned segments decoded concurrently
+
+    :param url: URL of the video file to read.
+    :type url: str
+    :param parallel: number of concurrent FFmpeg processes, defaults to None
+                     (= number of CPUs)
+    :type parallel: int, optional
+    :param show_log: True to show FFmpeg log messages on the console,
+                     defaults to None (no show/capture)
+                     Ignored if stream format must be retrieved automatically.
+    :type show_log: bool, optional
+    :param sp_kwargs: dictionary with keywords passed to `subprocess.run()` or
+                      `subprocess.Popen()` call used to run the FFmpeg, defaults
+                      to None
+    :type sp_kwargs: dict, optional
+    :param seek_index: packet index option, see :py:func:`read`, defaults to None
+    :type seek_index: bool or dict, optional
+    :param \\**options: FFmpeg options, append '_in' for input option names (see :doc:`options`)
+    :type \\**options: dict, optional
+    :return: frame rate and iterator of the video frame data of the segments in order,
+             created by `bytes_to_video` plugin hook
+    :rtype: (fractions.Fraction, Iterator[object])
+
+    While a segment is yielded, up to `parallel` following segments are decoded
+    ahead. The concatenation of the segments is frame-exact to :py:func:`read`
+    output. If the read cannot be split (e.g., a filter or seek option is
+    specified or the video format cannot be determined in advance), a single
+    segment with the entire video is yielded.
+    """
+
+    ffmpeg_args, pix_fmt_in, s_in, r_in, sp_kwargs = _config_read(
+        url, sp_kwargs, seek_index, options
+    )
+
+    return _run_read(
+        ffmpeg_args,
+        show_log=show_log,
+        pix_fmt_in=pix_fmt_in,
+        s_in=s_in,
+        r_in=r_in,
+        sp_kwargs=sp_kwargs,
+        parallel=max(parallel or _os_cpu_count(), 2),
+        segmented=True,
     )
 
 
@@ -0,0 +1,123 @@
+"""microbenchmark of the AVI demuxer
+
+Run as a script: python tests/benchmarks/bench_avi.py
+
+Demuxes synthetic AVI streams with a small video (160x90 rgb24 @ 60 fps and
+16x9 rgb24 @ 240 fps) interleaved with 48 kHz stereo audio in 1-frame chunks,
+and compares the per-chunk read_frame() loop, AviReader.readall(), and the batch
+demux of AviReader.read_batch(), as well as AviReaderThread with and without
+batching.
+"""
+
+import io, struct
+from timeit import repeat
+
+from ffmpegio import threading
+from ffmpegio.utils import avi
+
+
+def chunk(id, data):
+    return id + struct.pack("<I", len(data)) + data + b"\0" * (len(data) % 2)
+
+
+def list_(type, data, id=b"LIST"):
+    return id + struct.pack("<I", len(data) + 4) + type + data
+
+
+def make_avi(nframes=1200, width=160, height=90, rate=60, sample_rate=48000):
+    strh = "<4s4sI2H8I4h"
+    hdrl = chunk(b"avih", struct.pack("<10I", *(0,) * 6, 2, 0, width, height))
+    hdrl += list_(
+        b"strl",
+        chunk(
+            b"strh",
+            struct.pack(strh, b"vids", b"\0" * 4, *(0,) * 4, 1, rate, *(0,) * 9),
+        )
+        + chunk(
+            b"strf",
+            struct.pack(
+                "<IiiHH4sIiiII", 40, width, -height, 1, 24, b"\0" * 4, *(0,) * 5
+            ),
+        ),
+    )
+    hdrl += list_(
+        b"strl",
+        chunk(
+            b"strh",
+            struct.pack(strh, b"auds", b"\0" * 4, *(0,) * 4, 1, sample_rate, *(0,) * 9),
+        )
+        + chunk(
+            b"strf",
+            struct.pack("<HHIIHH", 1, 2, sample_rate, sample_rate * 4, 4, 16),
+        ),
+    )
+    v = chunk(b"00dc", bytes(width * height * 3))
+    a = chunk(b"01wb", bytes(sample_rate // rate * 4))
+    movi = (v + a) * nframes
+    return list_(b"AVI ", list_(b"hdrl", hdrl) + list_(b"movi", movi), b"RIFF")
+
+
+def per_chunk(b):
+    f = io.BytesIO(b)
+    avi.read_header(f)
+    data = {0: [], 1: []}
+    while True:
+        try:
+            i, frame = avi.read_frame(f)
+        except:
+            break
+        data[i].append(frame)
+    return {k: b"".join(v) for k, v in data.items()}
+
+
+def readall(b):
+    reader = avi.AviReader()
+    reader.start(io.BytesIO(b))
+    return reader.readall()
+
+
+def batch(b):
+    reader = avi.AviReader()
+    reader.start(io.BytesIO(b))
+    data = {0: [], 1: []}
+    while True:
+        frames = reader.read_batch()
+        if frames is None:
+            break
+        for k, v in frames.items():
+            data[k].extend(v)
+    return data
+
+
+def thread(b, batchsize=None):
+    reader = threading.AviReaderThread(batchsize=batchsize)
+    reader.start(io.BytesIO(b))
+    out = reader.readall()
+    reader.join()
+    return out
+
+
+def bench(label, stmt, number=5):
+    t = min(repeat(stmt, number=number, repeat=3)) / number
+    print(f"{label:<32}{t*1e3:10.1f} ms")
+    return t
+
+
+def run_all(b):
+    t0 = bench("read_frame() loop", lambda: per_chunk(b))
+    t1 = bench("AviReader.readall()", lambda: readall(b))
+    t2 = bench("AviReader.read_batch()", lambda: batch(b))
+    print(f"  speedup: {t0/t1:.1f}x (readall), {t0/t2:.1f}x (batch)")
+
+    t0 = bench("AviReaderThread", lambda: thread(b))
+    t1 = bench("AviReaderThread (batch)", lambda: thread(b, 2**22))
+    print(f"  speedup: {t0/t1:.1f}x")
+
+
+if __name__ == "__main__":
+    for nframes, width, height, rate in ((1200, 160, 90, 60), (12000, 16, 9, 240)):
+        b = make_avi(nframes, width, height, rate)
+        print(
+            f"\n{width}x{height} @ {rate} fps: {len(b)/2**20:.1f} MiB, {2*nframes} chunks"
+        )
+        run_all(b)
@@ -0,0 +1,83 @@
+"""microbenchmark of filtergraph parsing and composition
+
+Run as a script: python tests/benchmarks/bench_filtergraph.py
+
+Compares the cold (cache cleared) and memoized parsing of a 100-filter
+filtergraph expression, the first and the repeated str(Graph), and the
+construction of a 1000-chain Graph with the binary vs. in-place operator.
+"""
+
+from timeit import repeat
+
+from ffmpegio.filtergraph import Filter, Graph
+from ffmpegio.utils import filter as filter_utils
+
+
+def make_expr(nchains=25):
+    # 4 filters per chain: 100 filters in total
+    chains = [
+        f"[{i}:v]scale=w={320+i}:h=240:flags=bicubic,crop=w=300:h=200:x={i}:y=0,"
+        f"setpts=PTS-STARTPTS,format=pix_fmts=yuv420p[v{i}]"
+        for i in range(nchains)
+    ]
+    return ";".join(chains)
+
+
+def clear_caches():
+    filter_utils._parse_graph.cache_clear()
+    filter_utils._parse_filter.cache_clear()
+    filter_utils._parse_filter_args.cache_clear()
+
+
+def cold(func):
+    # run func with empty parser caches
+    def stmt():
+        clear_caches()
+        func()
+
+    return stmt
+
+
+def stack_chains(inplace, nchains=1000):
+    fg = Graph()
+    for i in range(nchains):
+        f = Filter("scale", 320 + i, -1)
+        if inplace:
+            fg |= f
+        else:
+            fg = fg | f
+    return fg
+
+
+def bench(label, stmt, number=200):
+    t = min(repeat(stmt, number=number, repeat=5)) / number
+    print(f"{label:<32}{t*1e6:10.1f} us")
+    return t
+
+
+if __name__ == "__main__":
+    expr = make_expr()
+
+    t0 = bench("parse_graph (cold)", cold(lambda: filter_utils.parse_graph(expr)))
+    t1 = bench("parse_graph (memoized)", lambda: filter_utils.parse_graph(expr))
+    t2 = bench(
+        "parse_graph (memoized, frozen)",
+        lambda: filter_utils.parse_graph(expr, frozen=True),
+    )
+    print(f"  speedup: {t0/t1:.1f}x (copy), {t0/t2:.1f}x (frozen)")
+
+    t0 = bench("Graph(expr) (cold)", cold(lambda: Graph(expr)))
+    t1 = bench("Graph(expr) (memoized)", lambda: Graph(expr))
+    print(f"  speedup: {t0/t1:.1f}x")
+
+    fg = Graph(expr)
+    t0 = bench(
+        "str(Graph) (uncached)",
+        lambda: (fg.__dict__.pop("_str_cache", None), str(fg)),
+    )
+    t1 = bench("str(Graph) (cached)", lambda: str(fg))
+    print(f"  speedup: {t0/t1:.1f}x")
+
+    t0 = bench("fg = fg | filter (x1000)", lambda: stack_chains(False), number=1)
+    t1 = bench("fg |= filter (x1000)", lambda: stack_chains(True), number=1)
+    print(f"  speedup: {t0/t1:.1f}x")
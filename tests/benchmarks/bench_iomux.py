@@ -0,0 +1,91 @@
+"""benchmark of the I/O multiplexer against the thread-per-pipe design
+
+Run as a script: python tests/benchmarks/bench_iomux.py
+
+Streams 4 MiB through each of N concurrent child processes, which echo stdin
+to stdout in 64 KiB blocks and log a progress line to stderr per block (like
+FFmpeg filtering a raw stream). The pipes are serviced either by dedicated
+WriterThread/ReaderThread/LoggerThread objects (3 threads per process) or by
+the IOMux counterparts served by a single IOMultiplexerThread. Reported are
+the wall time, the CPU time and the number of context switches of this
+process, and the peak number of threads.
+"""
+
+import resource, subprocess as sp, sys
+import threading as _threading
+from time import perf_counter, process_time
+
+from ffmpegio import threading
+
+CHILD = (
+    "import sys\n"
+    "n = 0\n"
+    "for b in iter(lambda: sys.stdin.buffer.read1(65536), b''):\n"
+    "    sys.stdout.buffer.write(b)\n"
+    "    sys.stdout.buffer.flush()\n"
+    "    n += len(b)\n"
+    "    sys.stderr.write(f'size={n}\\r')\n"
+    "    sys.stderr.flush()\n"
+)
+
+NBYTES = 2**22
+BLOCKSIZE = 2**16
+
+
+def run(nprocs, iomux):
+    classes = (
+        (threading.IOMuxWriter, threading.IOMuxReader, threading.IOMuxLogger)
+        if iomux
+        else (threading.WriterThread, threading.ReaderThread, threading.LoggerThread)
+    )
+    procs = [
+        sp.Popen([sys.executable, "-c", CHILD], stdin=sp.PIPE, stdout=sp.PIPE, stderr=sp.PIPE)
+        for _ in range(nprocs)
+    ]
+
+    ru0 = resource.getrusage(resource.RUSAGE_SELF)
+    t0, c0 = perf_counter(), process_time()
+
+    streams = []
+    for proc in procs:
+        writer = classes[0](proc.stdin)
+        reader = classes[1](proc.stdout, BLOCKSIZE)
+        reader.itemsize = 1
+        logger = classes[2](proc.stderr)
+        for t in (writer, reader, logger):
+            t.start()
+        streams.append((writer, reader, logger))
+    nthreads = _threading.active_count()
+
+    block = bytes(BLOCKSIZE)
+    nread = [0] * nprocs
+    for _ in range(NBYTES // BLOCKSIZE):
+        for writer, _, _ in streams:
+            writer.write(block)
+        for i, (_, reader, _) in enumerate(streams):
+            nread[i] += len(reader.read(0))  # whatever is available
+    for writer, _, _ in streams:
+        writer.join()
+    for i, (_, reader, _) in enumerate(streams):
+        nread[i] += len(reader.read_all())
+    for proc, (_, reader, logger) in zip(procs, streams):
+        proc.wait()
+        proc.stderr.close()
+        logger.join()
+        reader.join()
+
+    t, c = perf_counter() - t0, process_time() - c0
+    ru1 = resource.getrusage(resource.RUSAGE_SELF)
+    assert nread == [NBYTES] * nprocs
+    return t, c, ru1.ru_nvcsw - ru0.ru_nvcsw, ru1.ru_nivcsw - ru0.ru_nivcsw, nthreads
+
+
+if __name__ == "__main__":
+    print(f"{'':<22}{'wall':>10}{'cpu':>10}{'vol. cs':>10}{'invol. cs':>10}{'threads':>9}")
+    for nprocs in (8, 64):
+        for iomux in (False, True):
+            t, c, nvcsw, nivcsw, nthreads = run(nprocs, iomux)
+            label = f"{nprocs} procs, {'iomux' if iomux else 'threads'}"
+            print(
+                f"{label:<22}{t*1e3:8.0f}ms{c*1e3:8.0f}ms{nvcsw:10d}{nivcsw:10d}{nthreads:9d}"
+            )
@@ -1,10 +1,11 @@
 import pytest
 
-from ffmpegio.plugins import pm, rawdata_bytes, finder_win32
+from ffmpegio.plugins import pm, rawdata_bytes, finder_win32, initialize
 
 # test only with the base plugins
 @pytest.fixture(scope="session", autouse=True)
 def no_extra_plugins():
+    initialize()
     base_plugins = (rawdata_bytes, finder_win32)
     plugins = [p for p in pm.get_plugins() if p not in base_plugins and pm.get_name(p)!='finder_downloader']
     for p in plugins:
@@ -67,6 +67,25 @@ def test_read():
     # assert np.array_equal(x1, x2)
 
 
+def test_read_parallel(tmp_path, monkeypatch):
+    from ffmpegio import path
+
+    monkeypatch.setattr(path, "CACHE_DIR", str(tmp_path))
+
+    url = "tests/assets/testaudio-1m.mp3"
+    fs, x = audio.read(url, t=10)
+    flac_url = str(tmp_path / "test.flac")
+    audio.write(flac_url, fs, x)
+
+    fs, x = audio.read(flac_url)
+    fs1, x1 = audio.read(flac_url, parallel=4)
+    assert fs1 == fs and x1["shape"] == x["shape"]
+    assert x1["buffer"] == x["buffer"]
+
+    fs2, blocks = audio.read_segments(flac_url, parallel=4)
+    assert b"".join(bytes(blk["buffer"]) for blk in blocks) == x["buffer"]
+
+
 def test_read_write():
     url = "tests/assets/testaudio-1m.mp3"
     outext = ".flac"
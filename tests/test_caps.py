@@ -48,6 +48,74 @@ def test_options():
     pprint(caps.options('video',True))
     pprint(caps.options('per-file'))
 
+
+def test_snapshot(tmp_path, monkeypatch):
+    from ffmpegio import path
+
+    monkeypatch.setattr(path, "CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr(caps, "_snapshot_bin", None)  # force reload
+    pix_fmts = caps.pix_fmts()
+    caps.filter_info("scale")
+    caps.save_snapshot()
+    assert not caps._dirty
+
+    # new session must not run FFmpeg
+    def no_ffmpeg(gopts):
+        raise AssertionError(f"FFmpeg invoked: {gopts}")
+
+    monkeypatch.setattr(caps, "ffmpeg", no_ffmpeg)
+    monkeypatch.setattr(caps, "_snapshot_bin", None)
+    assert caps.pix_fmts() == pix_fmts
+    assert caps.filter_info("scale").name == "scale"
+
+
+def test_filter_options():
+    assert "scale" in caps.filter_options()
+    opts = caps.filter_options("scale")
+    assert [o.name for o in opts] == [o.name for o in caps.filter_info("scale").options]
+
+    info = caps.filters()["overlay"]
+    assert info.input_types == ("video", "video")
+    assert caps.filters()["split"].output_types is None
+
+
+
+def test_filter_options_shared_class(monkeypatch):
+    # excerpt of "ffmpeg -h full" (6.0): option sets are listed by the AVClass
+    # names, which may be shared by several filters
+    help_full = """AVFilter AVOptions:
+  enable            <string>     ..FVA.....T set enable expression
+
+(a)setpts AVOptions:
+  expr              <string>     ..FVA.....T Expression determining the frame timestamp (default "PTS")
+
+scale(2ref) AVOptions:
+  w                 <string>     ..FV.....T. Output video width
+  h                 <string>     ..FV.....T. Output video height
+
+scale2ref AVOptions:
+  w                 <string>     ..FV....... Output video width
+
+bass/lowshelf AVOptions:
+  frequency         <double>     ..F.A.....T set central frequency (from 0 to 999999) (default 100)
+
+framesync AVOptions:
+  shortest          <boolean>    ..FV....... force termination when the shortest input terminates (default false)
+
+AVBSFContext AVOptions:
+"""
+    names = ["setpts", "asetpts", "scale", "scale2ref", "bass", "lowshelf", "split"]
+    monkeypatch.setattr(caps, "_cache", {})
+    monkeypatch.setattr(caps, "SNAPSHOT", False)
+    monkeypatch.setattr(caps, "ffmpeg", lambda gopts: help_full)
+    monkeypatch.setattr(caps, "filters", lambda: dict.fromkeys(names))
+
+    data = caps.filter_options()
+    assert set(data) == {*names[:-1], "framesync"}
+    assert [o.name for o in data["scale"]] == ["w", "h"]
+    assert [o.name for o in data["scale2ref"]] == ["w"]  # own option set
+    assert data["setpts"] is data["asetpts"]
+    assert data["bass"] is data["lowshelf"]
+
 if __name__ == '__main__':
     caps.encoder_info('mpeg1video')
-
@@ -1,4 +1,5 @@
 from ffmpegio import configure
+import pytest
 
 vid_url = "tests/assets/testvideo-1m.mp4"
 img_url = "tests/assets/ffmpeg-logo.png"
@@ -105,3 +106,74 @@ def test_video_basic_filter():
             # transpose="clock",
         )
     )
+
+
+def test_finalize_video_seek_opts(monkeypatch):
+    from array import array
+    from fractions import Fraction
+
+    # 30 fps stream with a keyframe every second
+    index = {
+        "stream_index": 0,
+        "time_base": Fraction(1, 30),
+        "start_time": 0.0,
+        "pts": array("q", range(300)),
+        "size": array("q", [1] * 300),
+        "keyframes": array("q", range(0, 300, 30)),
+    }
+
+    args = configure.empty()
+    configure.add_url(args, "input", vid_url, {"ss": 1.0})
+    configure.add_url(args, "output", "-", {"ss": 1.5, "t": 1.0})
+    assert configure.finalize_video_seek_opts(args, index)
+    assert args["inputs"][0][1] == {"ss": 2.0}
+    assert args["outputs"][0][1] == {"ss": 0.5, "t": 1.0}
+
+    # seek time is set even if the input options dict is empty
+    args = configure.empty()
+    configure.add_url(args, "input", vid_url, {})
+    configure.add_url(args, "output", "-", {"ss": 5.02, "t": 0.5})
+    assert configure.finalize_video_seek_opts(args, index)
+    assert args["inputs"][0][1] == {"ss": 5.0}
+    assert args["outputs"][0][1] == {"ss": pytest.approx(0.02), "t": 0.5}
+
+    args = configure.empty()
+    configure.add_url(args, "input", vid_url, {"ss": "00:00:01"})
+    configure.add_url(args, "output", "-", {"ss": 1.5})
+    assert not configure.finalize_video_seek_opts(args, index)
+
+    args = configure.empty()
+    configure.add_url(args, "input", vid_url)
+    configure.add_url(args, "output", "-", {"ss": 1.5})
+    assert not configure.finalize_video_seek_opts(args, False)
+
+    # no index lookup unless requested
+    lookups = []
+    monkeypatch.setattr(configure.probe, "index", lambda *a: lookups.append(a))
+    assert not configure.finalize_video_seek_opts(args)
+    assert not lookups
+
+
+def test_optimize_filtergraph(monkeypatch):
+    args = configure.empty()
+    configure.add_url(args, "input", vid_url, {"s": "1920x1080"})
+    configure.add_url(args, "output", "-", {"vf": "null,scale=640:480,scale=640:480"})
+    assert configure.optimize_filtergraph(args, "video", "1920x1080") == 0  # opt-in
+
+    monkeypatch.setattr(configure, "OPTIMIZE_FILTERGRAPH", True)
+    assert configure.optimize_filtergraph(args, "video", "1920x1080") == 614400
+    assert str(args["outputs"][0][1]["vf"]) == "scale=640:480"
+
+    # crop is not moved ahead of scale if the input frames may be rotated
+    rotated = {"streams": [{"side_data_list": [{"rotation": -90}]}]}
+    monkeypatch.setattr(configure.probe, "full_details", lambda *_, **__: rotated)
+    args = configure.empty()
+    configure.add_url(args, "input", vid_url, None)
+    configure.add_url(args, "output", "-", {"vf": "scale=960:540,crop=480:270:240:136"})
+    assert configure.optimize_filtergraph(args, "video", "1920x1080") == 0
+    assert args["outputs"][0][1]["vf"] == "scale=960:540,crop=480:270:240:136"
+
+    # untouched if not optimizable
+    configure.add_url(args, "output", "-", {"vf": "hflip"})
+    assert configure.optimize_filtergraph(args, "video", ofile=1) == 0
+    assert args["outputs"][1][1]["vf"] == "hflip"
@@ -126,6 +126,112 @@ def test_popen_progress():
             assert len(out) == samplesize
 
 
+def test_aio_run():
+    import asyncio
+    from ffmpegio.ffmpegprocess import aio
+
+    url = "tests/assets/testaudio-1m.mp3"
+    sample_fmt = "s16"
+    out_codec, container = utils.get_audio_codec(sample_fmt)
+
+    with open(url, "rb") as f:
+        bytes = f.read()
+
+    args = {
+        "inputs": [("-", {"f": "mp3"})],
+        "outputs": [
+            ("-", {"f": container, "c:a": out_codec, "sample_fmt": sample_fmt})
+        ],
+    }
+
+    updates = []
+
+    async def progress(data, done):
+        updates.append(done)
+
+    out = asyncio.run(aio.run(args, input=bytes, capture_log=True, progress=progress))
+    ref = ffmpegprocess.run(args, input=bytes, capture_log=True)
+    assert out.returncode == 0
+    assert out.stdout == ref.stdout
+    assert updates[-1]
+
+
+def test_aio_popen():
+    import asyncio
+    from ffmpegio.ffmpegprocess import aio
+
+    url = "tests/assets/testvideo-1m.mp4"
+    ffmpeg_args = configure.empty()
+    configure.add_url(ffmpeg_args, "input", url, {"t": 1})
+    configure.add_url(ffmpeg_args, "output", "-", {"f": "null"})
+
+    async def main():
+        async with aio.Popen(ffmpeg_args, capture_log=True, progress=True) as proc:
+            updates = [done async for _, done in proc.iter_progress()]
+            logs = [line async for line in proc.iter_log()]
+        return proc.returncode, updates, logs
+
+    returncode, updates, logs = asyncio.run(main())
+    assert returncode == 0
+    assert updates[-1]
+    assert len(logs)
+
+
+def test_iter_segments_mismatch(monkeypatch):
+    import io
+
+    data = bytes(range(200))
+
+    class Popen:
+        # outputs the bytes of data from "ss" till "t" bytes later (or the end);
+        # the segments starting at 40 and 80 over- and undershoot, respectively
+        def __init__(self, ffmpeg_args, **_):
+            i0 = (ffmpeg_args["inputs"][0][1] or {}).get("ss", 0)
+            t = (ffmpeg_args["outputs"][0][1] or {}).get("t", None)
+            i1 = None if t is None else i0 + t - (i0 == 80)
+            i0 -= i0 == 40
+            self.stdout = io.BufferedReader(io.BytesIO(data[i0:i1]))
+
+        def poll(self):
+            return 0
+
+        def wait(self):
+            return 0
+
+    monkeypatch.setattr(ffmpegprocess, "Popen", Popen)
+
+    ffmpeg_args = configure.empty()
+    configure.add_url(ffmpeg_args, "input", "in.mp4")
+    configure.add_url(ffmpeg_args, "output", "-")
+
+    def segments(starts, nlast):
+        return [
+            (
+                {"ss": i0} if i0 else {},
+                {"t": i1 - i0} if i1 else {},
+                i1 - i0 if i1 else nlast,
+            )
+            for i0, i1 in zip(starts, [*starts[1:], None])
+        ]
+
+    # the last segment yields all the remaining output
+    segs = segments([0, 20, 60, 100], 50)
+    blks = list(ffmpegprocess.iter_segments(ffmpeg_args, segs, 1, 2))
+    assert [len(b) for b in blks] == [20, 40, 40, 100]
+    assert b"".join(blks) == data
+
+    # mismatched segments fall back to a sequential decode
+    for starts in ([0, 20, 40, 60, 100], [0, 20, 80, 100]):
+        segs = segments(starts, 100)
+        blks = list(ffmpegprocess.iter_segments(ffmpeg_args, segs, 1, 2))
+        assert b"".join(blks) == data
+
+    _, counts = ffmpegprocess.run_segments(
+        ffmpeg_args, segments([0, 40, 60, 80, 100], 100), 1, 2
+    )
+    assert counts == [40, 21, 20, 19, 100]
+
+
 if __name__ == "__main__":
 
     logging.basicConfig(level=logging.DEBUG)
@@ -262,6 +262,20 @@ def test_join(fg, r, how, match_scalar, ignore_labels, out):
 #         ("fps;scale", "trim;crop"),
 #     ],
 # )
+def test_str_cache():
+    fc = Chain("scale=320:240,hflip")
+    assert str(fc) == "scale=320:240,hflip"
+    fc.append("vflip")
+    assert str(fc) == "scale=320:240,hflip,vflip"
+
+    fg = fgb.Graph("[0:v]scale=320:240[out]")
+    assert str(fg) == "[0:v]scale=320:240[out]"
+    fg[0][0] = "scale=640:480"
+    assert str(fg) == "[0:v]scale=640:480[out]"
+    fg._links.rename("out", "vout")
+    assert str(fg) == "[0:v]scale=640:480[vout]"
+
+
 def test_filter_arithmetics():
     fg1 = fgb.trim() + fgb.crop()
     assert isinstance(fg1, fgb.Chain)
@@ -285,6 +299,100 @@ def test_filter_arithmetics():
     assert str(fg1) == "trim,crop"
 
 
+def test_inplace_ops():
+    def build(inplace):
+        fg = fgb.Graph()
+        for i in range(10):
+            f = fgb.Filter("scale", i + 1, -1)
+            if inplace:
+                fg |= f
+            else:
+                fg = fg | f
+        fg2 = "[in]" >> fgb.Graph("split=2")
+        if inplace:
+            fg2 += fgb.Filter("hflip") | fgb.Filter("crop")
+            fg2 >>= fgb.Filter("setpts")
+            fg2 *= 2
+            fg2 >>= "[out]"
+        else:
+            fg2 = fg2 + (fgb.Filter("hflip") | fgb.Filter("crop"))
+            fg2 = fg2 >> fgb.Filter("setpts")
+            fg2 = fg2 * 2
+            fg2 = fg2 >> "[out]"
+        return fg, fg2
+
+    fg, fg2 = build(True)
+    assert [str(g) for g in build(False)] == [str(fg), str(fg2)]
+
+    # in-place operator keeps the object, operator does not modify the operand
+    fg1 = fg
+    fg |= fgb.Filter("hflip")
+    assert fg is fg1 and len(fg) == 11
+    assert len(fg | fgb.Filter("crop")) == 12 and len(fg) == 11
+
+
+def test_inplace_ops_failed(monkeypatch):
+    from ffmpegio.utils.fglinks import GraphLinks
+
+    left = fgb.Graph("split=2")
+    right = fgb.Graph("overlay")
+    expected = str(left.join(right, "all"))
+
+    # the first linking attempt fails: "auto" join falls back to "all" on the
+    # restored graph
+    link = GraphLinks.link
+    calls = []
+
+    def link_once(self, *args, **kwargs):
+        calls.append(args)
+        if len(calls) == 1:
+            raise fgb.Graph.Error("link failed")
+        return link(self, *args, **kwargs)
+
+    monkeypatch.setattr(GraphLinks, "link", link_once)
+    fg = fgb.Graph(left)
+    fg += right
+    assert str(fg) == expected
+
+    # a failed in-place operation leaves the graph unmodified
+    def link_fail(self, *args, **kwargs):
+        raise fgb.Graph.Error("link failed")
+
+    monkeypatch.setattr(GraphLinks, "link", link_fail)
+    fg = fgb.Graph(left)
+    with pytest.raises(fgb.Graph.Error):
+        fg += right
+    assert str(fg) == "split=2" and not len(fg._links)
+
+
+@pytest.mark.parametrize(
+    ("expr", "size", "expected", "saved"),
+    [
+        ("null,scale=640:480,null", None, "scale=640:480", 0),
+        ("[in]null,hflip[out]", None, "[in]hflip[out]", 0),
+        ("format=gray,format=gray,format=rgb24", None, "format=gray,format=rgb24", 0),
+        ("scale=640:480,scale=320:240", (1920, 1080), "scale=640:480,scale=320:240", 0),
+        ("scale=64:36,scale=1280:720:flags=neighbor", (1280, 720), "scale=64:36,scale=1280:720:flags=neighbor", 0),
+        ("scale=640:480:flags=lanczos,scale=640:480", (1920, 1080), "scale=640:480:flags=lanczos", 614400),
+        ("scale=1920:1080,scale=320:240", (1920, 1080), "scale=320:240", 4147200),
+        ("scale=iw/2:-1,scale=320:240:flags=lanczos", None, "scale=iw/2:-1,scale=320:240:flags=lanczos", 0),
+        ("scale=640:480:out_range=pc,scale=320:240", None, "scale=640:480:out_range=pc,scale=320:240", 0),
+        ("scale@s=640:480,scale=320:240", None, "scale@s=640:480,scale=320:240", 0),
+        ("scale=960:540,crop=480:270:240:136", (1920, 1080), "crop=960:540:480:272,scale=480:270", 1944000),
+        ("scale=960:540,crop=480:270:240:136", None, "scale=960:540,crop=480:270:240:136", 0),
+        ("scale=960:540,crop=480:270", (1920, 1080), "scale=960:540,crop=480:270", 0),
+        ("split=3[a][b][c];[a]scale=1:1[out];[b]nullsink;[c]hflip,nullsink", (100, 100), "null[a];[a]scale=1:1[out]", 20000),
+        ("split[a][b];[a]nullsink;[b]hflip[out]", None, "null[b];[b]hflip[out]", 0),
+    ],
+)
+def test_optimize(expr, size, expected, saved):
+    fg = fgb.Graph(expr)
+    new_fg, n = fg.optimize(size)
+    assert str(new_fg) == expected
+    assert n == saved
+    assert str(fg) == str(fgb.Graph(expr))  # original intact
+
+
 def test_filter_empty_handling():
     fg1 = fgb.trim() + fgb.crop()
     fg2 = fgb.fps() | fgb.scale()
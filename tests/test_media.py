@@ -14,6 +14,20 @@ def test_media_read():
     print([(k, x['shape'], x['dtype']) for k, x in data.items()])
 
 
+def test_media_read_pipes():
+    url = "tests/assets/testmulti-1m.mp4"
+    url1 = "tests/assets/testvideo-1m.mp4"
+    url2 = "tests/assets/testaudio-1m.mp3"
+    rates0, data0 = media.read(url1, url2, t=1)
+    rates, data = media.read(url1, url2, t=1, pipes=True)
+    assert rates == rates0
+    assert {k: v["shape"] for k, v in data.items()} == {
+        k: v["shape"] for k, v in data0.items()
+    }
+    rates, data = media.read(url, map=("0:a:0", (0, "v:0")), t=1, pipes=True)
+    assert list(data) == ["a:0", "v:0"]
+
+
 if __name__ == "__main__":
     from matplotlib import pyplot as plt
 
@@ -10,6 +10,47 @@ def test_fg():
     assert I["shape"][0] == 10
 
 
+def test_aopen():
+    import asyncio
+
+    async def read():
+        async with ffmpegio.aopen(
+            "color=c=red:d=1:r=10", "rv", f_in="lavfi", pix_fmt="rgb24", blocksize=3
+        ) as f:
+            return [F["shape"][0] async for F in f]
+
+    assert asyncio.run(read()) == [3, 3, 3, 1]
+
+    async def filter():
+        async with ffmpegio.aopen(
+            "scale=8:4", "fv", rate_in=10, rate=10, shape_in=(2, 4, 3), dtype_in="|u1"
+        ) as f:
+            F = {"buffer": bytes(24 * 5), "shape": (5, 2, 4, 3), "dtype": "|u1"}
+            n = (await f.filter(F, timeout=1))["shape"][0]
+            n += (await f.flush())["shape"][0]
+            return n, f.shape
+
+    assert asyncio.run(filter()) == (5, (4, 8, 3))
+
+
+
+def test_async_logger():
+    import asyncio
+    from ffmpegio.streams.AsyncStreams import AsyncLogger
+
+    async def collect():
+        stderr = asyncio.StreamReader()
+        logger = AsyncLogger(stderr)
+        data = "frame=1\rdécodé ✓\nOutput #0\n".encode()
+        for i in range(0, len(data), 3):  # splits the multibyte characters
+            stderr.feed_data(data[i : i + 3])
+            await asyncio.sleep(0)
+        stderr.feed_eof()
+        await logger.join()
+        return logger.logs
+
+    assert asyncio.run(collect()) == ["frame=1", "décodé ✓", "Output #0"]
+
 if __name__ == "__main__":
     import logging
 
@@ -1,4 +1,5 @@
-import os
+import os, sys
+import subprocess as sp
 import pytest
 from ffmpegio import path
 
@@ -43,5 +44,27 @@ def test_check_version():
     path.check_version("5.0","<=")
     path.check_version("5.0",">=")
 
+
+def test_lazy_import():
+    # import ffmpegio must not locate/run FFmpeg nor load the submodules
+    script = (
+        "import subprocess, sys\n"
+        "def no_popen(args, *_, **__):\n"
+        "    raise AssertionError(f'subprocess spawned: {args}')\n"
+        "subprocess.Popen = no_popen\n"
+        "import ffmpegio\n"
+        "assert 'FFMPEG_BIN' not in vars(ffmpegio.path)\n"
+        "assert 'ffmpegio.caps' not in sys.modules\n"
+        "assert 'ffmpegio.plugins' not in sys.modules\n"
+    )
+    sp.run([sys.executable, "-c", script], check=True)
+
+    # submodules are loaded on first access
+    import ffmpegio
+
+    assert ffmpegio.caps is sys.modules["ffmpegio.caps"]
+    assert ffmpegio.FilterGraph is sys.modules["ffmpegio.filtergraph"].Graph
+
+
 if __name__ == "__main__":
     test_find()
@@ -0,0 +1,31 @@
+from ffmpegio.streams import PipedStreams
+
+
+def test_pipedreadstream():
+    url1 = "tests/assets/testvideo-1m.mp4"
+    url2 = "tests/assets/testaudio-1m.mp3"
+    with PipedStreams.PipedMediaReader(url1, url2, t=1, blocksize=5) as reader:
+        assert reader.specs() == ["v:0", "a:0"]
+        rates = reader.rates()
+        n = 0
+        for data in reader:
+            n += data["v:0"]["shape"][0]
+        assert n == round(rates["v:0"])  # t=1
+
+
+def test_pipedreadstream_independent():
+    url = "tests/assets/testmulti-1m.mp4"
+    with PipedStreams.PipedMediaReader(
+        url,
+        t=1,
+        filter_complex="[0:v:0]split=2[out1][out2]",
+        map=["[out1]", "[out2]", "0:a:0"],
+    ) as reader:
+        assert reader.types() == {"v:0": "video", "v:1": "video", "a:0": "audio"}
+
+        # consume the audio stream to the end before touching the video streams
+        audio = reader.read_stream("a:0", reader.rates()["a:0"] * 2)
+        assert audio["shape"][0] == reader.rates()["a:0"]
+
+        data = reader.readall()
+        assert data["v:0"]["shape"] == data["v:1"]["shape"]
@@ -27,6 +27,23 @@ def test_all():
     print(probe.audio_streams_basic(url))
 
 
+
+def test_full_details_copy():
+    import json
+
+    url = "tests/assets/testmulti-1m.mp4"
+    info = probe.full_details(url)
+    json.dumps(info)  # plain dicts and lists
+
+    # modifying the returned info does not alter the cached info
+    info["format"]["duration"] = None
+    info["streams"].clear()
+    info = probe.full_details(url)
+    assert info["format"]["duration"] is not None and len(info["streams"])
+
+    for _, info in probe.batch([url]):
+        json.dumps(info)
+
 def test_query():
     url = "tests/assets/testmulti-1m.mp4"
     assert isinstance(probe.query(url, fields=("duration",)), dict)
@@ -102,6 +119,64 @@ def test_frames():
     print(info)
 
 
+def test_index(tmp_path, monkeypatch):
+    from ffmpegio import path
+
+    monkeypatch.setattr(path, "CACHE_DIR", str(tmp_path))
+    url = "tests/assets/testmulti-1m.mp4"
+
+    # lookup does not create the cache directory
+    assert probe.index(url, build=False) is None
+    assert not (tmp_path / "index").exists()
+
+    index = probe.index(url)
+    assert len(index["pts"]) == len(index["size"])
+    assert len(index["keyframes"]) and index["keyframes"][0] == 0
+    assert len(list((tmp_path / "index").iterdir())) == 1
+
+    # reload from the sidecar file
+    probe._index_db.clear()
+    assert probe.index(url, build=False)["pts"] == index["pts"]
+
+    kf, nskip, nframes = probe.seek_point(index, 1.5, 1.0)
+    assert kf <= 1.5 and nskip >= 0 and nframes > 0
+
+
+def test_batch():
+    urls = [
+        "tests/assets/testmulti-1m.mp4",
+        "tests/assets/testaudio-1m.mp3",
+        "nonexistent.mp4",
+    ]
+    results = dict(probe.batch(urls, {"format": ["duration"], "streams": True}, 2))
+    assert set(results) == set(urls)
+    assert isinstance(results["nonexistent.mp4"], Exception)
+    assert set(results[urls[0]]["format"]) == {"duration"}
+    assert results[urls[1]]["streams"] == probe.full_details(urls[1])["streams"]
+
+    assert [url for url, _ in probe.batch(urls, ordered=True)] == urls
+
+
+def test_disk_cache(tmp_path):
+    url = "tests/assets/testaudio-1m.mp3"
+    cache = probe.enable_disk_cache(str(tmp_path / "probe.sqlite"))
+    try:
+        # the file may have been probed by the other tests
+        probe._db.clear()
+        info = probe.full_details(url)
+        assert cache.stats()["entries"] == 1
+
+        # cold in-memory cache, served from the database
+        probe._db.clear()
+        assert probe.full_details(url) == info
+        assert probe.query(url, "a:0", ["codec_name"]) == {
+            "codec_name": info["streams"][0]["codec_name"]
+        }
+        assert probe.cache_stats()["disk"]["hits"] == 1
+    finally:
+        probe.disable_disk_cache()
+
+
 if __name__ == "__main__":
     test_all()
     pass
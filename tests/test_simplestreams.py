@@ -4,6 +4,7 @@ logging.basicConfig(level=logging.DEBUG)
 
 import ffmpegio
 import tempfile, re
+import pytest
 from os import path
 from ffmpegio import streams, utils
 
@@ -46,6 +47,73 @@ def test_read_write_video():
             f.write(F1)
 
 
+def test_write_video_async():
+    fs, F = ffmpegio.video.read(url, t=1, pix_fmt="gray")
+    bps = utils.get_samplesize(F["shape"][-3:], F["dtype"])
+    nframes = F["shape"][0]
+
+    with tempfile.TemporaryDirectory() as tmpdirname:
+        out_url = path.join(tmpdirname, "test.avi")
+        with ffmpegio.open(
+            out_url, "wv", rate_in=fs, c="rawvideo", async_bufsize=bps * 4
+        ) as f:
+            for i in range(nframes):
+                f.write(
+                    {
+                        "buffer": F["buffer"][i * bps : (i + 1) * bps],
+                        "shape": (1, *F["shape"][1:]),
+                        "dtype": F["dtype"],
+                    }
+                )
+            f.flush()
+            assert not f._writer._size
+
+        fs, G = ffmpegio.video.read(out_url, pix_fmt="gray")
+        assert G["buffer"] == F["buffer"]
+
+
+
+def test_write_async_error():
+    import os
+    from ffmpegio.errors import FFmpegError
+    from ffmpegio.threading import BufferedWriterThread, LoggerThread
+
+    class Stdin:
+        closed = False
+
+        def write(self, b):
+            raise BrokenPipeError
+
+        def flush(self):
+            pass
+
+        def close(self):
+            self.closed = True
+
+    class Proc:  # FFmpeg which rejected the input
+        def __init__(self):
+            rfd, wfd = os.pipe()
+            with open(wfd, "wb") as stderr:
+                stderr.write(b"pipe:: Invalid data found when processing input\n")
+            self.stdin = Stdin()
+            self.stderr = open(rfd, "rb")
+
+        def wait(self):
+            return 1
+
+    f = streams.SimpleVideoWriter.__new__(streams.SimpleVideoWriter)
+    f._proc = Proc()
+    f._logger = LoggerThread(f._proc.stderr)
+    f._logger.start()
+    f._logger.index("pipe:")
+    f._writer = BufferedWriterThread(f._proc.stdin, 1024)
+    f._writer.start()
+    f._writer.write(b"\0" * 16)  # fails in the background
+
+    # the failed background write is not mistaken for a success
+    with pytest.raises(FFmpegError):
+        f.close()
+
 def test_read_audio(caplog):
     # caplog.set_level(logging.DEBUG)
 
@@ -158,6 +226,39 @@ def test_audio_filter():
             process("end", f.flush())
 
 
+def test_video_filter_exact():
+    url = "tests/assets/testvideo-1m.mp4"
+
+    with ffmpegio.open(url, "rv", blocksize=30, t=5) as src, ffmpegio.open(
+        "scale=200:100", "fv", rate_in=src.rate, rate=10, exact=True
+    ) as f:
+        n = 0
+        for frames in src:
+            y = f.filter(frames)
+            assert y["shape"][1:] == (100, 200, 3)
+            n += y["shape"][0]
+        n += f.flush()["shape"][0]
+        assert n == f.nout and abs(n - 50) <= 1
+        assert "ffmpegio_in" not in f.readlog()
+
+
+def test_audio_filter_exact():
+    url = "tests/assets/testaudio-1m.mp3"
+
+    with streams.SimpleAudioReader(url, blocksize=1024 * 8, t=10, ar=32000) as src:
+        with streams.SimpleAudioFilter(
+            "lowpass", rate_in=src.rate, rate=4000, exact=True, loglevel="error"
+        ) as f:
+            n = 0
+            for samples in src:
+                y = f.filter(samples)
+                if y is not None:
+                    n += y["shape"][0]
+            n += f.flush()["shape"][0]
+            assert n == f.nout
+            assert abs(n - f.nin // 8) <= 64  # resampler delay
+
+
 def test_write_extra_inputs():
     url_aud = "tests/assets/testaudio-1m.mp3"
 
@@ -199,9 +300,67 @@ def test_write_extra_inputs():
         assert len(info) == 2
 
 
+def test_read_video_pooled():
+    fs, F = ffmpegio.video.read(url, t=1)
+
+    with ffmpegio.open(url, "rv", t=1, blocksize=4, pool_size=2) as f:
+        blks = [bytes(blk["buffer"]) for blk in f]
+        bufs = f._pool
+
+    assert b"".join(blks) == F["buffer"]
+    assert len(bufs) == 2
+
+
+def test_read_pooled_hold():
+    # the raw-bytes plugin keeps the handed-out memoryview itself
+    class Source:
+        n = 0
+
+        def readinto(self, b):
+            self.n += 1
+            b[:] = bytes([self.n]) * len(b)
+            return len(b)
+
+    f = streams.SimpleVideoReader.__new__(streams.SimpleVideoReader)
+    f._reader = Source()
+    f._pool = [bytearray(4), bytearray(4)]
+    f._pool_refs = [None, None]
+    f._pool_index = 0
+    f.samplesize = 2
+    f.shape = (2,)
+    f.dtype = "|u1"
+    f._converter = lambda b, dtype, shape, squeeze: {"buffer": b}
+
+    held = f._read_pooled()
+    bufs = list(f._pool)
+    f._read_pooled()  # released at once
+    f._read_pooled()  # held buffer is replaced, not overwritten
+    assert bytes(held["buffer"]) == b"\x01" * 4
+    assert f._pool[0] is not bufs[0]
+    f._read_pooled()  # released buffer is recycled
+    assert f._pool[1] is bufs[1]
+
+
+def test_read_video_prefetch():
+    fs, F = ffmpegio.video.read(url, t=1)
+
+    with ffmpegio.open(url, "rv", t=1, blocksize=4, prefetch=3) as f:
+        blks = [bytes(blk["buffer"]) for blk in f]
+        assert f._reader.bufsize == 3 * 4 * f.samplesize
+    assert b"".join(blks) == F["buffer"]
+
+    with ffmpegio.open(url, "rv", t=1, blocksize=4, pool_size=2, prefetch=2) as f:
+        blk = f.read(3)["buffer"]
+        assert isinstance(blk, bytes)  # same type as without prefetch
+        blks = [blk]
+        blks.extend(bytes(blk["buffer"]) for blk in f)
+    assert b"".join(blks) == F["buffer"]
+
+
 if __name__ == "__main__":
     print("starting test")
     logging.debug("logging check")
     test_video_filter()
 
     # python tests\test_simplestreams.py
+
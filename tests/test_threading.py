@@ -5,6 +5,213 @@ from tempfile import TemporaryDirectory
 from os import path
 import re
 from pprint import pprint
+import os as _os
+import pytest
+
+
+@pytest.mark.parametrize("bufsize", [None, 64])
+def test_reader_ring(bufsize):
+    data = bytes(range(256)) * 16  # 4096 bytes = 1024 4-byte samples
+    rfd, wfd = _os.pipe()
+    with open(rfd, "rb") as stdout:
+        reader = threading.ReaderThread(stdout, 5, bufsize=bufsize)
+        reader.itemsize = 4
+        reader.start()
+        with open(wfd, "wb") as stdin:
+            stdin.write(data)
+
+        out = bytearray()
+        out += reader.read(3)  # 12 bytes
+        b = bytearray(40)  # 10 samples straight to user buffer
+        assert reader.readinto(b) == 40
+        out += b
+        out += reader.read_view(7)
+        out += reader.read_all()
+        reader.join()
+
+    assert out == data
+    assert reader.read(-1) == b""
+
+
+def test_process_reaper():
+    import subprocess as sp, sys
+    import threading as _threading
+
+    reaper = threading.ProcessReaperThread()
+    nthreads = _threading.active_count()
+    returncodes = {}
+    procs = [
+        sp.Popen([sys.executable, "-c", f"import sys,time;time.sleep({i/100});sys.exit({i%3})"])
+        for i in range(20)
+    ]
+    events = [
+        reaper.register(p, lambda rc, i=i: returncodes.__setitem__(i, rc))
+        for i, p in enumerate(procs)
+    ]
+    # only the reaper and its callback threads
+    assert _threading.active_count() == nthreads + 2
+    assert all(ev.wait(10) for ev in events)
+    assert returncodes == {i: i % 3 for i in range(20)}
+
+
+def test_process_reaper_callbacks():
+    import subprocess as sp, sys, time
+    import threading as _threading
+
+    reaper = threading.ProcessReaperThread()
+    release = _threading.Event()
+
+    def failing(rc):
+        raise RuntimeError("callback failure")
+
+    def slow(rc):
+        assert reaper.in_callback()
+        release.wait(10)
+
+    procs = [sp.Popen([sys.executable, "-c", "pass"]) for _ in range(2)]
+    events = [reaper.register(procs[0], [failing, slow])]
+    events.append(reaper.register(procs[1]))
+
+    # the slow callback does not hold up the reaping of the other process
+    for _ in range(1000):
+        if procs[1].returncode is not None:
+            break
+        time.sleep(0.01)
+    assert procs[1].returncode == 0
+    assert not events[0].is_set()
+
+    # the event is set even though a callback failed
+    release.set()
+    assert all(ev.wait(10) for ev in events)
+    assert not reaper.in_callback()
+
+
+@pytest.mark.skipif("_os.name != 'posix'")
+@pytest.mark.parametrize("bufsize", [None, 64])
+def test_iomux(bufsize):
+    import subprocess as sp, sys
+
+    # echo stdin to stdout and log the byte count to stderr
+    code = (
+        "import sys\n"
+        "for b in iter(lambda: sys.stdin.buffer.read1(4096), b''):\n"
+        "    sys.stdout.buffer.write(b)\n"
+        "    sys.stderr.write(f'{len(b)}\\r')\n"
+        "sys.stderr.write('Output #0\\n')\n"
+    )
+    data = bytes(range(256)) * 1024
+    procs = [
+        sp.Popen([sys.executable, "-c", code], stdin=sp.PIPE, stdout=sp.PIPE, stderr=sp.PIPE)
+        for _ in range(4)
+    ]
+    streams = []
+    for proc in procs:
+        writer = threading.IOMuxWriter(proc.stdin)
+        reader = threading.IOMuxReader(proc.stdout, bufsize=bufsize)
+        reader.itemsize = 4
+        logger = threading.IOMuxLogger(proc.stderr)
+        for t in (writer, reader, logger):
+            t.start()
+        for i in range(0, len(data), 10000):
+            writer.write(data[i : i + 10000])
+        writer.join(0)  # close stdin once all the data are written
+        streams.append((writer, reader, logger))
+
+    for proc, (writer, reader, logger) in zip(procs, streams):
+        assert reader.read_all() == data
+        assert proc.wait() == 0
+        logger.join()
+        assert logger.index("Output") == len(logger.logs) - 1
+        assert sum(int(log) for log in logger.logs[:-1]) == len(data)
+        assert not (writer.is_alive() or reader.is_alive() or logger.is_alive())
+
+
+@pytest.mark.skipif("not _os.path.isdir('/proc/self/fd')")
+def test_iomux_blocking():
+    class Handler:
+        def _on_ready(self, fd, mask):
+            return None
+
+        def _on_detach(self):
+            pass
+
+    iomux = threading.IOMultiplexerThread()
+    rfd, wfd = _os.pipe()
+    with open(rfd, "rb") as stdout, open(wfd, "wb") as stdin:
+        handlers = [Handler(), Handler()]
+        iomux.attach(handlers[0], stdout, 0)
+        iomux.attach(handlers[1], stdin, 0)
+        # the original file objects stay in the blocking mode
+        assert _os.get_blocking(rfd) and _os.get_blocking(wfd)
+        assert all(iomux.detach(h, 10) for h in handlers)
+
+
+@pytest.mark.skipif("_os.name != 'posix'")
+def test_iomux_error():
+    # an error while servicing the stream is raised after the received data
+    class FailingReader(threading.IOMuxReader):
+        def _on_ready(self, fd, mask):
+            events = super()._on_ready(fd, mask)
+            if self._size:
+                raise RuntimeError("bad stream")
+            return events
+
+    rfd, wfd = _os.pipe()
+    with open(rfd, "rb") as stdout, open(wfd, "wb") as stdin:
+        stdin.write(b"\0" * 8)
+        stdin.flush()
+        reader = FailingReader(stdout)
+        reader.itemsize = 4
+        reader.start()
+        assert reader.read(2) == b"\0" * 8
+        with pytest.raises(RuntimeError):
+            reader.read(1)
+        with pytest.raises(RuntimeError):
+            reader.read_all()
+        with pytest.raises(RuntimeError):
+            reader.join()
+
+
+def test_buffered_writer():
+    import subprocess as sp, sys
+    import threading as _threading
+
+    class Sink:
+        # holds the first write till released
+        def __init__(self):
+            self.writes = []
+            self.release = _threading.Event()
+
+        def write(self, b):
+            self.release.wait()
+            self.writes.append(bytes(b))
+
+        def flush(self):
+            pass
+
+    sink = Sink()
+    with threading.BufferedWriterThread(sink, 2**16, 2**14) as writer:
+        for i in range(2**12):
+            writer.write(b"%015d\n" % i)
+        sink.release.set()
+        assert writer.flush()
+    assert b"".join(sink.writes) == b"".join(b"%015d\n" % i for i in range(2**12))
+    assert all(len(b) == 2**14 for b in sink.writes[1:-1])  # coalesced
+    assert len(sink.writes) <= 6
+
+    # write error is raised by the next write
+    proc = sp.Popen([sys.executable, "-c", "pass"], stdin=sp.PIPE)
+    proc.wait()
+    writer = threading.BufferedWriterThread(proc.stdin, 2**16)
+    writer.start()
+    with pytest.raises(OSError):
+        for _ in range(100):
+            writer.write(bytes(2**16))
+    writer.join()
+    try:
+        proc.stdin.close()
+    except OSError:
+        pass
 
 
 def test_log_popen():
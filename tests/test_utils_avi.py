@@ -1,6 +1,7 @@
-from ffmpegio import ffmpegprocess
+from ffmpegio import ffmpegprocess, threading
 from ffmpegio.utils import avi as aviutils
-import io
+import io, itertools, os, struct
+from threading import Event, Thread
 from pprint import pprint
 
 import pytest
@@ -86,6 +87,348 @@ def test_avireader(avi_stream):
     assert i == vframes
 
 
+def test_avireader_readall(avi_stream):
+    f, vframes, pix_fmt, sample_fmt = avi_stream
+    f.seek(0)
+    reader = aviutils.AviReader()
+    reader.start(f, pix_fmt.startswith("ya"))
+    frames = {k: [] for k in reader.streams}
+    for id, frame in reader:
+        frames[id].append(frame)
+
+    f.seek(0)
+    reader = aviutils.AviReader()
+    reader.start(f, pix_fmt.startswith("ya"))
+    data = reader.readall()
+    assert {k: bytes(v) for k, v in data.items()} == {
+        k: b"".join(v) for k, v in frames.items()
+    }
+    assert len(data[0]) == vframes * reader.itemsizes[0]
+
+
+def make_avi(nframes, width=4, height=3, nsamples=5, rec=False):
+    # synthetic rgb24 + s16 stereo AVI stream and the expected stream data
+    def chunk(id, data):
+        return id + struct.pack("<I", len(data)) + data + b"\0" * (len(data) % 2)
+
+    def list_(type, data, id=b"LIST"):
+        return id + struct.pack("<I", len(data) + 4) + type + data
+
+    strh = "<4s4sI2H8I4h"
+    hdrl = chunk(b"avih", struct.pack("<10I", *(0,) * 6, 2, 0, width, height))
+    hdrl += list_(
+        b"strl",
+        chunk(b"strh", struct.pack(strh, b"vids", b"\0" * 4, *(0,) * 4, 1, 30, *(0,) * 9))
+        + chunk(
+            b"strf",
+            struct.pack("<IiiHH4sIiiII", 40, width, -height, 1, 24, b"\0" * 4, *(0,) * 5),
+        ),
+    )
+    hdrl += list_(
+        b"strl",
+        chunk(b"strh", struct.pack(strh, b"auds", b"\0" * 4, *(0,) * 4, 1, 8000, *(0,) * 9))
+        + chunk(b"strf", struct.pack("<HHIIHH", 1, 2, 8000, 32000, 4, 16)),
+    )
+
+    video = [bytes([i % 256]) * (width * height * 3) for i in range(nframes)]
+    audio = [bytes([(i + 128) % 256]) * (nsamples * 4) for i in range(nframes)]
+    movi = b"".join(
+        list_(b"rec ", v + a) if rec else v + a
+        for v, a in zip(
+            (chunk(b"00dc", v) for v in video), (chunk(b"01wb", a) for a in audio)
+        )
+    )
+    idx1 = chunk(b"idx1", bytes(16 * 2 * nframes))
+    riff = list_(b"AVI ", list_(b"hdrl", hdrl) + list_(b"movi", movi) + idx1, b"RIFF")
+    return riff, b"".join(video), b"".join(audio)
+
+
+@pytest.mark.parametrize("blocksize", [16, 100, 2**20])
+@pytest.mark.parametrize("rec", [False, True])
+def test_avireader_batch(blocksize, rec):
+    b, video, audio = make_avi(20, rec=rec)
+    reader = aviutils.AviReader()
+    reader.start(io.BytesIO(b))
+    data = {0: [], 1: []}
+    while True:
+        batch = reader.read_batch(blocksize)
+        if batch is None:
+            break
+        for k, v in batch.items():
+            assert all(isinstance(vi, memoryview) for vi in v)
+            data[k].extend(v)
+    assert len(data[0]) == 20
+    assert b"".join(data[0]) == video
+    assert b"".join(data[1]) == audio
+
+    reader = aviutils.AviReader()
+    reader.batch_size = blocksize
+    reader.start(io.BytesIO(b))
+    assert reader.readall() == {0: video, 1: audio}
+
+
+@pytest.mark.parametrize("blocksize", [13, 14, 27, 28])
+def test_avireader_batch_odd_chunks(blocksize):
+    # 5-byte chunks: a batch boundary may fall right on a pad byte
+    chunks = [bytes([97 + i]) * 5 for i in range(3)]
+    b = b"".join(b"00wb" + struct.pack("<I", 5) + c + b"\0" for c in chunks)
+
+    frames, offset, nskip = aviutils.find_frames(b, {b"00wb": 0}, 0, 13)
+    assert frames == [(0, 8, 13)] and (offset, nskip) == (13, 1)
+
+    reader = aviutils.AviReader()
+    reader.streams = {0: None}
+    reader._f = io.BytesIO(b)
+    data = []
+    while True:
+        batch = reader.read_batch(blocksize)
+        if batch is None:
+            break
+        data.extend(bytes(v) for v in batch.get(0, ()))
+    assert data == chunks
+
+
+def test_avireaderthread_batch():
+    b, video, audio = make_avi(20)
+    reader = threading.AviReaderThread(batchsize=256)
+    reader.start(io.BytesIO(b))
+    out = reader.readall()
+    assert out["v:0"]["buffer"] == video
+    assert out["a:0"]["buffer"] == audio
+
+
+
+@pytest.mark.parametrize("batchsize", [None, 256])
+def test_avimediareader_iter_ends(batchsize):
+    # iterating over a finished stream stops instead of yielding empty reads
+    from ffmpegio.streams.AviStreams import AviMediaReader
+
+    b, video, audio = make_avi(20)
+    for blocksize in (0, 3):
+        f = AviMediaReader.__new__(AviMediaReader)
+        f._reader = threading.AviReaderThread(batchsize=batchsize)
+        f._reader.start(io.BytesIO(b))
+        f._reader.join()  # the thread has exited before the end is read
+        f.blocksize = blocksize
+        f.ref_stream = None
+        blks = list(itertools.islice(f, 100))
+        if blocksize:
+            assert len(blks) == 7
+            assert b"".join(blk["v:0"]["buffer"] for blk in blks) == video
+        else:
+            assert b"".join(v["buffer"] for k, v in blks if k == "a:0") == audio
+        with pytest.raises(threading.ThreadNotActive):
+            f._reader.read(3)
+
+
+@pytest.mark.skipif("os.name != 'posix'")
+@pytest.mark.parametrize("batchsize", [None, 256])
+def test_iomuxavireader(batchsize):
+    b, video, audio = make_avi(20)
+    rfd, wfd = os.pipe()
+
+    def write():
+        with open(wfd, "wb") as f:
+            for i in range(0, len(b), 100):
+                f.write(b[i : i + 100])
+
+    writer = Thread(target=write)
+    writer.start()
+    with open(rfd, "rb") as stdout:
+        reader = threading.IOMuxAviReader(batchsize=batchsize)
+        reader.start(stdout)
+        out1 = reader.read(5)
+        assert out1["v:0"]["buffer"] == video[: len(video) // 4]
+        out2 = reader.readall()
+        reader.join()
+    writer.join()
+    for spec, data in (("v:0", video), ("a:0", audio)):
+        assert out1[spec]["buffer"] + out2[spec]["buffer"] == data
+
+
+@pytest.mark.skipif("os.name != 'posix'")
+@pytest.mark.parametrize("batchsize", [None, 256])
+def test_iomuxavireader_error(monkeypatch, batchsize):
+    # a failed stream is not read as a truncated one
+    class FailingReader(threading.IOMuxReader):
+        fail = False
+
+        def _on_ready(self, fd, mask):
+            events = super()._on_ready(fd, mask)
+            if self.fail:
+                raise RuntimeError("bad stream")
+            return events
+
+    monkeypatch.setattr(threading, "IOMuxReader", FailingReader)
+    b, video, audio = make_avi(20)
+    rfd, wfd = os.pipe()
+    resume = Event()
+
+    def write():
+        with open(wfd, "wb") as f:
+            f.write(b[: len(b) // 2])
+            f.flush()
+            resume.wait()
+            f.write(b[len(b) // 2 :])
+
+    writer = Thread(target=write)
+    writer.start()
+    with open(rfd, "rb") as stdout:
+        reader = threading.IOMuxAviReader(batchsize=batchsize)
+        reader.start(stdout)
+        assert reader.read(2)["v:0"]["buffer"] == video[: len(video) // 10]
+        FailingReader.fail = True
+        resume.set()
+        with pytest.raises(RuntimeError):
+            reader.readall()
+        reader.join()
+    writer.join()
+
+
+def iter_odml_avi(nframes, width, height, nsamples, riff_size=2**30):
+    # synthetic OpenDML AVI stream (rgb24 + s16 stereo), generated chunk by chunk.
+    # Starts a new AVIX RIFF once the current RIFF exceeds riff_size bytes like
+    # FFmpeg's AVI muxer. Frame i is filled with i % 256.
+
+    def hdr(id, size):
+        return id + struct.pack("<I", size)
+
+    def chunk(id, data):
+        return hdr(id, len(data)) + data + b"\0" * (len(data) % 2)
+
+    def list_(type, data, id=b"LIST"):
+        return hdr(id, len(data) + 4) + type + data
+
+    vsize = width * height * 3
+    asize = nsamples * 4
+    pair = 8 + vsize + vsize % 2 + 8 + asize
+    nper = riff_size // pair + 1
+    counts = [min(nper, nframes - i) for i in range(0, nframes, nper)]
+
+    def ix(sid, n):  # OpenDML standard index (content not inspected)
+        return chunk(b"ix%02d" % sid, bytes(24 + 8 * n))
+
+    def indx(sid, scale):  # OpenDML super index
+        return chunk(
+            b"indx",
+            struct.pack("<HBBI4s3I", 4, 0, 0, len(counts), b"ix%02d" % sid, 0, 0, 0)
+            + b"".join(struct.pack("<QII", 0, 32 + 8 * n, n * scale) for n in counts),
+        )
+
+    strh = "<4s4sI2H8I4h"
+    hdrl = chunk(b"avih", struct.pack("<10I", *(0,) * 6, 2, 0, width, height))
+    hdrl += list_(
+        b"strl",
+        chunk(b"strh", struct.pack(strh, b"vids", b"\0" * 4, *(0,) * 4, 1, 30, *(0,) * 9))
+        + chunk(
+            b"strf",
+            struct.pack("<IiiHH4sIiiII", 40, width, -height, 1, 24, b"\0" * 4, *(0,) * 5),
+        )
+        + indx(0, 1),
+    )
+    hdrl += list_(
+        b"strl",
+        chunk(b"strh", struct.pack(strh, b"auds", b"\0" * 4, *(0,) * 4, 1, 8000, *(0,) * 9))
+        + chunk(b"strf", struct.pack("<HHIIHH", 1, 2, 8000, 32000, 4, 16))
+        + indx(1, nsamples),
+    )
+    hdrl += list_(b"odml", chunk(b"dmlh", struct.pack("<I", nframes) + bytes(244)))
+
+    i = 0
+    for r, n in enumerate(counts):
+        idx1 = chunk(b"idx1", bytes(32 * n)) if r == 0 else b""
+        movi_size = 4 + n * pair + len(ix(0, n)) + len(ix(1, n))
+        if r == 0:
+            head = list_(b"hdrl", hdrl)
+            yield hdr(b"RIFF", 4 + len(head) + 8 + movi_size + len(idx1)) + b"AVI "
+            yield head
+        else:
+            yield hdr(b"RIFF", 4 + 8 + movi_size) + b"AVIX"
+        yield hdr(b"LIST", movi_size) + b"movi"
+        for i in range(i, i + n):
+            yield chunk(b"00dc", bytes([i % 256]) * vsize)
+            yield chunk(b"01wb", bytes([(i + 128) % 256]) * asize)
+        i += 1
+        yield ix(0, n) + ix(1, n) + idx1
+
+
+class OdmlAviStream(io.RawIOBase):
+    # non-seekable (pipe-like) reader of iter_odml_avi()
+
+    def __init__(self, *args, **kwargs):
+        self._chunks = iter_odml_avi(*args, **kwargs)
+        self._view = memoryview(b"")
+
+    def readable(self):
+        return True
+
+    def readinto(self, b):
+        while not len(self._view):
+            try:
+                self._view = memoryview(next(self._chunks))
+            except StopIteration:
+                return 0
+        n = min(len(b), len(self._view))
+        b[:n] = self._view[:n]
+        self._view = self._view[n:]
+        return n
+
+
+def check_odml_frames(frames, nsamples):
+    # frames: iterable of (stream id, frame)
+    nread = {0: 0, 1: 0}
+    for k, frame in frames:
+        n = nread[k]
+        assert frame[0] == (n + 128 * k) % 256 and frame[-1] == frame[0]
+        if k == 1:
+            assert len(frame) == nsamples * 4
+        nread[k] += 1
+    return nread
+
+
+def test_odml_gigabyte():
+    # 1100 x 1 MiB frames: RIFF AVI + RIFF AVIX
+    nframes, width, height, nsamples = 1100, 512, 683, 267
+    assert nframes * width * height * 3 > 2**30
+
+    reader = aviutils.AviReader()
+    reader.start(io.BufferedReader(OdmlAviStream(nframes, width, height, nsamples)))
+    assert [v["length"] for v in reader.streams.values()] == [nframes, nframes * nsamples]
+    assert check_odml_frames(reader, nsamples) == {0: nframes, 1: nframes}
+
+    reader = aviutils.AviReader()
+    reader.start(io.BufferedReader(OdmlAviStream(nframes, width, height, nsamples)))
+
+    def iter_batches():
+        while True:
+            batch = reader.read_batch()
+            if batch is None:
+                break
+            for k, v in batch.items():
+                yield from ((k, frame) for frame in v)
+
+    assert check_odml_frames(iter_batches(), nsamples) == {0: nframes, 1: nframes}
+
+
+@pytest.mark.parametrize("batchsize", [None, 1000])
+def test_odml_readers(batchsize):
+    # many small RIFFs
+    args = (50, 4, 3, 5, 300)
+    video = b"".join(bytes([i % 256]) * 36 for i in range(50))
+    audio = b"".join(bytes([(i + 128) % 256]) * 20 for i in range(50))
+
+    reader = aviutils.AviReader()
+    reader.start(io.BufferedReader(OdmlAviStream(*args)))
+    assert reader.readall() == {0: video, 1: audio}
+
+    reader = threading.AviReaderThread(batchsize=batchsize)
+    reader.start(io.BufferedReader(OdmlAviStream(*args)))
+    out = reader.readall()
+    reader.join()
+    assert out["v:0"]["buffer"] == video
+    assert out["a:0"]["buffer"] == audio
+
+
 if __name__ == "__main__":
     url = "tests/assets/testmulti-1m.mp4"
     url1 = "tests/assets/testvideo-1m.mp4"
@@ -447,3 +447,49 @@ def test_remove_label(links, n, nin):
 # "out": (None, (1, 1, 0)),  # named output
 # "sout1": (None, (1, 0, 0)),  # split output label#1
 # "sout2": ((2, 0, 0), (1, 0, 0)),  # split output label#2
+
+
+def test_index(base_links):
+    links = base_links
+
+    def check():
+        for label, (dsts, src) in links.items():
+            for d in links.iter_dst_ids(dsts):
+                if d is not None:
+                    assert links.find_dst_label(d) == label
+            if src is not None:
+                assert label in links.find_src_labels(src)
+        assert len(links.data.dst_index) == sum(1 for _, d, _ in links.iter_dsts() if d)
+
+    check()
+    assert links.find_link_label((2, 0, 0), (1, 0, 0)) == "sout2"
+    assert links.are_linked((0, 0, 0), (0, 0, 0))
+    assert not links.are_linked((0, 0, 0), (1, 0, 0))
+    assert links.find_input_label((3, 1, 0)) == "min"
+    assert links.find_output_labels((1, 0, 0)) == ["sout1"]
+
+    links.unlink(label="l")
+    assert links.find_dst_label((0, 0, 0)) is None
+    links.rename("in", "new_in")
+    assert links.find_input_label((2, 1, 0)) == "new_in"
+    links.del_chain(0)
+    check()
+    links["named"] = ((5, 0, 0), (4, 0, 0))
+    assert links.find_link_label((5, 0, 0), (4, 0, 0)) == "named"
+    check()
+
+
+def test_batch(base_links):
+    links = base_links
+    with links.batch():
+        links.update({"x": ((5, 0, 0), None)})
+        links.update({"y": ((6, 0, 0), (5, 0, 0))})
+    assert links.find_link_label((6, 0, 0), (5, 0, 0)) == "y"
+
+    data = dict(links.data)
+    with pytest.raises(GraphLinks.Error):
+        with links.batch():
+            links.update({"z": ((7, 0, 0), None)})
+            links.update({"bad": ((8, 0, 0), (0, 0, 0, 0))})
+    assert links.data == data
+    assert links.find_dst_label((7, 0, 0)) is None
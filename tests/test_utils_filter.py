@@ -166,5 +166,29 @@ def test_compose_graph():
         )
     )
 
+
+def test_parse_graph_memoized():
+    expr = "[in]split[a][b];[a]scale=w=320:h=240[out]"
+
+    fg, links, _ = filter_utils.parse_graph(expr, frozen=True)
+    assert filter_utils.parse_graph(expr, frozen=True)[0] is fg
+    with pytest.raises(TypeError):
+        fg[1][0][1]["w"] = 640
+
+    # mutable copies do not affect the memoized result
+    fg, links, _ = filter_utils.parse_graph(expr)
+    fg[1][0][1]["w"] = 640
+    links["in"][0] = (1, 0, 0)
+    assert filter_utils.parse_graph(expr) == (
+        [[("split",)], [("scale", {"w": 320, "h": 240})]],
+        {
+            "in": [(0, 0, 0), None],
+            "a": [(1, 0, 0), (0, 0, 0)],
+            "b": [None, (0, 0, 1)],
+            "out": [None, (1, 0, 0)],
+        },
+        None,
+    )
+
 if __name__ == "__main__":
     from pprint import pprint
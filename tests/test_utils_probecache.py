@@ -0,0 +1,83 @@
+from types import MappingProxyType
+
+import pytest
+
+from ffmpegio.utils.probecache import ProbeMemoryCache, ProbeDiskCache, freeze, thaw
+
+
+def test_freeze():
+    info = {"format": {"duration": 1.0}, "streams": [{"index": 0, "tags": {}}]}
+    frozen = freeze(info)
+    assert isinstance(frozen, MappingProxyType)
+    assert isinstance(frozen["streams"], tuple)
+    with pytest.raises(TypeError):
+        frozen["streams"][0]["index"] = 1
+    assert thaw(frozen) == info
+
+
+def test_memory_cache():
+    cache = ProbeMemoryCache(max_bytes=4096)
+    value = cache.put("a", 1, {"streams": [{"index": 0}]})
+    assert cache.get("a", 1) is value  # no copy
+    assert cache.get("a", 2) is None  # signature mismatch
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 1
+
+    # evicts least recently used entries to stay within the budget
+    for i in range(100):
+        cache.put(i, 0, {"format": {"filename": f"file{i}"}})
+    assert 0 < len(cache) < 100
+    assert cache.nbytes <= cache.max_bytes
+    assert cache.get(99, 0) is not None
+    assert cache.get(0, 0) is None
+
+
+def test_disk_cache(tmp_path):
+    path = str(tmp_path / "probe.sqlite")
+    cache = ProbeDiskCache(path, max_entries=10)
+    key = ("/a.mp4", 100, 1, "ffprobe")
+    assert cache.get(key) is None
+    cache.put(key, {"format": {"duration": 1.0}})
+    assert cache.get(key) == {"format": {"duration": 1.0}}
+
+    # shared with other connection (e.g., another process)
+    other = ProbeDiskCache(path)
+    assert other.get(key) == {"format": {"duration": 1.0}}
+    assert other.get((*key[:-1], "other ffprobe")) is None
+
+    for i in range(cache.evict_interval - 1):
+        cache.put((f"/{i}.mp4", 100, 1, "ffprobe"), i)
+    assert cache.stats()["entries"] == 10
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 1
+
+
+def test_disk_cache_close(tmp_path):
+    import sqlite3, threading
+
+    path = str(tmp_path / "probe.sqlite")
+    cache = ProbeDiskCache(path)
+    key = ("/a.mp4", 100, 1, "ffprobe")
+    cache.put(key, 1)
+
+    # access time is only refreshed if stale
+    db = sqlite3.connect(path, isolation_level=None)
+    atime = lambda: db.execute("SELECT atime FROM probe").fetchone()[0]
+    t0 = atime()
+    assert cache.get(key) == 1 and atime() == t0
+    db.execute("UPDATE probe SET atime=0")
+    assert cache.get(key) == 1 and atime() > 0
+    db.close()
+
+    # close() closes the connections of all the threads
+    t = threading.Thread(target=cache.get, args=(key,))
+    t.start()
+    t.join()
+    dbs = list(cache._dbs)
+    assert len(dbs) == 2
+    cache.close()
+    for db in dbs:
+        with pytest.raises(sqlite3.ProgrammingError):
+            db.execute("SELECT 1")
+
+    # reconnects on demand
+    assert cache.get(key) == 1
+    cache.close()
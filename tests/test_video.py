@@ -82,6 +82,34 @@ def test_read():
     # assert np.array_equal(D, C)
 
 
+def test_read_parallel(tmp_path, monkeypatch):
+    from ffmpegio import path
+
+    monkeypatch.setattr(path, "CACHE_DIR", str(tmp_path))
+
+    url = "tests/assets/testvideo-1m-lowres.mp4"
+    fs, F = video.read(url)
+    fs1, F1 = video.read(url, parallel=4)
+    assert fs1 == fs and F1["shape"] == F["shape"]
+    assert F1["buffer"] == F["buffer"]
+
+    fs2, blocks = video.read_segments(url, parallel=4)
+    assert b"".join(bytes(blk["buffer"]) for blk in blocks) == F["buffer"]
+
+
+
+def test_read_seek_index(tmp_path, monkeypatch):
+    from ffmpegio import path
+
+    monkeypatch.setattr(path, "CACHE_DIR", str(tmp_path))
+
+    url = "tests/assets/testvideo-1m.mp4"
+    for opts in ({"ss": 10.02, "t": 0.5}, {"ss_in": 10.02, "t_in": 0.5}):
+        fs, A = video.read(url, **opts)
+        fs1, B = video.read(url, seek_index=True, **opts)
+        assert fs1 == fs and B["shape"] == A["shape"]
+        assert B["buffer"] == A["buffer"]
+
 def test_filter():
     r_in, input = video.create("life", life_color="Red", t_in=1)
     print("input", input["shape"], input["dtype"])